@@ -0,0 +1,99 @@
+"""
+Benchmark dos analisadores de passada única em módulos grandes.
+
+Compara `smell_detector` e `coupling_analyzer` com as implementações
+originais baseadas em regex (tests/legacy_analyzers.py).
+
+Uso:
+    python benchmarks/bench_analyzers.py --lines 10000 --lines 20000
+    python benchmarks/bench_analyzers.py --analyzer coupling
+"""
+import os
+import sys
+import time
+
+import click
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path[:0] = [os.path.join(ROOT, "src"), os.path.join(ROOT, "tests")]
+
+import legacy_analyzers as legacy  # noqa: E402
+from analyzer import smell_detector  # noqa: E402
+from analyzer.parsed_source import ParsedSource  # noqa: E402
+from analyzer.coupling_analyzer import analyze_coupling  # noqa: E402
+
+
+def generate_module(lines):
+    """Gera um módulo sintético com muitos nomes atribuídos e importados."""
+    chunks = [f"import mod_{i}\n" for i in range(lines // 100)]
+    written = len(chunks)
+    i = 0
+    while written < lines:
+        chunks.append(
+            f"def func_{i}(a, b):\n"
+            f"    var_{i} = a + b\n"
+            f"    tmp = var_{i} * 2\n"
+            f"    if tmp > 10:\n"
+            f"        return mod_{i % max(1, lines // 100)}.call(tmp)\n"
+            f"    return func_{max(0, i - 1)}(a, b)\n\n"
+        )
+        written += 7
+        i += 1
+    return "".join(chunks)
+
+
+def _legacy_smells(source_code):
+    return (
+        legacy.detect_code_duplication(source_code)
+        + legacy.detect_unused_variables(source_code)
+        + legacy.detect_unused_imports(source_code)
+        + legacy.detect_deep_nesting(source_code)
+        + legacy.detect_generic_names(source_code)
+    )
+
+
+def _new_smells(source_code):
+    parsed = ParsedSource(source_code, analysis=False)
+    return (
+        smell_detector._detect_code_duplication(parsed.lines)
+        + smell_detector._detect_unused_variables(parsed)
+        + smell_detector._detect_unused_imports(parsed)
+        + smell_detector._detect_deep_nesting(parsed.lines)
+        + smell_detector._detect_generic_names(parsed)
+    )
+
+
+ANALYZERS = {
+    'smells': (_legacy_smells, _new_smells),
+    'coupling': (legacy.analyze_coupling, analyze_coupling),
+}
+
+
+def _timed(func, source_code):
+    start = time.perf_counter()
+    result = func(source_code)
+    return result, time.perf_counter() - start
+
+
+@click.command()
+@click.option("--lines", "line_counts", multiple=True, type=int, default=[2000, 10000],
+              show_default=True, help="Tamanho (em linhas) dos módulos gerados")
+@click.option("--analyzer", "analyzers", multiple=True, type=click.Choice(sorted(ANALYZERS)),
+              default=sorted(ANALYZERS), show_default=True, help="Analisadores a comparar")
+def main(line_counts, analyzers):
+    click.echo(f"{'analisador':>10} {'linhas':>8} {'original (s)':>14} {'passada única (s)':>18} {'ganho':>8}")
+    for lines in line_counts:
+        source_code = generate_module(lines)
+        for name in analyzers:
+            legacy_func, new_func = ANALYZERS[name]
+            old_result, old_time = _timed(legacy_func, source_code)
+            new_result, new_time = _timed(new_func, source_code)
+            assert old_result == new_result, f"{name}: resultados divergentes"
+            click.echo(
+                f"{name:>10} {lines:>8} {old_time:>14.3f} {new_time:>18.3f} "
+                f"{old_time / new_time:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
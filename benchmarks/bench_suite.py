@@ -0,0 +1,232 @@
+"""
+Suíte de benchmarks de vazão em repositórios sintéticos.
+
+Gera um repositório determinístico (benchmarks/synthetic_repo.py) e mede
+`analyze_repository`, `extract_metrics`, `detect_smells`,
+`analyze_coupling` e `display_timeline`. Cada benchmark roda em um
+processo novo, para que o pico de memória (RSS) seja só dele. Os
+resultados vão para um JSON com commits/s, arquivos/s e pico de RSS.
+
+Com `--baseline`, compara com um resultado salvo e termina com código 1
+se algum benchmark ficar mais lento que `--max-slowdown`.
+
+Uso:
+    python benchmarks/bench_suite.py --output bench.json
+    python benchmarks/bench_suite.py --commits 500 --file-lines 400 --baseline bench.json
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+import click
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path[:0] = [os.path.join(ROOT, "src"), os.path.dirname(os.path.abspath(__file__))]
+
+from synthetic_repo import generate_repository, DEFAULT_COMPLEXITY  # noqa: E402
+
+RESULTS_VERSION = 1
+BENCHMARKS = ("analyze_repository", "extract_metrics", "detect_smells", "analyze_coupling",
+              "display_timeline")
+
+
+def _repository_sources(path):
+    """(nome, código) de todos os arquivos Python na ponta do repositório."""
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                with open(os.path.join(dirpath, filename), encoding="utf-8") as f:
+                    sources.append((filename, f.read()))
+    return sources
+
+
+def _bench_analyze_repository(path, jobs):
+    from analyzer.repo_miner import analyze_repository
+
+    start = time.perf_counter()
+    results = analyze_repository(path, jobs=jobs)
+    elapsed = time.perf_counter() - start
+    files = sum(r["files_modified"] for r in results)
+    return elapsed, len(results), files
+
+
+def _bench_extract_metrics(path, jobs):
+    from analyzer.metrics_extractor import extract_metrics
+
+    sources = _repository_sources(path)
+    start = time.perf_counter()
+    for filename, source_code in sources:
+        extract_metrics(source_code, filename)
+    return time.perf_counter() - start, None, len(sources)
+
+
+def _bench_detect_smells(path, jobs):
+    import lizard
+    from analyzer.parsed_source import ParsedSource
+    from analyzer.smell_detector import detect_smells
+
+    sources = _repository_sources(path)
+    analyses = [lizard.analyze_file.analyze_source_code(name, code) for name, code in sources]
+    start = time.perf_counter()
+    for (filename, source_code), analysis in zip(sources, analyses):
+        detect_smells(analysis, ParsedSource(source_code, filename, analysis=analysis))
+    return time.perf_counter() - start, None, len(sources)
+
+
+def _bench_analyze_coupling(path, jobs):
+    from analyzer.coupling_analyzer import analyze_coupling
+
+    sources = _repository_sources(path)
+    start = time.perf_counter()
+    for _, source_code in sources:
+        analyze_coupling(source_code)
+    return time.perf_counter() - start, None, len(sources)
+
+
+def _bench_display_timeline(path, jobs):
+    from rich.console import Console
+    from analyzer.repo_miner import analyze_repository
+    from visualizer import cli_view
+
+    results = analyze_repository(path, jobs=jobs)
+    cli_view.console = Console(file=io.StringIO(), width=160, force_terminal=True)
+    start = time.perf_counter()
+    # A barra de progresso usa o console global do rich
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli_view.display_timeline(results)
+    return time.perf_counter() - start, len(results), None
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS em bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _run_benchmark(name, path, jobs):
+    """Executado em um processo novo: roda um benchmark e mede o pico de RSS."""
+    elapsed, commits, files = globals()[f"_bench_{name}"](path, jobs)
+    result = {"seconds": round(elapsed, 6), "peak_rss_mb": round(_peak_rss_mb(), 1)}
+    if commits is not None:
+        result["commits_per_sec"] = round(commits / elapsed, 2) if elapsed else None
+    if files is not None:
+        result["files_per_sec"] = round(files / elapsed, 2) if elapsed else None
+    return result
+
+
+def run_suite(path, benchmarks=BENCHMARKS, repeat=1, jobs=1):
+    """
+    Roda os benchmarks no repositório `path`.
+
+    Com `repeat` > 1, fica com a execução mais rápida de cada benchmark.
+    """
+    results = {}
+    context = get_context("spawn")
+    for name in benchmarks:
+        best = None
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                result = executor.submit(_run_benchmark, name, path, jobs).result()
+            if best is None or result["seconds"] < best["seconds"]:
+                best = result
+        results[name] = best
+    return results
+
+
+def compare_to_baseline(current, baseline, max_slowdown):
+    """
+    Compara os tempos com os de um resultado salvo.
+
+    Retorna:
+        list: (benchmark, tempo de referência, tempo atual, lentidão relativa,
+        passou do limite) de cada benchmark presente nos dois resultados
+    """
+    comparison = []
+    for name, result in current["benchmarks"].items():
+        reference = baseline.get("benchmarks", {}).get(name)
+        if reference is None or not reference.get("seconds"):
+            continue
+        slowdown = result["seconds"] / reference["seconds"] - 1
+        comparison.append((name, reference["seconds"], result["seconds"], slowdown, slowdown > max_slowdown))
+    return comparison
+
+
+@click.command()
+@click.option("--commits", default=200, show_default=True, type=click.IntRange(min=1))
+@click.option("--files-per-commit", default=4, show_default=True, type=click.IntRange(min=1))
+@click.option("--file-lines", default=200, show_default=True, type=click.IntRange(min=1))
+@click.option("--complexity", default=DEFAULT_COMPLEXITY, show_default=True,
+              help="Distribuição de CC das funções (CC:peso,...)")
+@click.option("--seed", default=0, show_default=True)
+@click.option("--benchmark", "benchmarks", multiple=True, type=click.Choice(BENCHMARKS),
+              default=BENCHMARKS, help="Benchmarks a executar (padrão: todos)")
+@click.option("--repeat", default=1, show_default=True, type=click.IntRange(min=1),
+              help="Execuções por benchmark (vale a mais rápida)")
+@click.option("--jobs", "-j", default=1, show_default=True, type=click.IntRange(min=0))
+@click.option("--output", default=None, type=click.Path(dir_okay=False), help="Grava os resultados em JSON")
+@click.option("--baseline", default=None, type=click.Path(exists=True, dir_okay=False),
+              help="Resultado salvo para comparação")
+@click.option("--max-slowdown", default=0.2, show_default=True, type=click.FloatRange(min=0),
+              help="Lentidão relativa máxima aceita na comparação (0.2 = 20%)")
+def main(commits, files_per_commit, file_lines, complexity, seed, benchmarks, repeat, jobs, output,
+         baseline, max_slowdown):
+    config = {
+        "commits": commits, "files_per_commit": files_per_commit, "file_lines": file_lines,
+        "complexity": complexity, "seed": seed, "jobs": jobs
+    }
+    with tempfile.TemporaryDirectory(prefix="codethermometer-bench-") as tmp:
+        path = os.path.join(tmp, "repo")
+        click.echo(f"Gerando repositório sintético ({commits} commits)...")
+        generate_repository(path, commits, files_per_commit, file_lines, complexity, seed)
+        results = run_suite(path, benchmarks, repeat, jobs)
+
+    current = {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "benchmarks": results
+    }
+
+    click.echo(f"{'benchmark':>20} {'tempo (s)':>10} {'commits/s':>10} {'arquivos/s':>11} {'pico RSS (MB)':>14}")
+    for name, result in results.items():
+        click.echo(
+            f"{name:>20} {result['seconds']:>10.3f} {result.get('commits_per_sec') or '-':>10} "
+            f"{result.get('files_per_sec') or '-':>11} {result['peak_rss_mb']:>14.1f}"
+        )
+
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        click.echo(f"Resultados gravados em {output}")
+
+    if baseline:
+        with open(baseline, encoding="utf-8") as f:
+            reference = json.load(f)
+        if reference.get("config") != config:
+            click.echo("Aviso: a referência foi gerada com outra configuração")
+
+        failed = False
+        click.echo(f"\n{'benchmark':>20} {'referência':>11} {'atual':>8} {'variação':>9}")
+        for name, before, after, slowdown, regressed in compare_to_baseline(current, reference, max_slowdown):
+            failed = failed or regressed
+            flag = "  LENTO" if regressed else ""
+            click.echo(f"{name:>20} {before:>11.3f} {after:>8.3f} {slowdown:>+9.1%}{flag}")
+        if failed:
+            raise SystemExit(f"Regressão de desempenho acima de {max_slowdown:.0%}")
+
+
+if __name__ == "__main__":
+    main()
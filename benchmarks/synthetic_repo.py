@@ -0,0 +1,131 @@
+"""
+Gerador de repositórios Git sintéticos e determinísticos para benchmarks.
+
+A mesma configuração (e semente) sempre produz o mesmo histórico, com os
+mesmos SHAs: datas e autor são fixos e o conteúdo vem de um gerador
+pseudoaleatório. Os commits são escritos com `git fast-import`, então
+gerar milhares de commits leva poucos segundos.
+
+Uso:
+    python benchmarks/synthetic_repo.py /tmp/repo --commits 500 --files-per-commit 4
+"""
+import os
+import random
+import subprocess
+
+import click
+
+DEFAULT_COMPLEXITY = "1:50,3:30,8:15,20:5"
+EPOCH = 1735689600  # 2025-01-01T00:00:00Z
+COMMIT_INTERVAL = 3600
+
+
+def parse_distribution(spec):
+    """
+    Interpreta uma distribuição de complexidade `CC:peso,CC:peso,...`.
+
+    Exemplo: "1:50,5:30,20:20" gera 50% das funções com CC 1, 30% com CC 5
+    e 20% com CC 20.
+
+    Retorna:
+        tuple: (valores de CC, pesos)
+    """
+    values, weights = [], []
+    for part in spec.split(","):
+        try:
+            value, weight = part.split(":")
+            values.append(int(value))
+            weights.append(float(weight))
+        except ValueError:
+            raise ValueError(f"Distribuição inválida: {spec!r} (use CC:peso,CC:peso)")
+    if not values or min(values) < 1 or min(weights) < 0 or sum(weights) <= 0:
+        raise ValueError(f"Distribuição inválida: {spec!r}")
+    return values, weights
+
+
+def generate_function(rng, name, complexity):
+    """Gera uma função com a complexidade ciclomática pedida (1 + número de ifs)."""
+    lines = [f"def {name}(value, items):", "    total = 0"]
+    for branch in range(complexity - 1):
+        lines.append(f"    if value > {rng.randint(0, 1000)}:")
+        lines.append(f"        total += len(items) * {branch + 1}")
+    lines.append("    return total")
+    return lines
+
+
+def generate_file(rng, file_lines, distribution, revision):
+    """Gera um módulo Python com aproximadamente `file_lines` linhas."""
+    values, weights = distribution
+    lines = ["import os", "import json", ""]
+    index = 0
+    while len(lines) < file_lines:
+        complexity = rng.choices(values, weights)[0]
+        lines.extend(generate_function(rng, f"func_{revision}_{index}", complexity))
+        lines.append("")
+        index += 1
+    return "\n".join(lines) + "\n"
+
+
+def generate_repository(path, commits=200, files_per_commit=4, file_lines=200,
+                        complexity=DEFAULT_COMPLEXITY, seed=0):
+    """
+    Cria em `path` um repositório com `commits` commits.
+
+    Cada commit reescreve `files_per_commit` arquivos Python escolhidos de
+    um conjunto de `4 * files_per_commit` módulos, com funções cuja
+    complexidade segue a distribuição `complexity`.
+
+    Retorna:
+        str: SHA do último commit
+    """
+    distribution = parse_distribution(complexity)
+    rng = random.Random(seed)
+    pool_size = max(1, files_per_commit * 4)
+
+    os.makedirs(path, exist_ok=True)
+    subprocess.run(["git", "init", "-q", "-b", "main", path], check=True)
+
+    stream = []
+    for number in range(commits):
+        timestamp = EPOCH + number * COMMIT_INTERVAL
+        message = f"commit {number}"
+        stream.append("commit refs/heads/main")
+        stream.append(f"mark :{number + 1}")
+        stream.append(f"author Bench <bench@example.com> {timestamp} +0000")
+        stream.append(f"committer Bench <bench@example.com> {timestamp} +0000")
+        stream.append(f"data {len(message.encode())}")
+        stream.append(message)
+        if number > 0:
+            stream.append(f"from :{number}")
+        for slot in rng.sample(range(pool_size), min(files_per_commit, pool_size)):
+            content = generate_file(rng, file_lines, distribution, number).encode()
+            stream.append(f"M 100644 inline pkg/module_{slot}.py")
+            stream.append(f"data {len(content)}")
+            stream.append(content.decode())
+        stream.append("")
+
+    subprocess.run(
+        ["git", "fast-import", "--quiet"], cwd=path, check=True,
+        input="\n".join(stream).encode()
+    )
+    subprocess.run(["git", "checkout", "-q", "-f", "main"], cwd=path, check=True)
+    return subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=path, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@click.command()
+@click.argument("path")
+@click.option("--commits", default=200, show_default=True, type=click.IntRange(min=1))
+@click.option("--files-per-commit", default=4, show_default=True, type=click.IntRange(min=1))
+@click.option("--file-lines", default=200, show_default=True, type=click.IntRange(min=1))
+@click.option("--complexity", default=DEFAULT_COMPLEXITY, show_default=True,
+              help="Distribuição de CC das funções (CC:peso,...)")
+@click.option("--seed", default=0, show_default=True)
+def main(path, commits, files_per_commit, file_lines, complexity, seed):
+    head = generate_repository(path, commits, files_per_commit, file_lines, complexity, seed)
+    click.echo(f"{path}: {commits} commits (HEAD {head[:7]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import heapq
+from datetime import datetime
+
+from analyzer.git_backend import list_commits
+from analyzer.mirror_cache import local_repository
+from analyzer.parallel_analysis import FileAnalysisPool
+from analyzer.snapshot import SnapshotTree
+
+DEFAULT_BUDGET = 200
+DEFAULT_THRESHOLD = 0.05
+
+# Métricas observadas para decidir onde refinar a amostragem
+WATCHED_METRICS = ('complexity', 'code_smells', 'maintainability_index')
+
+
+def analyze_adaptive(url, since=None, until=None, budget=DEFAULT_BUDGET, threshold=DEFAULT_THRESHOLD,
+                     cache=None, jobs=1, mirrors=None, path_filter=None):
+    """
+    Analisa o histórico com resolução adaptativa.
+
+    Primeiro mede a árvore completa em alguns commits espaçados; depois
+    bisseta os intervalos em que complexidade, smells ou manutenibilidade
+    variam mais que `threshold` (variação relativa), até esgotar o
+    orçamento de `budget` commits analisados ou chegar a commits vizinhos.
+    Trechos estáveis ficam com poucas amostras e regressões bruscas são
+    localizadas no commit que as introduziu. Com `path_filter` (PathFilter),
+    só os arquivos selecionados são medidos.
+
+    Retorna:
+        list: métricas dos commits amostrados (mesmas chaves do modo
+        snapshot), ordenadas por data
+    """
+    if mirrors is not None:
+        url = mirrors.resolve(url)
+    since_dt = datetime.fromisoformat(since) if since else None
+    until_dt = datetime.fromisoformat(until) if until else None
+
+    # Os commits são visitados fora de ordem: o repositório (ou o clone
+    # temporário de uma URL remota) precisa existir até o fim da amostragem
+    with local_repository(url) as path:
+        commits = list_commits(path, since_dt, until_dt)
+        if not commits:
+            return []
+
+        pool = FileAnalysisPool(jobs) if jobs != 1 else None
+        tree = SnapshotTree(path, cache, pool, path_filter=path_filter)
+
+        def evaluate(index):
+            commit = commits[index]
+            tree.advance(commit.hash)
+            return tree.commit_metrics(commit) if tree.files_count else None
+
+        try:
+            sampled = adaptive_sample(len(commits), evaluate, budget, threshold)
+        finally:
+            if pool is not None:
+                pool.close()
+
+    return [sampled[index] for index in sorted(sampled) if sampled[index] is not None]
+
+
+def adaptive_sample(count, evaluate, budget=DEFAULT_BUDGET, threshold=DEFAULT_THRESHOLD):
+    """
+    Escolhe quais dos `count` commits avaliar e chama `evaluate(índice)`.
+
+    Começa com cerca de um quarto do orçamento em pontos igualmente
+    espaçados (sempre incluindo o primeiro e o último commit). Em seguida,
+    repetidamente divide ao meio o intervalo com a maior variação entre as
+    extremidades, enquanto ela passar de `threshold` e houver orçamento.
+
+    Retorna:
+        dict: {índice: resultado de evaluate} dos commits avaliados
+    """
+    if count == 0:
+        return {}
+    budget = max(2, budget)
+
+    results = {}
+    initial = min(count, max(2, budget // 4))
+    for k in range(initial):
+        index = round(k * (count - 1) / max(1, initial - 1))
+        if index not in results:
+            results[index] = evaluate(index)
+
+    # Heap de intervalos pela maior variação (negativa, heapq é mínimo)
+    heap = []
+    indexes = sorted(results)
+
+    def push(lo, hi):
+        if hi - lo > 1:
+            jump = metrics_jump(results[lo], results[hi])
+            if jump > threshold:
+                heapq.heappush(heap, (-jump, lo, hi))
+
+    for lo, hi in zip(indexes, indexes[1:]):
+        push(lo, hi)
+
+    while heap and len(results) < budget:
+        _, lo, hi = heapq.heappop(heap)
+        middle = (lo + hi) // 2
+        results[middle] = evaluate(middle)
+        push(lo, middle)
+        push(middle, hi)
+
+    return results
+
+
+def metrics_jump(before, after):
+    """
+    Maior variação relativa entre duas amostras nas métricas observadas.
+
+    Amostras ausentes (árvore sem arquivos Python) contam como zero.
+    """
+    jump = 0.0
+    for key in WATCHED_METRICS:
+        a = before[key] if before is not None else 0
+        b = after[key] if after is not None else 0
+        jump = max(jump, abs(b - a) / max(abs(a), abs(b), 1))
+    return jump
@@ -0,0 +1,281 @@
+import math
+from array import array
+
+# Typecodes de array com inteiros, cuja soma já é exata
+_INT_TYPECODES = 'bBhHiIlLqQ'
+
+
+class ExactSum:
+    """
+    Soma exata de inteiros e floats em memória constante.
+
+    Cada float é um inteiro vezes uma potência de 2, então a soma é guardada
+    como um numerador inteiro sobre 2**shift. A média resultante é a mesma,
+    bit a bit, de `statistics.mean` (que também soma de forma exata e
+    arredonda só no final), sem guardar os valores.
+    """
+
+    __slots__ = ('_numerator', '_shift')
+
+    def __init__(self):
+        self._numerator = 0
+        self._shift = 0
+
+    def add(self, value):
+        numerator, denominator = value.as_integer_ratio()
+        shift = denominator.bit_length() - 1
+        if shift > self._shift:
+            self._numerator <<= shift - self._shift
+            self._shift = shift
+        self._numerator += numerator << (self._shift - shift)
+
+    def extend(self, values):
+        """Soma vários valores; um array de inteiros é somado de uma vez."""
+        if isinstance(values, array) and values.typecode in _INT_TYPECODES:
+            self.add(sum(values))
+            return
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        """Soma outra ExactSum a esta (continua exata)."""
+        shift = max(self._shift, other._shift)
+        self._numerator = (self._numerator << (shift - self._shift)) + (other._numerator << (shift - other._shift))
+        self._shift = shift
+
+    @property
+    def total(self):
+        """A soma (int se todos os valores eram inteiros)."""
+        if self._shift == 0:
+            return self._numerator
+        return self._numerator / (1 << self._shift)
+
+    def mean(self, count):
+        """Soma dividida por `count`, com um único arredondamento."""
+        return self._numerator / (count << self._shift)
+
+
+class RunningStats:
+    """
+    Estatísticas de uma métrica calculadas em uma passada: contagem, soma,
+    média, variância (Welford), mínimo, máximo e primeiro/último valor.
+    """
+
+    __slots__ = ('count', 'min', 'max', 'first', 'last', '_sum', '_mean', '_m2')
+
+    def __init__(self):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.first = None
+        self.last = None
+        self._sum = ExactSum()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @classmethod
+    def from_values(cls, values):
+        """
+        Estatísticas de uma sequência inteira (ex.: uma coluna de
+        CommitMetricsTable), calculadas com as funções embutidas em vez de
+        um `add` por valor.
+        """
+        stats = cls()
+        if not len(values):
+            return stats
+        stats.count = len(values)
+        stats.min, stats.max = min(values), max(values)
+        stats.first, stats.last = values[0], values[-1]
+        stats._sum.extend(values)
+        stats._mean = stats.mean
+        stats._m2 = math.fsum((value - stats._mean) ** 2 for value in values)
+        return stats
+
+    def add(self, value):
+        self.count += 1
+        self._sum.add(value)
+        if self.count == 1:
+            self.min = self.max = self.first = value
+        else:
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+        self.last = value
+
+        delta = value - self._mean
+        self._mean += delta / self.count
+        self._m2 += delta * (value - self._mean)
+
+    def merge(self, other):
+        """
+        Junta as estatísticas de valores que vieram depois destes (variância
+        pela fórmula de Chan para grupos).
+        """
+        if not other.count:
+            return
+        if not self.count:
+            self.min, self.max, self.first = other.min, other.max, other.first
+        else:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+        self.last = other.last
+
+        count = self.count + other.count
+        delta = other._mean - self._mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self._mean += delta * other.count / count
+        self.count = count
+        self._sum.merge(other._sum)
+
+    @property
+    def total(self):
+        return self._sum.total
+
+    @property
+    def mean(self):
+        """Média exata (igual a `statistics.mean`); 0 sem valores."""
+        return self._sum.mean(self.count) if self.count else 0
+
+    @property
+    def variance(self):
+        """Variância amostral (igual a `statistics.variance`, a menos de arredondamento)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+
+class ReportAccumulator:
+    """
+    Agregados do relatório de evolução calculados enquanto os commits passam.
+
+    A memória ocupada depende do número de autores, não do de commits. O
+    primeiro e o último commit são os de menor e maior data, com empates
+    resolvidos como na ordenação estável de `analyze_repository`; assim, os
+    commits podem chegar na ordem da travessia e os números são os mesmos
+    que os calculados sobre a lista ordenada.
+    """
+
+    def __init__(self):
+        self.complexity = RunningStats()
+        self.code_smells = RunningStats()
+        self.maintainability = RunningStats()
+        self.coupling = RunningStats()
+        # autor -> [commits, soma de CC, soma de smells]
+        self.authors = {}
+        self._first = None
+        self._last = None
+
+    @classmethod
+    def from_results(cls, results):
+        """Acumula resultados de uma lista, tabela ou gerador."""
+        accumulator = cls()
+        for result in results:
+            accumulator.add(result)
+        return accumulator
+
+    @classmethod
+    def from_table(cls, table):
+        """
+        Agregados de uma CommitMetricsTable calculados sobre as colunas, sem
+        montar as linhas.
+        """
+        accumulator = cls()
+        if not len(table):
+            return accumulator
+        accumulator.complexity = RunningStats.from_values(table.column('complexity'))
+        accumulator.code_smells = RunningStats.from_values(table.column('code_smells'))
+        accumulator.maintainability = RunningStats.from_values(table.column('maintainability_index'))
+        accumulator.coupling = RunningStats.from_values(table.column('coupling'))
+
+        complexity = table.author_totals('complexity')
+        smells = table.author_totals('code_smells')
+        accumulator.authors = {
+            author: [commits, complexity[author], smells[author]]
+            for author, commits in table.author_counts().items()
+        }
+
+        first, last = table.date_bounds()
+        accumulator._first = (table[first]['date'], table[first]['complexity'])
+        accumulator._last = (table[last]['date'], table[last]['complexity'])
+        return accumulator
+
+    def add(self, result):
+        complexity = result.get('complexity', 0)
+        # CORREÇÃO: usar "code_smells" em vez de "smells"
+        smells = result.get('code_smells', 0)
+        self.complexity.add(complexity)
+        self.code_smells.add(smells)
+        self.maintainability.add(result.get('maintainability_index', 50))
+        self.coupling.add(result.get('coupling', 0))
+
+        totals = self.authors.setdefault(result['author'], [0, 0, 0])
+        totals[0] += 1
+        totals[1] += complexity
+        totals[2] += smells
+
+        date = result['date']
+        if self._first is None or date < self._first[0]:
+            self._first = (date, complexity)
+        if self._last is None or date >= self._last[0]:
+            self._last = (date, complexity)
+
+    def merge(self, other):
+        """
+        Soma os agregados de outro ReportAccumulator (ex.: de outro
+        repositório), como se os seus commits fossem adicionados depois.
+        """
+        self.complexity.merge(other.complexity)
+        self.code_smells.merge(other.code_smells)
+        self.maintainability.merge(other.maintainability)
+        self.coupling.merge(other.coupling)
+        for author, (commits, complexity, smells) in other.authors.items():
+            totals = self.authors.setdefault(author, [0, 0, 0])
+            totals[0] += commits
+            totals[1] += complexity
+            totals[2] += smells
+        if other._first is not None and (self._first is None or other._first[0] < self._first[0]):
+            self._first = other._first
+        if other._last is not None and (self._last is None or other._last[0] >= self._last[0]):
+            self._last = other._last
+
+    @property
+    def count(self):
+        return self.complexity.count
+
+    def stats(self):
+        """Estatísticas agregadas, com as mesmas chaves e valores de `_calculate_aggregated_stats`."""
+        if self.count > 1:
+            first, last = self._first[1], self._last[1]
+            trend = "↑ Piorando" if last > first else "↓ Melhorando" if last < first else "→ Estável"
+        else:
+            trend = "→ Indeterminado"
+
+        avg_mi = self.maintainability.mean if self.count else 50
+        if avg_mi >= 85:
+            health = "Excelente"
+        elif avg_mi >= 70:
+            health = "Bom"
+        elif avg_mi >= 50:
+            health = "Aceitável"
+        else:
+            health = "Crítico"
+
+        return {
+            'total_commits': self.count,
+            'total_authors': len(self.authors),
+            'first_date': self._first[0].strftime("%Y-%m-%d") if self.count else "N/A",
+            'last_date': self._last[0].strftime("%Y-%m-%d") if self.count else "N/A",
+            'avg_complexity': self.complexity.mean,
+            'max_complexity': self.complexity.max if self.count else 0,
+            'min_complexity': self.complexity.min if self.count else 0,
+            'complexity_trend': trend,
+            'total_smells': self.code_smells.total,
+            'avg_smells': self.code_smells.mean,
+            'worst_commit_smells': self.code_smells.max if self.count else 0,
+            'avg_maintainability': avg_mi,
+            'health_level': health,
+            'avg_coupling': self.coupling.mean
+        }
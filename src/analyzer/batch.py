@@ -0,0 +1,251 @@
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+from analyzer.aggregation import ReportAccumulator
+from analyzer.exporters import ResultExporter
+from analyzer.parallel_analysis import FileAnalysisPool
+from analyzer.path_filter import PathFilter
+from analyzer.repo_miner import iter_repository_metrics
+from analyzer.run_state import RunState, DEFAULT_CHECKPOINT_EVERY
+
+# Clones/fetches simultâneos (limitados pela rede, não pela CPU)
+DEFAULT_FETCH_JOBS = 4
+
+_ENTRY_KEYS = ('url', 'name', 'since', 'until', 'include', 'exclude')
+
+
+class BatchEntry:
+    """Um repositório do manifesto, com o seu período e filtros próprios."""
+
+    __slots__ = ('url', 'name', 'since', 'until', 'include', 'exclude')
+
+    def __init__(self, url, name=None, since=None, until=None, include=(), exclude=()):
+        self.url = url
+        self.name = name or repository_name(url)
+        self.since = since
+        self.until = until
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+
+    def __repr__(self):
+        return f"BatchEntry({self.url!r}, name={self.name!r})"
+
+
+class BatchResult:
+    """Resultado da análise de um repositório do lote."""
+
+    __slots__ = ('entry', 'accumulator', 'error', 'seconds', 'output')
+
+    def __init__(self, entry, accumulator, error=None, seconds=0.0, output=None):
+        self.entry = entry
+        self.accumulator = accumulator
+        self.error = error
+        self.seconds = seconds
+        self.output = output
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def repository_name(url):
+    """Nome curto de um repositório: o final da URL ou do caminho, sem `.git`."""
+    base = url.rstrip("/\\").replace("\\", "/").rsplit("/", 1)[-1].rsplit(":", 1)[-1]
+    if base.endswith(".git"):
+        base = base[:-4]
+    return re.sub(r'[^\w.-]', '_', base) or "repo"
+
+
+def load_manifest(path):
+    """
+    Lê o manifesto do lote (TOML). `since`, `until`, `include` e `exclude`
+    no topo valem para todos os repositórios, que podem sobrescrevê-los:
+
+        since = "2025-01-01"
+
+        [[repos]]
+        url = "https://github.com/org/api"
+
+        [[repos]]
+        url = "/srv/git/legacy"
+        name = "legacy"
+        until = "2024-12-31"
+        exclude = ["vendor/"]
+
+    Retorna:
+        list: BatchEntry na ordem do manifesto, com nomes únicos
+    """
+    with open(path, "rb") as f:
+        try:
+            data = tomllib.load(f)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Manifesto inválido em {path}: {e}")
+
+    repos = data.get('repos')
+    if not isinstance(repos, list) or not repos:
+        raise ValueError(f"O manifesto {path} não tem nenhum [[repos]]")
+    unknown = set(data) - {'repos', 'since', 'until', 'include', 'exclude'}
+    if unknown:
+        raise ValueError(f"Chaves desconhecidas em {path}: {', '.join(sorted(unknown))}")
+
+    entries = []
+    names = set()
+    for position, repo in enumerate(repos, 1):
+        if not isinstance(repo, dict) or not isinstance(repo.get('url'), str):
+            raise ValueError(f"O repositório {position} do manifesto {path} não tem 'url'")
+        unknown = set(repo) - set(_ENTRY_KEYS)
+        if unknown:
+            raise ValueError(f"Chaves desconhecidas no repositório {repo['url']}: {', '.join(sorted(unknown))}")
+        fields = {key: repo.get(key, data.get(key)) for key in ('since', 'until')}
+        for key in ('since', 'until'):
+            value = fields[key]
+            if value is not None and not isinstance(value, str):
+                # Datas TOML sem aspas chegam como date/datetime
+                fields[key] = value.isoformat()
+        patterns = {key: list(data.get(key, [])) + list(repo.get(key, [])) for key in ('include', 'exclude')}
+        entry = BatchEntry(repo['url'], repo.get('name'), **fields, **patterns)
+
+        # Nomes repetidos ganham um sufixo (são usados nos arquivos de saída)
+        name = entry.name
+        suffix = 2
+        while entry.name in names:
+            entry.name = f"{name}-{suffix}"
+            suffix += 1
+        names.add(entry.name)
+        entries.append(entry)
+    return entries
+
+
+def prefetch(entries, mirrors=None, fetch_jobs=DEFAULT_FETCH_JOBS):
+    """
+    Gera (entrada, caminho local, erro) na ordem do manifesto.
+
+    Os espelhos são criados ou atualizados por `fetch_jobs` threads, à
+    frente da análise: enquanto um repositório é analisado, os próximos já
+    estão sendo buscados. No máximo 2 × `fetch_jobs` repositórios ficam
+    buscados e ainda não analisados.
+    """
+    if mirrors is None:
+        for entry in entries:
+            yield entry, entry.url, None
+        return
+
+    pending = deque()
+    entries = iter(entries)
+    with ThreadPoolExecutor(max_workers=max(1, fetch_jobs)) as executor:
+        def submit():
+            entry = next(entries, None)
+            if entry is not None:
+                pending.append((entry, executor.submit(mirrors.resolve, entry.url)))
+
+        for _ in range(2 * max(1, fetch_jobs)):
+            submit()
+        while pending:
+            entry, future = pending.popleft()
+            submit()
+            try:
+                yield entry, future.result(), None
+            except Exception as e:
+                yield entry, None, e
+
+
+def iter_batch(entries, cache=None, jobs=1, mirrors=None, fetch_jobs=DEFAULT_FETCH_JOBS, backend="pydriller",
+               path_filter=None, state_dir=None, fresh=False, checkpoint_every=DEFAULT_CHECKPOINT_EVERY,
+               output_dir=None, fmt="jsonl", combined=None, pipeline=False):
+    """
+    Analisa os repositórios do lote em sequência, com um único pool de
+    processos e um único cache de métricas: arquivos idênticos em vários
+    repositórios (código copiado, dependências vendorizadas) são analisados
+    uma só vez. Clones e fetches rodam em paralelo com a análise, limitados
+    por `fetch_jobs` e não pelo número de processos.
+
+    Com `state_dir`, cada repositório tem a sua análise incremental; com
+    `output_dir`, os resultados por commit de cada um são gravados em
+    `<nome>.<fmt>`. Os agregados dos repositórios analisados sem erro
+    também são somados em `combined` (ReportAccumulator), se informado.
+    `pipeline` lê o histórico de cada repositório à frente da análise (ver
+    `iter_repository_metrics`).
+
+    Gera:
+        BatchResult: um por repositório, na ordem do manifesto (falhas não
+        interrompem o lote)
+    """
+    base_filter = path_filter if path_filter is not None else PathFilter()
+    pool = FileAnalysisPool(jobs) if jobs != 1 else None
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    try:
+        for entry, path, error in prefetch(entries, mirrors, fetch_jobs):
+            started = time.perf_counter()
+            accumulator = ReportAccumulator()
+            output = os.path.join(output_dir, f"{entry.name}.{fmt}") if output_dir is not None else None
+            if error is None:
+                entry_filter = PathFilter(base_filter.include + entry.include, base_filter.exclude + entry.exclude)
+                error = _analyze_entry(entry, path, accumulator, cache, pool, backend, entry_filter,
+                                       state_dir, fresh, checkpoint_every, output, fmt, pipeline)
+            if error is None and combined is not None:
+                combined.merge(accumulator)
+            yield BatchResult(entry, accumulator, error, time.perf_counter() - started, output)
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+def _analyze_entry(entry, path, accumulator, cache, pool, backend, path_filter, state_dir, fresh,
+                   checkpoint_every, output, fmt, pipeline=False):
+    """Analisa um repositório já buscado. Retorna a exceção, se falhou."""
+    state = None
+    if state_dir is not None:
+        # O estado é identificado pela URL do manifesto, como no comando analyze
+        state = RunState(state_dir, entry.url, entry.since, entry.until,
+                         checkpoint_every=checkpoint_every, paths=path_filter.key())
+        if fresh:
+            state.reset()
+    exporter = ResultExporter(output, fmt) if output is not None else None
+    try:
+        for result in iter_repository_metrics(
+            path, entry.since, entry.until, cache=cache, pool=pool, state=state, backend=backend,
+            path_filter=path_filter, on_commit=exporter.write if exporter is not None else None,
+            pipeline=pipeline
+        ):
+            accumulator.add(result)
+    except Exception as e:
+        return e
+    finally:
+        if exporter is not None:
+            exporter.close()
+    return None
+
+
+def write_summary(path, results, combined=None):
+    """Grava o resumo do lote (estatísticas por repositório e totais) em JSON."""
+    summary = {
+        'repositories': [
+            {
+                'name': result.entry.name,
+                'url': result.entry.url,
+                'since': result.entry.since,
+                'until': result.entry.until,
+                'seconds': round(result.seconds, 3),
+                'output': result.output,
+                'error': str(result.error) if result.error is not None else None,
+                'stats': result.accumulator.stats() if result.ok else None
+            }
+            for result in results
+        ],
+        'combined': combined
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
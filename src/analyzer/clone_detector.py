@@ -0,0 +1,376 @@
+import keyword
+import re
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import defaultdict, deque
+from datetime import datetime
+
+from pydriller import Repository
+
+from analyzer.snapshot import SnapshotTree, _select_snapshots, parse_snapshot_spec
+
+# Um fingerprint cobre KGRAM tokens normalizados; a janela de winnowing
+# garante que qualquer trecho idêntico de pelo menos KGRAM + WINDOW - 1
+# tokens (algumas linhas de código) seja detectado
+KGRAM = 25
+WINDOW = 16
+# Hashes presentes em mais arquivos que isso (cabeçalhos, boilerplate) não
+# geram pares de clones, apenas entram na taxa de duplicação
+MAX_FANOUT = 50
+# Tamanho máximo do memo de tokens de um CloneIndex
+MAX_TOKEN_MEMO = 100_000
+
+_MODULUS = (1 << 61) - 1
+_BASE = 1_000_003
+
+_CLONE_TOKEN_RE = re.compile(r'''
+    \#[^\n]*
+  | (?:[rRbBuUfF]{1,2})?
+    (?:\'\'\'[\s\S]*?\'\'\'|"""[\s\S]*?"""
+      |'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*")
+  | \w+
+  | [^\w\s]
+''', re.VERBOSE)
+
+_NEWLINE_RE = re.compile(r'\n')
+_QUOTES = frozenset('\'"')
+
+
+def _token_id(text):
+    """Id estável (crc32 não depende de PYTHONHASHSEED) do token normalizado."""
+    first = text[0]
+    if first == '#':
+        return 0
+    if first in _QUOTES or text[-1] in _QUOTES:
+        normalized = 'S'
+    elif first.isdigit():
+        normalized = 'N'
+    elif first.isalnum() or first == '_':
+        normalized = text if keyword.iskeyword(text) else 'V'
+    else:
+        normalized = text
+    return zlib.crc32(normalized.encode('utf-8')) + 1
+
+
+def normalize_tokens(source_code, memo=None):
+    """
+    Tokens do código com nomes, strings e números normalizados.
+
+    Comentários são descartados; identificadores viram 'V', strings 'S' e
+    números 'N' (palavras-chave e operadores são mantidos). Assim, cópias
+    com variáveis renomeadas ou literais trocados têm os mesmos tokens.
+
+    `memo` (texto do token -> id) é reaproveitado entre chamadas; strings
+    não entram nele, para que não cresça com cada literal do histórico, e
+    ele para de crescer em MAX_TOKEN_MEMO entradas.
+
+    Retorna:
+        tuple: (ids dos tokens, posição de início de cada token), ambos listas
+    """
+    ids = []
+    offsets = []
+    if memo is None:
+        memo = {}
+    for m in _CLONE_TOKEN_RE.finditer(source_code):
+        text = m.group()
+        token_id = memo.get(text)
+        if token_id is None:
+            token_id = _token_id(text)
+            if text[-1] not in _QUOTES and len(memo) < MAX_TOKEN_MEMO:
+                memo[text] = token_id
+        if token_id:
+            ids.append(token_id)
+            offsets.append(m.start())
+    return ids, offsets
+
+
+def fingerprint(source_code, kgram=KGRAM, window=WINDOW, memo=None):
+    """
+    Fingerprints do código por winnowing sobre hashes rolantes de k-gramas.
+
+    Cada k-grama de tokens normalizados recebe um hash polinomial
+    (Rabin-Karp, atualizado em O(1) por token). De cada janela de `window`
+    hashes consecutivos é escolhido o menor (o mais à direita em caso de
+    empate), registrado uma única vez. `memo` é repassado a
+    `normalize_tokens`.
+
+    Retorna:
+        list: tuplas (hash, primeira linha, última linha do k-grama)
+    """
+    ids, offsets = normalize_tokens(source_code, memo)
+    if len(ids) < kgram:
+        return []
+
+    top = pow(_BASE, kgram - 1, _MODULUS)
+    h = 0
+    for token_id in ids[:kgram]:
+        h = (h * _BASE + token_id) % _MODULUS
+    hashes = [h]
+    for i in range(kgram, len(ids)):
+        h = ((h - ids[i - kgram] * top) * _BASE + ids[i]) % _MODULUS
+        hashes.append(h)
+
+    selected = []
+    candidates = deque()
+    last_selected = -1
+    for i, h in enumerate(hashes):
+        # Mantém candidatos em ordem crescente de hash; empates favorecem o mais à direita
+        while candidates and hashes[candidates[-1]] >= h:
+            candidates.pop()
+        candidates.append(i)
+        if candidates[0] <= i - window:
+            candidates.popleft()
+        if i >= window - 1 or i == len(hashes) - 1:
+            best = candidates[0]
+            if best != last_selected:
+                selected.append(best)
+                last_selected = best
+
+    # Linhas calculadas só para os k-gramas escolhidos
+    newlines = [m.start() for m in _NEWLINE_RE.finditer(source_code)]
+    return [
+        (hashes[i], bisect_right(newlines, offsets[i]) + 1,
+         bisect_right(newlines, offsets[i + kgram - 1]) + 1)
+        for i in selected
+    ]
+
+
+class ClonePair:
+    """Dois arquivos que compartilham trechos de código."""
+
+    __slots__ = ('path_a', 'path_b', 'shared', 'lines_a', 'lines_b')
+
+    def __init__(self, path_a, path_b, shared, lines_a, lines_b):
+        self.path_a = path_a
+        self.path_b = path_b
+        self.shared = shared
+        self.lines_a = lines_a
+        self.lines_b = lines_b
+
+    def __repr__(self):
+        return f"ClonePair({self.path_a!r}, {self.path_b!r}, shared={self.shared})"
+
+
+class CloneIndex:
+    """
+    Índice de fingerprints de todos os arquivos de um snapshot.
+
+    Adicionar ou remover um arquivo só insere ou retira os seus próprios
+    fingerprints, e a contagem de fingerprints duplicados e a de hashes em
+    comum por par de arquivos são mantidas junto, então avançar de um
+    snapshot para o seguinte custa o proporcional ao que mudou. Os
+    fingerprints são guardados por blob (arrays compactos, compartilhados
+    entre caminhos com o mesmo conteúdo) e o índice invertido guarda o
+    caminho diretamente quando o hash ocorre uma só vez, que é o caso
+    comum. O memo de tokens é do índice, e é liberado junto com ele.
+    """
+
+    def __init__(self, kgram=KGRAM, window=WINDOW):
+        self.kgram = kgram
+        self.window = window
+        # caminho -> blob
+        self.files = {}
+        # blob -> [hashes, linhas iniciais, linhas finais, referências]
+        self._blobs = {}
+        # hash -> caminho (uma ocorrência) ou [ocorrências, {caminho: ocorrências}]
+        self._postings = {}
+        # Hashes com mais de uma ocorrência
+        self._shared = set()
+        # (caminho, caminho) -> hashes em comum (até MAX_FANOUT caminhos por hash)
+        self._pair_counts = {}
+        # Texto do token -> id normalizado, compartilhado entre os arquivos
+        self._token_ids = {}
+        self.total = 0
+        self.duplicated = 0
+
+    def has_blob(self, blob):
+        """Indica se os fingerprints de `blob` já estão no índice (não precisa do código)."""
+        return blob in self._blobs
+
+    def add(self, path, blob, source_code=None):
+        """Insere (ou substitui) o arquivo `path`; `source_code` só é lido se o blob é novo."""
+        self.remove(path)
+        entry = self._blobs.get(blob)
+        if entry is None:
+            if source_code is None:
+                raise ValueError(f"Código de {path} ({blob}) necessário para o índice de clones")
+            hashes, starts, ends = array('q'), array('I'), array('I')
+            for h, start, end in fingerprint(source_code, self.kgram, self.window, self._token_ids):
+                hashes.append(h)
+                starts.append(start)
+                ends.append(end)
+            entry = self._blobs[blob] = [hashes, starts, ends, 0]
+        entry[3] += 1
+        self.files[path] = blob
+        for h in entry[0]:
+            self._insert(h, path)
+
+    def remove(self, path):
+        blob = self.files.pop(path, None)
+        if blob is None:
+            return
+        entry = self._blobs[blob]
+        for h in entry[0]:
+            self._delete(h, path)
+        entry[3] -= 1
+        if not entry[3]:
+            del self._blobs[blob]
+
+    def _insert(self, h, path):
+        self.total += 1
+        current = self._postings.get(h)
+        if current is None:
+            self._postings[h] = path
+            return
+        if isinstance(current, str):
+            current = self._postings[h] = [1, {current: 1}]
+            self._shared.add(h)
+            self.duplicated += 1
+        current[0] += 1
+        self.duplicated += 1
+        paths = current[1]
+        if path in paths:
+            paths[path] += 1
+        else:
+            self._path_joined(paths, path)
+            paths[path] = 1
+
+    def _delete(self, h, path):
+        self.total -= 1
+        current = self._postings[h]
+        if isinstance(current, str):
+            del self._postings[h]
+            return
+        current[0] -= 1
+        paths = current[1]
+        paths[path] -= 1
+        if not paths[path]:
+            del paths[path]
+            self._path_left(paths, path)
+        if current[0] == 1:
+            self._postings[h] = next(iter(paths))
+            self._shared.discard(h)
+            self.duplicated -= 2
+        else:
+            self.duplicated -= 1
+
+    def _path_joined(self, others, path):
+        # Um hash com mais de MAX_FANOUT caminhos não gera pares
+        if len(others) < MAX_FANOUT:
+            for other in others:
+                self._count_pair(path, other, 1)
+        elif len(others) == MAX_FANOUT:
+            self._count_all_pairs(others, -1)
+
+    def _path_left(self, others, path):
+        if len(others) < MAX_FANOUT:
+            for other in others:
+                self._count_pair(path, other, -1)
+        elif len(others) == MAX_FANOUT:
+            self._count_all_pairs(others, 1)
+
+    def _count_all_pairs(self, paths, delta):
+        paths = list(paths)
+        for i, path_a in enumerate(paths):
+            for path_b in paths[i + 1:]:
+                self._count_pair(path_a, path_b, delta)
+
+    def _count_pair(self, path_a, path_b, delta):
+        key = (path_a, path_b) if path_a < path_b else (path_b, path_a)
+        count = self._pair_counts.get(key, 0) + delta
+        if count:
+            self._pair_counts[key] = count
+        else:
+            del self._pair_counts[key]
+
+    @property
+    def duplication_ratio(self):
+        """Fração dos fingerprints do snapshot que aparecem mais de uma vez."""
+        return self.duplicated / self.total if self.total else 0.0
+
+    def clone_pairs(self, top=None):
+        """
+        Pares de arquivos distintos com fingerprints em comum, do que
+        compartilha mais para o que compartilha menos.
+
+        Retorna:
+            list: ClonePair com as faixas de linhas (início, fim) envolvidas
+            em cada arquivo; só os `top` primeiros têm as faixas calculadas
+            quando `top` é informado
+        """
+        by_pair = defaultdict(set)
+        for h in self._shared:
+            paths = sorted(self._postings[h][1])
+            if len(paths) < 2 or len(paths) > MAX_FANOUT:
+                continue
+            for i, path_a in enumerate(paths):
+                for path_b in paths[i + 1:]:
+                    by_pair[path_a, path_b].add(h)
+
+        ranked = sorted(by_pair.items(), key=lambda item: (-len(item[1]), item[0]))
+        if top is not None:
+            ranked = ranked[:top]
+        return [
+            ClonePair(path_a, path_b, len(hashes),
+                      self._line_ranges(path_a, hashes), self._line_ranges(path_b, hashes))
+            for (path_a, path_b), hashes in ranked
+        ]
+
+    def pairs_count(self):
+        """Número de pares de arquivos com fingerprints em comum."""
+        return len(self._pair_counts)
+
+    def _line_ranges(self, path, hashes):
+        hashes_array, starts, ends, _ = self._blobs[self.files[path]]
+        ranges = sorted((starts[i], ends[i]) for i, h in enumerate(hashes_array) if h in hashes)
+        merged = []
+        for start, end in ranges:
+            if merged and start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+
+def iter_snapshot_clones(url, since=None, until=None, spec="1", mirrors=None, index=None,
+                         path_filter=None):
+    """
+    Gera a duplicação de código de cada snapshot do histórico.
+
+    Os snapshots são escolhidos como em `iter_snapshot_metrics` (por padrão,
+    todos os commits). O índice de clones acompanha a árvore pelas
+    diferenças entre snapshots, então só os arquivos alterados são lidos e
+    tokenizados. Passe `index` (CloneIndex) para consultar os pares de
+    clones do último snapshot ao final. Com `path_filter` (PathFilter), só
+    os arquivos selecionados entram no índice.
+
+    Retorna:
+        generator: dicionários com hash, date, author, files, fingerprints,
+        duplicated, duplication_ratio e clone_pairs
+    """
+    mode, every = parse_snapshot_spec(spec)
+    if mirrors is not None:
+        url = mirrors.resolve(url)
+    since_dt = datetime.fromisoformat(since) if since else None
+    until_dt = datetime.fromisoformat(until) if until else None
+    index = index if index is not None else CloneIndex()
+    tree = None
+
+    commits = Repository(url, since=since_dt, to=until_dt).traverse_commits()
+    for commit in _select_snapshots(commits, mode, every):
+        if tree is None:
+            tree = SnapshotTree(
+                commit.project_path, clones=index, metrics=False, path_filter=path_filter
+            )
+        tree.advance(commit.hash)
+        yield {
+            'hash': commit.hash[:7],
+            'date': commit.committer_date,
+            'author': commit.author.name,
+            'files': len(index.files),
+            'fingerprints': index.total,
+            'duplicated': index.duplicated,
+            'duplication_ratio': index.duplication_ratio,
+            'clone_pairs': index.pairs_count()
+        }
@@ -0,0 +1,184 @@
+import csv
+import json
+import os
+
+from analyzer.metrics_table import KEYS, NUMERIC_COLUMNS
+
+EXPORT_FORMATS = ('jsonl', 'csv', 'parquet')
+DEFAULT_ROW_GROUP_SIZE = 10000
+
+# Colunas das linhas por arquivo; (hash, path) identifica a linha, já que o
+# mesmo nome de arquivo pode aparecer em vários diretórios
+FILE_KEYS = ('hash', 'date', 'path', 'filename', 'cyclomatic_complexity', 'coupling',
+             'maintainability_index', 'lines_of_code', 'code_smells', 'functions_count',
+             'avg_function_length')
+_FILE_METRIC_KEYS = FILE_KEYS[4:]
+_FILE_FLOAT_KEYS = ('coupling', 'maintainability_index', 'avg_function_length')
+
+_EXTENSIONS = {'.jsonl': 'jsonl', '.ndjson': 'jsonl', '.csv': 'csv', '.parquet': 'parquet'}
+
+
+def detect_format(path, fmt=None):
+    """
+    Formato de exportação: o informado ou o deduzido da extensão do arquivo.
+
+    Retorna:
+        str: 'jsonl', 'csv' ou 'parquet'
+    """
+    if fmt:
+        return fmt
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(
+            f"Não foi possível deduzir o formato de {path!r}: use a extensão .jsonl, .csv ou .parquet"
+        )
+    return _EXTENSIONS[extension]
+
+
+def commit_row(result):
+    """Linha de exportação de um commit."""
+    return {key: result[key] for key in KEYS}
+
+
+def file_rows(result, file_metrics):
+    """Linhas de exportação dos arquivos de um commit."""
+    for entry in file_metrics:
+        row = {
+            'hash': result['hash'], 'date': result['date'],
+            'path': entry['path'], 'filename': entry['filename']
+        }
+        for key in _FILE_METRIC_KEYS:
+            row[key] = entry['metrics'][key]
+        yield row
+
+
+class ResultExporter:
+    """
+    Grava os resultados à medida que os commits são processados.
+
+    Cada commit vira uma linha em `path`; com `files_path`, as métricas de
+    cada arquivo do commit vão para um segundo arquivo, no mesmo formato.
+    Nada é acumulado além do lote de linhas do Parquet, então a memória não
+    depende do tamanho do histórico.
+    """
+
+    def __init__(self, path, fmt=None, files_path=None, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+        self.format = detect_format(path, fmt)
+        self.path = path
+        self.files_path = files_path
+        self.commits_written = 0
+        self.files_written = 0
+        self._commits = _open_writer(self.format, path, KEYS, row_group_size)
+        self._files = None
+        if files_path:
+            self._files = _open_writer(self.format, files_path, FILE_KEYS, row_group_size)
+
+    def write(self, result, file_metrics=None):
+        """
+        Grava um commit e, se houver arquivo de saída por arquivo, os seus
+        arquivos. `file_metrics` é None para resultados retomados de uma
+        execução anterior (as métricas por arquivo não ficam salvas).
+        """
+        self._commits.write(commit_row(result))
+        self.commits_written += 1
+        if self._files is not None and file_metrics:
+            for row in file_rows(result, file_metrics):
+                self._files.write(row)
+                self.files_written += 1
+
+    def close(self):
+        self._commits.close()
+        if self._files is not None:
+            self._files.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _open_writer(fmt, path, keys, row_group_size):
+    if fmt == 'jsonl':
+        return _JsonlWriter(path)
+    if fmt == 'csv':
+        return _CsvWriter(path, keys)
+    if fmt == 'parquet':
+        return _ParquetWriter(path, keys, row_group_size)
+    raise ValueError(f"Formato de exportação desconhecido: {fmt}")
+
+
+def _with_iso_date(row):
+    """Formatos de texto gravam a data em ISO 8601 (com o fuso do commit)."""
+    date = row['date']
+    if hasattr(date, 'isoformat'):
+        row = dict(row, date=date.isoformat())
+    return row
+
+
+class _JsonlWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, row):
+        self._file.write(json.dumps(_with_iso_date(row), default=str) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class _CsvWriter:
+    def __init__(self, path, keys):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=keys)
+        self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(_with_iso_date(row))
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    """Acumula até `row_group_size` linhas e grava cada lote como um row group."""
+
+    def __init__(self, path, keys, row_group_size):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("A exportação em Parquet requer o pacote pyarrow (pip install pyarrow)")
+
+        self._pa = pa
+        self._schema = pa.schema([(key, _arrow_type(pa, key)) for key in keys])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._row_group_size = max(1, row_group_size)
+        self._rows = []
+
+    def write(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= self._row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            table = self._pa.Table.from_pylist(self._rows, schema=self._schema)
+            self._writer.write_table(table, row_group_size=self._row_group_size)
+            self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def _arrow_type(pa, key):
+    if key == 'date':
+        # Instante em UTC; datas sem fuso são tratadas como UTC
+        return pa.timestamp('us', tz='UTC')
+    if key in ('hash', 'author', 'path', 'filename'):
+        return pa.string()
+    numeric = dict(NUMERIC_COLUMNS)
+    if numeric.get(key) == 'd' or key in _FILE_FLOAT_KEYS:
+        return pa.float64()
+    return pa.int64()
@@ -0,0 +1,435 @@
+import os
+import sqlite3
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+from analyzer.metrics_cache import default_cache_dir
+from analyzer.metrics_extractor import metrics_fingerprint
+from analyzer.repo_miner import iter_file_changes
+from analyzer.run_state import state_key, DEFAULT_CHECKPOINT_EVERY
+from analyzer import profiling
+
+DEFAULT_TOP = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repositories (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    last_commit TEXT,
+    commits_seen INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS lineages (
+    id INTEGER PRIMARY KEY,
+    repository INTEGER NOT NULL,
+    file TEXT NOT NULL,
+    function TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    removed REAL
+);
+CREATE INDEX IF NOT EXISTS idx_lineages_repository ON lineages (repository, removed);
+CREATE TABLE IF NOT EXISTS function_versions (
+    id INTEGER PRIMARY KEY,
+    repository INTEGER NOT NULL,
+    lineage INTEGER NOT NULL,
+    commit_hash TEXT NOT NULL,
+    date REAL NOT NULL,
+    file TEXT NOT NULL,
+    function TEXT NOT NULL,
+    start_line INTEGER NOT NULL,
+    cyclomatic_complexity INTEGER NOT NULL,
+    nloc INTEGER NOT NULL,
+    parameters INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_versions_file_function ON function_versions (repository, file, function);
+CREATE INDEX IF NOT EXISTS idx_versions_date ON function_versions (repository, date, lineage);
+CREATE INDEX IF NOT EXISTS idx_versions_lineage ON function_versions (lineage, date);
+"""
+
+# Versão vigente em `since` (a última antes dele ou, se não houver, a
+# primeira do período) e última versão do período de cada função alterada
+_GROWTH_QUERY = """
+SELECT e.file, e.function, e.start_line, s.cyclomatic_complexity, e.cyclomatic_complexity,
+       e.nloc, e.parameters, r.versions
+FROM (
+    SELECT v.lineage, COUNT(*) AS versions, MAX(v.id) AS end_id,
+        COALESCE(
+            (SELECT b.id FROM function_versions b
+             WHERE b.lineage = v.lineage AND b.date < :since ORDER BY b.date DESC, b.id DESC LIMIT 1),
+            MIN(v.id)
+        ) AS start_id
+    FROM function_versions v
+    WHERE v.repository = :repository AND v.date >= :since AND v.date <= :until
+    GROUP BY v.lineage
+) r
+JOIN lineages l ON l.id = r.lineage
+JOIN function_versions s ON s.id = r.start_id
+JOIN function_versions e ON e.id = r.end_id
+WHERE l.removed IS NULL OR l.removed > :until
+ORDER BY e.cyclomatic_complexity - s.cyclomatic_complexity DESC, e.cyclomatic_complexity DESC, e.file, e.function
+LIMIT :limit
+"""
+
+
+class FunctionIndex:
+    """
+    Índice persistente (SQLite) das métricas de cada função ao longo do histórico.
+
+    Para cada commit e arquivo Python alterado, guarda uma versão de cada
+    função: nome, linha inicial, complexidade ciclomática, NLOC, número de
+    parâmetros e a impressão digital do corpo. As versões de uma mesma
+    função formam uma linhagem, que a acompanha quando ela muda de arquivo
+    ou de nome. Consultas por período (`top_growth`) usam só o índice, sem
+    percorrer o histórico de novo.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, "functions.sqlite")
+        self.fingerprint = metrics_fingerprint()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def repository(self, url, paths=None, checkpoint_every=DEFAULT_CHECKPOINT_EVERY):
+        """
+        Abre o índice de um repositório para atualização.
+
+        `paths` é o filtro de caminhos (`PathFilter.key()`): como no estado
+        incremental, filtros diferentes têm índices separados. Um índice
+        gerado por outra versão dos analisadores é descartado.
+        """
+        return RepositoryIndex(self, url, paths, checkpoint_every)
+
+    def top_growth(self, url, since=None, until=None, limit=DEFAULT_TOP, paths=None):
+        """
+        Funções cuja complexidade ciclomática mais cresceu no período.
+
+        O crescimento é a diferença entre a última versão até `until` e a
+        versão vigente em `since` (ou a primeira do período, para funções
+        criadas depois). Só entram funções alteradas no período e que ainda
+        existiam ao final dele.
+
+        Retorna:
+            list: dicionários com file, function, start_line,
+            start_complexity, complexity, growth, nloc, parameters e
+            versions (alterações no período); None se o repositório não foi
+            indexado
+        """
+        repository = self._repository_id(url, paths)
+        if repository is None:
+            return None
+        params = {
+            'repository': repository,
+            'since': datetime.fromisoformat(since).timestamp() if since else float("-inf"),
+            'until': datetime.fromisoformat(until).timestamp() if until else float("inf"),
+            'limit': limit
+        }
+        with self._lock:
+            rows = self._conn.execute(_GROWTH_QUERY, params).fetchall()
+        return [
+            {
+                'file': file,
+                'function': function,
+                'start_line': start_line,
+                'start_complexity': start_cc,
+                'complexity': cc,
+                'growth': cc - start_cc,
+                'nloc': nloc,
+                'parameters': parameters,
+                'versions': versions
+            }
+            for file, function, start_line, start_cc, cc, nloc, parameters, versions in rows
+        ]
+
+    def history(self, url, file, function, paths=None):
+        """Versões de uma função pelo caminho e nome, em ordem de travessia."""
+        repository = self._repository_id(url, paths)
+        if repository is None:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT commit_hash, date, start_line, cyclomatic_complexity, nloc, parameters"
+                " FROM function_versions WHERE repository = ? AND file = ? AND function = ? ORDER BY id",
+                (repository, file, function)
+            ).fetchall()
+        return [
+            {
+                'hash': commit_hash[:7],
+                'date': datetime.fromtimestamp(date),
+                'start_line': start_line,
+                'complexity': cc,
+                'nloc': nloc,
+                'parameters': parameters
+            }
+            for commit_hash, date, start_line, cc, nloc, parameters in rows
+        ]
+
+    def close(self):
+        # O que foi registrado depois do último checkpoint é descartado
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _repository_id(self, url, paths):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM repositories WHERE key = ? AND fingerprint = ?",
+                (state_key(url, paths=paths), self.fingerprint)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+
+class RepositoryIndex:
+    """
+    Atualização do índice de funções de um repositório.
+
+    Tem a mesma interface de retomada do RunState (`resumed`,
+    `last_commit`, `reset()`), então a travessia continua do último commit
+    indexado. As versões e o último commit são gravados na mesma transação
+    a cada checkpoint: uma execução interrompida retoma do último deles.
+    """
+
+    def __init__(self, index, url, paths=None, checkpoint_every=DEFAULT_CHECKPOINT_EVERY):
+        self.url = url
+        self.checkpoint_every = max(1, checkpoint_every)
+        self._index = index
+        self._conn = index._conn
+        self._uncheckpointed = 0
+        key = state_key(url, paths=paths)
+
+        with index._lock:
+            row = self._conn.execute(
+                "SELECT id, fingerprint, last_commit, commits_seen FROM repositories WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                cursor = self._conn.execute(
+                    "INSERT INTO repositories (key, url, fingerprint) VALUES (?, ?, ?)",
+                    (key, url, index.fingerprint)
+                )
+                row = (cursor.lastrowid, index.fingerprint, None, 0)
+                self._conn.commit()
+        self.id, fingerprint, self.last_commit, self.commits_seen = row
+        if fingerprint != index.fingerprint:
+            # Índice de outra versão dos analisadores: recomeça
+            self.reset()
+        else:
+            self._load_alive()
+
+    @property
+    def resumed(self):
+        """Indica se o repositório já tinha commits indexados."""
+        return self.last_commit is not None
+
+    def record(self, commit, files, removed=(), renamed=()):
+        """
+        Registra as funções dos arquivos alterados em um commit.
+
+        `files` mapeia cada caminho alterado à lista de funções de
+        `extract_metrics`; `removed` são os caminhos apagados e `renamed`
+        os pares (antigo, novo) renomeados sem alteração de conteúdo.
+        Deve ser chamado na ordem da travessia.
+
+        Uma função nova em um caminho herda a linhagem de uma função que
+        sumiu no mesmo commit com o mesmo corpo (movida ou renomeada) ou,
+        se não houver, com o mesmo nome (movida e alterada).
+        """
+        date = commit.committer_date.timestamp()
+        with self._index._lock:
+            for old_path, new_path in renamed:
+                functions = self._alive.pop(old_path, {})
+                if functions:
+                    self._alive[new_path] = functions
+                    self._conn.execute(
+                        "UPDATE lineages SET file = ? WHERE repository = ? AND file = ? AND removed IS NULL",
+                        (new_path, self.id, old_path)
+                    )
+
+            previous = {path: self._alive.pop(path, {}) for path in (*files, *removed)}
+            current = {}
+            unmatched = []
+            for path, functions in files.items():
+                old = previous[path]
+                current[path] = {}
+                for name, function in _named_functions(functions):
+                    entry = old.pop(name, None)
+                    if entry is None:
+                        unmatched.append((path, name, function))
+                    else:
+                        current[path][name] = (entry[0], function)
+
+            # O que sobrou sumiu neste commit: possíveis origens das funções novas
+            by_body = defaultdict(list)
+            by_name = defaultdict(list)
+            for old in previous.values():
+                for name, (lineage, fingerprint) in old.items():
+                    by_body[fingerprint].append(lineage)
+                    by_name[name.split("#", 1)[0]].append(lineage)
+            taken = set()
+            for path, name, function in unmatched:
+                lineage = _take(by_body[function[5]], taken) or _take(by_name[name.split("#", 1)[0]], taken)
+                if lineage is None:
+                    lineage = self._conn.execute(
+                        "INSERT INTO lineages (repository, file, function, fingerprint) VALUES (?, ?, ?, ?)",
+                        (self.id, path, name, function[5])
+                    ).lastrowid
+                taken.add(lineage)
+                current[path][name] = (lineage, function)
+
+            vanished = [
+                (date, lineage) for old in previous.values()
+                for lineage, _ in old.values() if lineage not in taken
+            ]
+            self._conn.executemany("UPDATE lineages SET removed = ? WHERE id = ?", vanished)
+            self._conn.executemany(
+                "UPDATE lineages SET file = ?, function = ?, fingerprint = ? WHERE id = ?",
+                [
+                    (path, name, function[5], lineage)
+                    for path, functions in current.items()
+                    for name, (lineage, function) in functions.items()
+                ]
+            )
+            self._conn.executemany(
+                "INSERT INTO function_versions (repository, lineage, commit_hash, date, file, function,"
+                " start_line, cyclomatic_complexity, nloc, parameters, fingerprint)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (self.id, lineage, commit.hash, date, path, name, *function[1:6])
+                    for path, functions in current.items()
+                    for name, (lineage, function) in functions.items()
+                ]
+            )
+
+        for path, functions in current.items():
+            if functions:
+                self._alive[path] = {name: (lineage, function[5]) for name, (lineage, function) in functions.items()}
+
+        self.last_commit = commit.hash
+        self.commits_seen += 1
+        self._uncheckpointed += 1
+        if self._uncheckpointed >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Grava as versões registradas e o último commit indexado."""
+        with self._index._lock:
+            self._conn.execute(
+                "UPDATE repositories SET last_commit = ?, commits_seen = ? WHERE id = ?",
+                (self.last_commit, self.commits_seen, self.id)
+            )
+            self._conn.commit()
+        self._uncheckpointed = 0
+
+    def rollback(self):
+        """Descarta o que foi registrado depois do último checkpoint."""
+        with self._index._lock:
+            self._conn.rollback()
+        self._uncheckpointed = 0
+
+    def reset(self):
+        """Descarta o índice do repositório e recomeça do zero."""
+        with self._index._lock:
+            self._conn.execute("DELETE FROM function_versions WHERE repository = ?", (self.id,))
+            self._conn.execute("DELETE FROM lineages WHERE repository = ?", (self.id,))
+            self._conn.execute(
+                "UPDATE repositories SET fingerprint = ?, last_commit = NULL, commits_seen = 0 WHERE id = ?",
+                (self._index.fingerprint, self.id)
+            )
+            self._conn.commit()
+        self.last_commit = None
+        self.commits_seen = 0
+        self._uncheckpointed = 0
+        self._alive = {}
+
+    def _load_alive(self):
+        # Localização atual das funções existentes: caminho -> nome -> (linhagem, corpo)
+        self._alive = defaultdict(dict)
+        with self._index._lock:
+            rows = self._conn.execute(
+                "SELECT id, file, function, fingerprint FROM lineages WHERE repository = ? AND removed IS NULL",
+                (self.id,)
+            )
+            for lineage, path, name, fingerprint in rows:
+                self._alive[path][name] = (lineage, fingerprint)
+        self._alive = dict(self._alive)
+
+
+def update_function_index(url, index, cache=None, jobs=1, mirrors=None, backend="pydriller", path_filter=None,
+                          checkpoint_every=DEFAULT_CHECKPOINT_EVERY, pool=None, fresh=False, pipeline=False):
+    """
+    Indexa as funções dos commits ainda não indexados do repositório.
+
+    O histórico inteiro é indexado (o período é escolhido na consulta); nas
+    execuções seguintes só os commits novos são percorridos. As métricas
+    vêm de `iter_file_changes`, então o cache de métricas por blob (`cache`)
+    e o pool de processos (`jobs` ou `pool`) são aproveitados como em
+    `iter_repository_metrics`.
+
+    Retorna:
+        int: número de commits percorridos nesta execução
+    """
+    repository = index.repository(url, path_filter.key() if path_filter is not None else None, checkpoint_every)
+    if fresh:
+        repository.reset()
+
+    seen = 0
+    try:
+        for commit, changes in iter_file_changes(url, cache=cache, jobs=jobs, pool=pool, mirrors=mirrors,
+                                                 backend=backend, path_filter=path_filter, state=repository,
+                                                 pipeline=pipeline):
+            with profiling.stage("function_index", commit=commit.hash[:7]):
+                repository.record(commit, *_function_changes(changes))
+            seen += 1
+        repository.checkpoint()
+    except BaseException:
+        repository.rollback()
+        raise
+    return seen
+
+
+def _function_changes(changes):
+    """
+    Separa os FileChange de um commit no que `RepositoryIndex.record` usa:
+    funções por caminho, caminhos removidos e renomeações sem alteração.
+    """
+    files, removed, renamed = {}, [], []
+    for change in changes:
+        moved = change.old_path is not None and change.old_path != change.new_path
+        if change.new_path is None:
+            removed.append(change.old_path)
+        elif change.metrics is not None:
+            files[change.new_path] = change.metrics.get('functions', [])
+            if moved:
+                removed.append(change.old_path)
+        elif moved and not change.source_code:
+            renamed.append((change.old_path, change.new_path))
+        # Arquivos cuja análise falhou mantêm as funções da versão anterior
+    return files, removed, renamed
+
+
+def _named_functions(functions):
+    """(nome, função) com nomes únicos no arquivo: repetições ganham `#2`, `#3`..."""
+    counts = defaultdict(int)
+    for function in functions:
+        name = function[0]
+        counts[name] += 1
+        yield (name if counts[name] == 1 else f"{name}#{counts[name]}"), function
+
+
+def _take(candidates, taken):
+    while candidates:
+        lineage = candidates.pop(0)
+        if lineage not in taken:
+            return lineage
+    return None
@@ -0,0 +1,305 @@
+import os
+import subprocess
+from datetime import datetime
+
+BACKENDS = ('pydriller', 'native')
+
+# Separadores do formato do `git log`: início do commit e campos do cabeçalho
+_RECORD = '\x1e'
+_FIELD = '\x1f'
+_LOG_FORMAT = '%x1e%H%x1f%P%x1f%cI%x1f%an%x1f%ae'
+_SUBMODULE_MODE = '160000'
+_READ_SIZE = 1 << 16
+
+
+class NativeRepository:
+    """
+    Histórico lido diretamente do git, sem PyDriller nem GitPython.
+
+    Um único `git log --raw -z -M` em streaming dá os caminhos alterados e
+    os novos blobs de cada commit, e o conteúdo dos arquivos só é lido
+    quando `source_code` é acessado, por um processo `git cat-file --batch`
+    que vive durante toda a travessia. Não há leitura da versão anterior
+    dos arquivos; o git só compara conteúdos para detectar renomeações,
+    com o mesmo limiar de similaridade (50%) do GitPython usado pelo
+    PyDriller.
+
+    Reproduz o que `analyze_repository` usa do PyDriller: a mesma ordem
+    (do mais antigo ao mais novo), os filtros `since`/`to`/`from_commit`, os
+    arquivos alterados em relação ao primeiro pai (comparando com a árvore
+    vazia no commit inicial e sem arquivos em merges) e os atributos
+    `hash`, `committer_date`, `author.name` e `modified_files`.
+
+    Com `paths` (pathspecs do git), só os commits que alteram esses
+    caminhos são gerados, e só com esses arquivos. Com `numstat`, o mesmo
+    `git log` também conta as linhas adicionadas e removidas de cada
+    arquivo (`added_lines`/`deleted_lines`), o que exige calcular os diffs.
+    """
+
+    def __init__(self, path, since=None, to=None, from_commit=None, paths=None, numstat=False):
+        if not os.path.isdir(path):
+            raise ValueError(
+                f"O backend nativo requer um repositório local ou um espelho: {path}"
+            )
+        self.path = os.path.abspath(path)
+        self.since = since
+        self.to = to
+        self.from_commit = from_commit
+        self.paths = list(paths) if paths else []
+        self.numstat = numstat
+
+    def traverse_commits(self):
+        """Gera os commits do mais antigo ao mais novo (como `Repository.traverse_commits`)."""
+        command = ["git", "-C", self.path, "log", "--reverse", "--raw", "-z", "-M",
+                   "--no-abbrev", "--no-color", f"--format={_LOG_FORMAT}"]
+        if self.numstat:
+            command.append("--numstat")
+        command.extend(_date_filters(self.since, self.to))
+        if self.paths:
+            # Sem simplificação: commits de ramos laterais também são gerados
+            command.append("--full-history")
+        command.extend(self._revisions())
+        command.append("--")
+        command.extend(self.paths)
+
+        if not self._has_head():
+            return
+
+        blobs = BlobReader(self.path)
+        log = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            for header, changes in _parse_log(_read_fields(log.stdout)):
+                yield NativeCommit(self.path, header, changes, blobs)
+            if log.wait() != 0:
+                raise RuntimeError(f"git log falhou: {log.stderr.read().decode('utf-8', 'replace').strip()}")
+        finally:
+            if log.poll() is None:
+                log.kill()
+                log.wait()
+            log.stdout.close()
+            log.stderr.close()
+            blobs.close()
+
+    def _revisions(self):
+        if self.from_commit is None:
+            return ["HEAD"]
+        # Mesmos argumentos que o PyDriller usa para `from_commit`
+        commit = _git(self.path, "rev-parse", "--verify", f"{self.from_commit}^{{commit}}")
+        if commit is None:
+            raise ValueError(f"O commit {self.from_commit} não existe")
+        parents = _git(self.path, "rev-list", "--parents", "-n", "1", commit).split()[1:]
+        return [f"--ancestry-path={commit}"] + [f"^{parent}" for parent in parents] + ["HEAD"]
+
+    def _has_head(self):
+        return _git(self.path, "rev-parse", "--verify", "-q", "HEAD") is not None
+
+
+def list_commits(path, since=None, to=None):
+    """
+    Commits do período em um repositório local, do mais antigo ao mais novo
+    (o mesmo conjunto de `Repository(path, since=..., to=...)`), só com
+    `hash`, `committer_date` e `author`: sem arquivos alterados, a lista
+    cabe em memória mesmo para históricos longos.
+    """
+    if _git(path, "rev-parse", "--verify", "-q", "HEAD") is None:
+        return []
+    command = ["git", "-C", path, "log", "--reverse", "--no-color", f"--format={_LOG_FORMAT}",
+               *_date_filters(since, to), "HEAD", "--"]
+    result = subprocess.run(command, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git log falhou: {result.stderr.decode('utf-8', 'replace').strip()}")
+    output = result.stdout.decode("utf-8", "surrogateescape")
+    return [
+        NativeCommit(path, record.rstrip("\n"), (), None)
+        for record in output.split(_RECORD) if record.strip()
+    ]
+
+
+class NativeCommit:
+    """Commit com a interface usada de `pydriller.Commit`."""
+
+    __slots__ = ('project_path', 'hash', 'parents', 'committer_date', 'author', 'modified_files')
+
+    def __init__(self, project_path, header, changes, blobs):
+        commit_hash, parents, date, name, email = header.split(_FIELD)
+        self.project_path = project_path
+        self.hash = commit_hash
+        self.parents = parents.split()
+        self.committer_date = datetime.fromisoformat(date)
+        self.author = Developer(name, email)
+        if len(self.parents) > 1:
+            # Como no PyDriller, merges não têm arquivos modificados
+            self.modified_files = []
+        else:
+            self.modified_files = [
+                NativeModifiedFile(old_path, new_path, blob, blobs, lines)
+                for old_path, new_path, blob, lines in changes
+            ]
+
+
+class Developer:
+    __slots__ = ('name', 'email')
+
+    def __init__(self, name, email):
+        self.name = name
+        self.email = email
+
+
+class NativeModifiedFile:
+    """
+    Arquivo alterado em um commit; o conteúdo é lido só quando acessado.
+
+    `added_lines` e `deleted_lines` só são conhecidos com `numstat` (None
+    sem ele; 0 para arquivos binários).
+    """
+
+    __slots__ = ('old_path', 'new_path', 'blob', 'added_lines', 'deleted_lines', '_blobs')
+
+    def __init__(self, old_path, new_path, blob, blobs, lines=None):
+        self.old_path = old_path
+        self.new_path = new_path
+        self.blob = blob
+        self.added_lines, self.deleted_lines = lines if lines is not None else (None, None)
+        self._blobs = blobs
+
+    @property
+    def filename(self):
+        return os.path.basename(self.new_path or self.old_path)
+
+    @property
+    def source_code(self):
+        """Conteúdo da nova versão (None se o arquivo foi removido)."""
+        if self.blob is None:
+            return None
+        content = self._blobs.read(self.blob)
+        # Mesma decodificação do PyDriller
+        return content.decode("utf-8", "ignore") if content else None
+
+
+class BlobReader:
+    """
+    Lê blobs por um único processo `git cat-file --batch`.
+
+    Cada leitura escreve o hash na entrada do processo e lê o cabeçalho e o
+    conteúdo da saída, sem criar um processo por arquivo.
+    """
+
+    def __init__(self, path):
+        self._process = subprocess.Popen(
+            ["git", "-C", path, "cat-file", "--batch"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+
+    def read(self, blob):
+        """Conteúdo do blob (None se não existe)."""
+        process = self._process
+        process.stdin.write(blob.encode('ascii') + b"\n")
+        process.stdin.flush()
+        header = process.stdout.readline().split()
+        if len(header) != 3:
+            return None
+        size = int(header[2])
+        content = process.stdout.read(size)
+        process.stdout.read(1)
+        return content
+
+    def close(self):
+        if self._process is None:
+            return
+        self._process.stdin.close()
+        self._process.wait()
+        self._process.stdout.close()
+        self._process = None
+
+
+def _date_filters(since, to):
+    filters = []
+    if since is not None:
+        filters.append(f"--since={since:%Y-%m-%d %H:%M:%S}")
+    if to is not None:
+        filters.append(f"--until={to:%Y-%m-%d %H:%M:%S}")
+    return filters
+
+
+def _git(path, *args):
+    result = subprocess.run(["git", "-C", path, *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def _read_fields(stream):
+    """Campos separados por NUL da saída de `git log -z`, lidos em blocos."""
+    pending = b""
+    while True:
+        chunk = stream.read(_READ_SIZE)
+        if not chunk:
+            break
+        fields = (pending + chunk).split(b"\0")
+        pending = fields.pop()
+        for field in fields:
+            yield field.decode("utf-8", "surrogateescape")
+    if pending:
+        yield pending.decode("utf-8", "surrogateescape")
+
+
+def _parse_log(fields):
+    """
+    Agrupa os campos de `git log --raw -z -M` (e `--numstat`, se usado) por commit.
+
+    Gera:
+        tuple: (cabeçalho, [(caminho antigo, caminho novo, novo blob ou None,
+        (linhas adicionadas, removidas) ou None)])
+    """
+    header = None
+    entries = []
+    lines = {}
+    fields = iter(fields)
+    for field in fields:
+        field = field.lstrip("\n")
+        if field.startswith(_RECORD):
+            if header is not None:
+                yield header, _changes(entries, lines)
+            header = field[1:]
+            entries = []
+            lines = {}
+        elif field.startswith(":"):
+            meta = field[1:].split()
+            path = next(fields)
+            # Renomeações (R<similaridade>) trazem o caminho antigo e o novo
+            new_path = next(fields) if meta[4][0] == 'R' else path
+            entries.append((meta, path, new_path))
+        elif field:
+            # Linha do --numstat: "adicionadas\tremovidas\tcaminho" ("-" em
+            # binários); em renomeações o caminho fica vazio e o antigo e o
+            # novo vêm nos dois campos seguintes
+            added, deleted, path = field.split("\t", 2)
+            if not path:
+                next(fields)
+                path = next(fields)
+            lines[path] = (int(added) if added != "-" else 0, int(deleted) if deleted != "-" else 0)
+    if header is not None:
+        yield header, _changes(entries, lines)
+
+
+def _changes(entries, lines=None):
+    """
+    Converte as entradas de `--raw` no que o PyDriller reporta.
+
+    Renomeações (com ou sem alteração) são uma única alteração do caminho
+    antigo para o novo. Como na detecção do GitPython, renomeações sem
+    alteração de conteúdo e mudanças só de permissão aparecem sem blob (sem
+    código).
+    """
+    lines = lines or {}
+    changes = []
+    for (_, new_mode, old_blob, new_blob, status), old_path, path in entries:
+        if status == 'D':
+            changes.append((path, None, None, lines.get(path)))
+        elif new_mode == _SUBMODULE_MODE:
+            continue
+        elif old_blob == new_blob:
+            changes.append((old_path, path, None, lines.get(path)))
+        else:
+            changes.append((None if status == 'A' else old_path, path, new_blob, lines.get(path)))
+    return changes
@@ -0,0 +1,160 @@
+import heapq
+from datetime import datetime
+
+from analyzer.repo_miner import iter_file_changes
+
+DEFAULT_TOP = 20
+
+# Critérios de ordenação do ranking
+SORT_KEYS = ('score', 'churn', 'commits', 'complexity')
+
+
+class FileHotspot:
+    """
+    Estado corrente de um arquivo: churn acumulado no período e as
+    métricas da última versão analisada.
+
+    `score` é a frequência de mudança vezes a complexidade: arquivos
+    complexos e alterados com frequência são onde o risco se concentra.
+    """
+
+    __slots__ = ('path', 'commits', 'added_lines', 'deleted_lines', 'complexity', 'code_smells',
+                 'lines_of_code', 'last_modified')
+
+    def __init__(self, path):
+        self.path = path
+        self.commits = 0
+        self.added_lines = 0
+        self.deleted_lines = 0
+        self.complexity = 0
+        self.code_smells = 0
+        self.lines_of_code = 0
+        self.last_modified = None
+
+    @property
+    def churn(self):
+        return self.added_lines + self.deleted_lines
+
+    @property
+    def score(self):
+        return self.commits * self.complexity
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'commits': self.commits,
+            'added_lines': self.added_lines,
+            'deleted_lines': self.deleted_lines,
+            'churn': self.churn,
+            'complexity': self.complexity,
+            'code_smells': self.code_smells,
+            'lines_of_code': self.lines_of_code,
+            'score': self.score,
+            'last_modified': self.last_modified
+        }
+
+
+class HotspotTracker:
+    """
+    Ranking de hotspots (churn × complexidade) mantido ao longo da travessia.
+
+    Cada commit atualiza só os arquivos que alterou (`update` é O(arquivos
+    alterados)), então o ranking pode ser consultado em qualquer ponto do
+    histórico sem percorrê-lo de novo. Arquivos removidos saem do ranking e
+    arquivos renomeados levam o seu histórico para o novo caminho.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.commits = 0
+        self.last_commit = None
+        self.last_date = None
+
+    def update(self, commit, changes):
+        """Aplica os FileChange de um commit (na ordem da travessia)."""
+        date = commit.committer_date
+        for change in changes:
+            if change.new_path is None:
+                self.files.pop(change.old_path, None)
+                continue
+
+            entry = None
+            if change.old_path is not None and change.old_path != change.new_path:
+                entry = self.files.pop(change.old_path, None)
+            if entry is None:
+                entry = self.files.get(change.new_path)
+            if entry is None:
+                entry = FileHotspot(change.new_path)
+            entry.path = change.new_path
+            self.files[change.new_path] = entry
+
+            if not change.source_code:
+                # Renomeação sem alteração ou mudança de permissão
+                continue
+            entry.commits += 1
+            entry.added_lines += change.added_lines or 0
+            entry.deleted_lines += change.deleted_lines or 0
+            entry.last_modified = date
+            if change.metrics is not None:
+                entry.complexity = change.metrics['cyclomatic_complexity']
+                entry.code_smells = change.metrics['code_smells']
+                entry.lines_of_code = change.metrics['lines_of_code']
+
+        self.commits += 1
+        self.last_commit = commit.hash
+        self.last_date = date
+
+    def ranking(self, top=DEFAULT_TOP, sort="score"):
+        """
+        Os `top` arquivos com maior `sort` (um de SORT_KEYS) no estado atual.
+
+        Retorna:
+            list: dicionários de `FileHotspot.to_dict()`, do maior para o menor
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Critério de ordenação inválido: {sort}")
+        key = _SORT_FUNCTIONS[sort]
+        return [entry.to_dict() for entry in heapq.nlargest(top, self.files.values(), key=key)]
+
+
+# Empates são desfeitos pelas outras métricas e, por fim, pelo caminho
+_SORT_FUNCTIONS = {
+    'score': lambda f: (f.score, f.churn, f.path),
+    'churn': lambda f: (f.churn, f.score, f.path),
+    'commits': lambda f: (f.commits, f.churn, f.path),
+    'complexity': lambda f: (f.complexity, f.score, f.path),
+}
+
+
+def iter_hotspots(url, since=None, until=None, at=(), top=DEFAULT_TOP, sort="score", cache=None, jobs=1,
+                  mirrors=None, backend="pydriller", path_filter=None, tracker=None, pipeline=False):
+    """
+    Percorre o histórico uma única vez e gera o ranking de hotspots em
+    cada data de `at` (o estado após o último commit até aquela data) e,
+    por último, ao final do período.
+
+    O churn conta a partir de `since`; as métricas de cada arquivo vêm do
+    mesmo cache por blob e pool da análise por commit.
+
+    Gera:
+        tuple: (data ou None para o final, hash do último commit, ranking)
+    """
+    tracker = tracker if tracker is not None else HotspotTracker()
+    points = sorted(datetime.fromisoformat(point) if isinstance(point, str) else point for point in at)
+
+    def passed(point, date):
+        # Datas sem fuso (da linha de comando) são comparadas no fuso do commit
+        if point.tzinfo is None and date.tzinfo is not None:
+            point = point.replace(tzinfo=date.tzinfo)
+        return date > point
+
+    for commit, changes in iter_file_changes(url, since, until, cache=cache, jobs=jobs, mirrors=mirrors,
+                                             backend=backend, path_filter=path_filter, line_counts=True,
+                                             pipeline=pipeline):
+        while points and passed(points[0], commit.committer_date):
+            yield points.pop(0), tracker.last_commit, tracker.ranking(top, sort)
+        tracker.update(commit, changes)
+
+    for point in points:
+        yield point, tracker.last_commit, tracker.ranking(top, sort)
+    yield None, tracker.last_commit, tracker.ranking(top, sort)
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from analyzer.metrics_extractor import metrics_fingerprint
+
+DEFAULT_MAX_SIZE_MB = 512
+
+
+def default_cache_dir():
+    """
+    Diretório padrão de cache da ferramenta.
+
+    Respeita a variável XDG_CACHE_HOME quando definida.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "codethermometer")
+
+
+def blob_sha(source_code):
+    """
+    Calcula o SHA-1 do blob Git correspondente ao conteúdo informado.
+
+    O hash é o mesmo que o `git hash-object` produziria, então arquivos
+    idênticos em commits diferentes (reverts, cherry-picks) têm a mesma chave.
+    """
+    if isinstance(source_code, str):
+        source_code = source_code.encode("utf-8")
+    header = f"blob {len(source_code)}\0".encode("ascii")
+    return hashlib.sha1(header + source_code).hexdigest()
+
+
+class MetricsCache:
+    """
+    Cache persistente (SQLite) de métricas por blob.
+
+    A chave é o SHA do blob somada à impressão digital dos analisadores,
+    e o valor é o dicionário completo retornado por `extract_metrics`.
+    Quando o tamanho total ultrapassa o limite, as entradas usadas há mais
+    tempo são removidas (LRU).
+    """
+
+    # Quantidade de escritas antes de um commit/verificação de tamanho
+    FLUSH_INTERVAL = 256
+
+    def __init__(self, cache_dir=None, max_size_mb=DEFAULT_MAX_SIZE_MB, fingerprint=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, "metrics.sqlite")
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.fingerprint = fingerprint or metrics_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        self._pending_writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blob_metrics ("
+            " blob_sha TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " metrics TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " PRIMARY KEY (blob_sha, fingerprint))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_blob_metrics_last_used ON blob_metrics (last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, sha):
+        """Retorna as métricas do blob ou None se não estiverem no cache."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT metrics FROM blob_metrics WHERE blob_sha = ? AND fingerprint = ?",
+                (sha, self.fingerprint)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE blob_metrics SET last_used = ? WHERE blob_sha = ? AND fingerprint = ?",
+                (time.time(), sha, self.fingerprint)
+            )
+            self._register_write()
+            return json.loads(row[0])
+
+    def put(self, sha, metrics):
+        """Armazena as métricas de um blob."""
+        encoded = json.dumps(metrics)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO blob_metrics (blob_sha, fingerprint, metrics, size, last_used)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (sha, self.fingerprint, encoded, len(encoded), time.time())
+            )
+            self._register_write()
+
+    def get_or_compute(self, source_code, compute):
+        """
+        Busca as métricas do conteúdo no cache; em caso de falha, calcula
+        com `compute()` e armazena o resultado.
+        """
+        sha = blob_sha(source_code)
+        metrics = self.get(sha)
+        if metrics is None:
+            metrics = compute()
+            self.put(sha, metrics)
+        return metrics
+
+    def stats(self):
+        """
+        Retorna:
+            dict: acertos, falhas, taxa de acerto, entradas e tamanho em bytes
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blob_metrics"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'size_bytes': size
+        }
+
+    def flush(self):
+        """Grava as alterações pendentes e aplica a política de remoção."""
+        with self._lock:
+            self._evict()
+            self._conn.commit()
+            self._pending_writes = 0
+
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _register_write(self):
+        self._pending_writes += 1
+        if self._pending_writes >= self.FLUSH_INTERVAL:
+            self._evict()
+            self._conn.commit()
+            self._pending_writes = 0
+
+    def _evict(self):
+        """Remove as entradas menos usadas até o cache caber no limite."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blob_metrics").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        excess = total - self.max_size_bytes
+        victims = []
+        cursor = self._conn.execute(
+            "SELECT blob_sha, fingerprint, size FROM blob_metrics ORDER BY last_used ASC"
+        )
+        for sha, fingerprint, size in cursor:
+            victims.append((sha, fingerprint))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self._conn.executemany(
+            "DELETE FROM blob_metrics WHERE blob_sha = ? AND fingerprint = ?", victims
+        )
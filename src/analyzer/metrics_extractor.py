@@ -1,7 +1,38 @@
+import hashlib
+import json
 import lizard
-from analyzer.smell_detector import detect_smells
+from lizard_ext import version as lizard_version
+from analyzer.smell_detector import detect_smells, COMPLEXITY_THRESHOLDS, PARAMETERS_THRESHOLD
 from analyzer.coupling_analyzer import analyze_coupling
 from analyzer.maintainability_calculator import calculate_maintainability
+from analyzer.parsed_source import ParsedSource
+from analyzer import profiling
+
+# Incrementar sempre que o cálculo de alguma métrica mudar: invalida o cache
+ANALYZER_VERSION = "2"
+
+# Campos de cada item de 'functions' (listas, para ocupar pouco no cache)
+FUNCTION_FIELDS = ('name', 'start_line', 'cyclomatic_complexity', 'nloc', 'parameters', 'fingerprint')
+
+
+def metrics_fingerprint():
+    """
+    Identifica a versão dos analisadores e os limiares em uso.
+    
+    Métricas guardadas sob outra impressão digital não são reaproveitadas.
+    
+    Retorna:
+        str: hash curto da configuração atual
+    """
+    config = {
+        'analyzer_version': ANALYZER_VERSION,
+        'lizard_version': lizard_version,
+        'complexity_thresholds': COMPLEXITY_THRESHOLDS,
+        'parameters_threshold': PARAMETERS_THRESHOLD
+    }
+    encoded = json.dumps(config, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
 
 def extract_metrics(source_code, filename="temp.py"):
     """
@@ -15,50 +46,13 @@ def extract_metrics(source_code, filename="temp.py"):
             'lines_of_code': int,
             'code_smells': int,
             'functions_count': int,
-            'avg_function_length': float
+            'avg_function_length': float,
+            'functions': list  # uma lista por função, com os FUNCTION_FIELDS
         }
     """
     try:
-        analysis = lizard.analyze_file.analyze_source_code(filename, source_code)
-        
-        # Complexidade cíclomática
-        total_complexity = sum(f.cyclomatic_complexity for f in analysis.function_list)
-        
-        # Acoplamento
-        coupling = analyze_coupling(source_code)
-        
-        # Linhas de código - CORRIGIDO: usar nloc em vez de loc
-        # nloc = non-comment lines of code (mais preciso)
-        lines_of_code = analysis.nloc if hasattr(analysis, 'nloc') else len(source_code.split('\n'))
-        
-        # Índice de manutenibilidade
-        # Usar token_count como proxy para halstead_volume
-        token_count = analysis.token_count if hasattr(analysis, 'token_count') else lines_of_code
-        
-        maintainability = calculate_maintainability(
-            cyclomatic_complexity=total_complexity,
-            loc=lines_of_code,
-            halstead_volume=token_count
-        )
-        
-        # Code smells avançados
-        code_smells = detect_smells(analysis, source_code)
-        
-        # Métricas adicionais
-        functions_count = len(analysis.function_list)
-        avg_function_length = (
-            lines_of_code / functions_count if functions_count > 0 else 0
-        )
-        
-        return {
-            'cyclomatic_complexity': int(total_complexity),
-            'coupling': round(coupling, 2),
-            'maintainability_index': round(maintainability, 2),
-            'lines_of_code': int(lines_of_code),
-            'code_smells': int(code_smells),
-            'functions_count': int(functions_count),
-            'avg_function_length': round(avg_function_length, 2)
-        }
+        with profiling.stage("extract_metrics", filename=filename):
+            return _extract(source_code, filename)
     
     except Exception as e:
         print(f"Erro ao analisar {filename}: {e}")
@@ -69,5 +63,84 @@ def extract_metrics(source_code, filename="temp.py"):
             'lines_of_code': 0,
             'code_smells': 0,
             'functions_count': 0,
-            'avg_function_length': 0.0
-        }
\ No newline at end of file
+            'avg_function_length': 0.0,
+            'functions': []
+        }
+
+
+def _extract(source_code, filename):
+    """Cálculo das métricas, separado para que cada etapa possa ser medida."""
+    # O código é lido, tokenizado e analisado pelo lizard uma única vez
+    with profiling.stage("extract_metrics.lizard"):
+        analysis = lizard.analyze_file.analyze_source_code(filename, source_code)
+    with profiling.stage("extract_metrics.parse"):
+        parsed = ParsedSource(source_code, filename, analysis=analysis)
+    
+    # Complexidade cíclomática
+    total_complexity = sum(f.cyclomatic_complexity for f in analysis.function_list)
+    
+    # Acoplamento
+    with profiling.stage("extract_metrics.coupling"):
+        coupling = analyze_coupling(parsed)
+    
+    # Linhas de código - CORRIGIDO: usar nloc em vez de loc
+    # nloc = non-comment lines of code (mais preciso)
+    lines_of_code = analysis.nloc if hasattr(analysis, 'nloc') else len(parsed.lines)
+    
+    # Índice de manutenibilidade
+    # Usar token_count como proxy para halstead_volume
+    token_count = analysis.token_count if hasattr(analysis, 'token_count') else lines_of_code
+    
+    maintainability = calculate_maintainability(
+        cyclomatic_complexity=total_complexity,
+        loc=lines_of_code,
+        halstead_volume=token_count
+    )
+    
+    # Code smells avançados
+    with profiling.stage("extract_metrics.smells"):
+        code_smells = detect_smells(analysis, parsed)
+    
+    # Métricas adicionais
+    functions_count = len(analysis.function_list)
+    avg_function_length = (
+        lines_of_code / functions_count if functions_count > 0 else 0
+    )
+    
+    return {
+        'cyclomatic_complexity': int(total_complexity),
+        'coupling': round(coupling, 2),
+        'maintainability_index': round(maintainability, 2),
+        'lines_of_code': int(lines_of_code),
+        'code_smells': int(code_smells),
+        'functions_count': int(functions_count),
+        'avg_function_length': round(avg_function_length, 2),
+        'functions': [
+            [
+                f.name,
+                f.start_line,
+                int(f.cyclomatic_complexity),
+                int(f.nloc),
+                len(f.parameters),
+                body_fingerprint(parsed.lines, f.start_line, f.end_line)
+            ]
+            for f in analysis.function_list
+        ]
+    }
+
+
+def body_fingerprint(lines, start_line, end_line):
+    """
+    Impressão digital do corpo de uma função (linhas `start_line` a
+    `end_line`, contadas a partir de 1).
+
+    A linha da assinatura fica de fora e a indentação e as linhas em branco
+    são ignoradas: a mesma função movida para outro arquivo, para dentro de
+    uma classe ou renomeada mantém a impressão digital.
+    """
+    body = [line.strip() for line in lines[start_line:end_line]]
+    body = [line for line in body if line]
+    if not body:
+        # Função de uma linha: o corpo está na própria assinatura
+        body = [line.strip() for line in lines[start_line - 1:start_line]]
+    return hashlib.sha1("\n".join(body).encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,201 @@
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta, timezone
+
+# Colunas numéricas e o tipo do array que as guarda ('q' = int64, 'd' = double)
+NUMERIC_COLUMNS = (
+    ('complexity', 'q'),
+    ('coupling', 'd'),
+    ('maintainability_index', 'd'),
+    ('lines_of_code', 'q'),
+    ('code_smells', 'q'),
+    ('functions_count', 'q'),
+    ('avg_function_length', 'd'),
+    ('files_modified', 'q'),
+)
+
+# Mesma ordem de chaves dos dicionários de resultado
+KEYS = ('hash', 'date', 'author') + tuple(name for name, _ in NUMERIC_COLUMNS)
+
+HASH_WIDTH = 7
+# Marca datas sem fuso horário na coluna de deslocamentos
+NAIVE = -2 ** 31
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class CommitMetricsTable(Sequence):
+    """
+    Resultados por commit guardados em colunas.
+
+    Cada métrica numérica fica em um `array` tipado, a data em microssegundos
+    desde a época (mais o deslocamento do fuso em segundos), o autor como
+    índice em uma lista de nomes únicos e o hash abreviado em um buffer de
+    largura fixa. Um commit ocupa algumas dezenas de bytes, contra centenas
+    do dicionário equivalente.
+
+    O acesso por índice devolve um `CommitRow`, que se comporta como o
+    dicionário de resultado original; `column(nome)` dá acesso direto aos
+    valores de uma métrica para agregações.
+    """
+
+    def __init__(self):
+        self._hashes = bytearray()
+        self._dates = array('q')
+        self._offsets = array('i')
+        self._author_ids = array('I')
+        self._authors = []
+        self._author_index = {}
+        self._columns = {name: array(typecode) for name, typecode in NUMERIC_COLUMNS}
+
+    @classmethod
+    def from_results(cls, results):
+        """Constrói a tabela a partir de dicionários de resultado (lista ou gerador)."""
+        table = cls()
+        for result in results:
+            table.append(result)
+        return table
+
+    def append(self, result):
+        """Acrescenta o resultado de um commit (dicionário ou CommitRow)."""
+        encoded = result['hash'].encode('ascii')
+        if len(encoded) > HASH_WIDTH:
+            raise ValueError(f"Hash maior que {HASH_WIDTH} caracteres: {result['hash']}")
+        self._hashes += encoded.ljust(HASH_WIDTH, b'\0')
+
+        self._append_date(result['date'])
+
+        author = result['author']
+        author_id = self._author_index.get(author)
+        if author_id is None:
+            author_id = self._author_index[author] = len(self._authors)
+            self._authors.append(author)
+        self._author_ids.append(author_id)
+
+        for name, column in self._columns.items():
+            column.append(result[name])
+
+    def _append_date(self, date):
+        offset = date.utcoffset()
+        if offset is None:
+            self._dates.append((date - _EPOCH) // _MICROSECOND)
+            self._offsets.append(NAIVE)
+        else:
+            self._dates.append((date - _EPOCH_UTC) // _MICROSECOND)
+            self._offsets.append(int(offset.total_seconds()))
+
+    def __len__(self):
+        return len(self._author_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [CommitRow(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice fora da tabela")
+        return CommitRow(self, index)
+
+    def __eq__(self, other):
+        if isinstance(other, (CommitMetricsTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def column(self, name):
+        """Valores de uma métrica numérica, na ordem das linhas (sem cópia)."""
+        return self._columns[name]
+
+    def dates(self):
+        """Datas de todas as linhas, na ordem das linhas."""
+        return [self._date(i) for i in range(len(self))]
+
+    @property
+    def authors(self):
+        """Autores distintos, na ordem em que apareceram."""
+        return list(self._authors)
+
+    def author_counts(self):
+        """Número de commits de cada autor."""
+        counts = [0] * len(self._authors)
+        for author_id in self._author_ids:
+            counts[author_id] += 1
+        return dict(zip(self._authors, counts))
+
+    def author_totals(self, name):
+        """Soma de uma métrica numérica para cada autor."""
+        totals = [0] * len(self._authors)
+        for author_id, value in zip(self._author_ids, self._columns[name]):
+            totals[author_id] += value
+        return dict(zip(self._authors, totals))
+
+    def date_bounds(self):
+        """
+        Índices da linha mais antiga e da mais recente. Nos empates, a
+        primeira e a última delas, como ficariam na ordenação estável.
+        """
+        dates = self._dates
+        first = dates.index(min(dates))
+        last = len(dates) - 1 - dates[::-1].index(max(dates))
+        return first, last
+
+    def sort_by_date(self):
+        """Ordena as linhas por data (ordenação estável, como `list.sort`)."""
+        # Instante absoluto; datas sem fuso comparam pelo valor local
+        order = sorted(range(len(self)), key=self._dates.__getitem__)
+        if order == list(range(len(self))):
+            return
+
+        hashes = self._hashes
+        self._hashes = bytearray().join(hashes[i * HASH_WIDTH:(i + 1) * HASH_WIDTH] for i in order)
+        self._dates = array('q', (self._dates[i] for i in order))
+        self._offsets = array('i', (self._offsets[i] for i in order))
+        self._author_ids = array('I', (self._author_ids[i] for i in order))
+        for name, column in self._columns.items():
+            self._columns[name] = array(column.typecode, (column[i] for i in order))
+
+    def _hash(self, index):
+        start = index * HASH_WIDTH
+        return self._hashes[start:start + HASH_WIDTH].rstrip(b'\0').decode('ascii')
+
+    def _date(self, index):
+        micros = timedelta(microseconds=self._dates[index])
+        offset = self._offsets[index]
+        if offset == NAIVE:
+            return _EPOCH + micros
+        tz = timezone(timedelta(seconds=offset))
+        return (_EPOCH_UTC + micros).astimezone(tz)
+
+    def _value(self, index, key):
+        if key == 'hash':
+            return self._hash(index)
+        if key == 'date':
+            return self._date(index)
+        if key == 'author':
+            return self._authors[self._author_ids[index]]
+        return self._columns[key][index]
+
+
+class CommitRow(Mapping):
+    """Visão de uma linha da tabela com a interface do dicionário de resultado."""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, key):
+        if key not in KEYS:
+            raise KeyError(key)
+        return self._table._value(self._index, key)
+
+    def __iter__(self):
+        return iter(KEYS)
+
+    def __len__(self):
+        return len(KEYS)
+
+    def __repr__(self):
+        return repr(dict(self))
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+
+from analyzer.metrics_cache import default_cache_dir
+
+MIRRORS_DIRNAME = "mirrors"
+METADATA_FILENAME = "codethermometer.json"
+
+# `usuario@host:caminho` (sintaxe scp aceita pelo git)
+_SCP_LIKE_RE = re.compile(r'^[\w.-]+@[\w.-]+:')
+
+
+def is_remote_url(url):
+    """Indica se `url` aponta para um repositório remoto (e não um diretório local)."""
+    if os.path.isdir(url):
+        return False
+    return "://" in url or bool(_SCP_LIKE_RE.match(url))
+
+
+def mirror_name(url):
+    """Nome do diretório do espelho: final legível da URL + hash da URL completa."""
+    base = url.rstrip("/").rsplit("/", 1)[-1].rsplit(":", 1)[-1]
+    if base.endswith(".git"):
+        base = base[:-4]
+    base = re.sub(r'[^\w.-]', '_', base) or "repo"
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+    return f"{base}-{digest}.git"
+
+
+class MirrorCache:
+    """
+    Cache de clones espelho (bare) dos repositórios remotos, por URL.
+
+    A primeira análise de uma URL cria um espelho, por padrão como clone
+    parcial sem blobs (`--filter=blob:none`): o conteúdo dos arquivos é
+    baixado sob demanda quando é lido. As execuções seguintes apenas fazem
+    `git fetch` no espelho existente, então a busca na rede é a única etapa
+    que depende do remoto.
+    """
+
+    def __init__(self, cache_dir=None, partial=True):
+        self.root = os.path.join(cache_dir or default_cache_dir(), MIRRORS_DIRNAME)
+        self.partial = partial
+
+    def path_for(self, url):
+        return os.path.join(self.root, mirror_name(url))
+
+    def resolve(self, url):
+        """
+        Retorna o caminho a ser analisado para `url`.
+
+        Diretórios locais são usados diretamente; URLs remotas passam pelo
+        espelho, que é criado ou atualizado.
+        """
+        if not is_remote_url(url):
+            return url
+        return self.ensure(url)
+
+    def ensure(self, url):
+        """Cria o espelho de `url` ou atualiza o existente. Retorna o seu caminho."""
+        path = self.path_for(url)
+        if os.path.isdir(path):
+            _run_git("fetch", "--prune", "--quiet", "origin", git_dir=path)
+        else:
+            self._clone(url, path)
+        self._write_metadata(path, url)
+        return path
+
+    def list(self):
+        """
+        Lista os espelhos existentes.
+
+        Retorna:
+            list: dicionários com url, path, size_bytes e last_fetch (epoch)
+        """
+        if not os.path.isdir(self.root):
+            return []
+
+        mirrors = []
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name)
+            metadata = _read_metadata(path)
+            if metadata is None:
+                continue
+            mirrors.append({
+                "url": metadata["url"],
+                "path": path,
+                "size_bytes": _directory_size(path),
+                "last_fetch": metadata["last_fetch"]
+            })
+        return mirrors
+
+    def prune(self, urls=None, older_than_days=None):
+        """
+        Remove espelhos.
+
+        Sem argumentos remove todos; `urls` restringe às URLs informadas e
+        `older_than_days` aos espelhos não atualizados há mais desse tempo.
+
+        Retorna:
+            list: os espelhos removidos (no formato de `list()`)
+        """
+        cutoff = None
+        if older_than_days is not None:
+            cutoff = time.time() - older_than_days * 86400
+
+        removed = []
+        for mirror in self.list():
+            if urls is not None and mirror["url"] not in urls:
+                continue
+            if cutoff is not None and mirror["last_fetch"] >= cutoff:
+                continue
+            shutil.rmtree(mirror["path"])
+            removed.append(mirror)
+        return removed
+
+    def _clone(self, url, path):
+        os.makedirs(self.root, exist_ok=True)
+        # Clona em um diretório temporário: um clone interrompido não deixa
+        # um espelho incompleto no cache
+        tmp_path = tempfile.mkdtemp(prefix=".clone-", dir=self.root)
+        try:
+            args = ["clone", "--mirror", "--quiet"]
+            if self.partial:
+                args.append("--filter=blob:none")
+            _run_git(*args, url, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+    def _write_metadata(self, path, url):
+        metadata_path = os.path.join(path, METADATA_FILENAME)
+        tmp_path = metadata_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "last_fetch": time.time()}, f)
+        os.replace(tmp_path, metadata_path)
+
+
+@contextmanager
+def local_repository(url):
+    """
+    Caminho local de `url` durante o bloco `with`.
+
+    Diretórios locais (inclusive espelhos) são usados diretamente; URLs
+    remotas (sem espelho) são clonadas, sem checkout, em um diretório
+    temporário que só é removido ao final do bloco.
+    """
+    if not is_remote_url(url):
+        yield url
+        return
+    tmp_path = tempfile.mkdtemp(prefix="codethermometer-")
+    try:
+        path = os.path.join(tmp_path, "repo.git")
+        _run_git("clone", "--bare", "--quiet", url, path)
+        yield path
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _read_metadata(path):
+    try:
+        with open(os.path.join(path, METADATA_FILENAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _directory_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, filename))
+            except OSError:
+                pass
+    return total
+
+
+def _run_git(command, *args, git_dir=None):
+    prefix = ["git", "--git-dir", git_dir] if git_dir else ["git"]
+    result = subprocess.run([*prefix, command, *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {command} falhou: {result.stderr.strip()}")
+    return result.stdout
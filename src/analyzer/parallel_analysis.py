@@ -0,0 +1,120 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from analyzer.metrics_extractor import extract_metrics
+from analyzer import profiling
+
+# Arquivos menores que isso são agrupados no mesmo lote para diluir o custo de pickling
+DEFAULT_BATCH_BYTES = 64 * 1024
+
+
+def resolve_jobs(jobs):
+    """Converte o valor de --jobs em número de processos (0 = todos os núcleos)."""
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, int(jobs))
+
+
+def plan_batches(files, jobs, batch_bytes=DEFAULT_BATCH_BYTES):
+    """
+    Agrupa arquivos em lotes, dos maiores para os menores.
+
+    Arquivos grandes ficam sozinhos; os pequenos são reunidos até atingir
+    `batch_bytes`. O limite é reduzido quando necessário para que haja ao
+    menos um lote por processo.
+
+    Retorna:
+        list: lotes com os índices dos arquivos em `files`
+    """
+    if not files:
+        return []
+
+    sizes = [len(source) for _, source in files]
+    order = sorted(range(len(files)), key=lambda i: sizes[i], reverse=True)
+    limit = max(1, min(batch_bytes, sum(sizes) // max(1, jobs)))
+
+    batches = []
+    current = []
+    current_size = 0
+    for index in order:
+        if current and current_size + sizes[index] > limit:
+            batches.append(current)
+            current = []
+            current_size = 0
+        current.append(index)
+        current_size += sizes[index]
+    if current:
+        batches.append(current)
+
+    return batches
+
+
+def _analyze_batch(batch, profile=False):
+    """
+    Executado nos processos filhos: analisa um lote de (índice, nome, código).
+
+    Com `profile`, mede as etapas no processo filho e devolve os tempos
+    junto com os resultados.
+
+    Retorna:
+        tuple: (resultados, tempos ou None)
+    """
+    if profile:
+        profiling.enable()
+    results = []
+    try:
+        for index, filename, source_code in batch:
+            try:
+                results.append((index, extract_metrics(source_code, filename), None))
+            except Exception as e:
+                results.append((index, None, str(e)))
+    finally:
+        profiler = profiling.disable() if profile else None
+    return results, profiler.export_records() if profiler is not None else None
+
+
+class FileAnalysisPool:
+    """
+    Pool de processos que executa `extract_metrics` em paralelo.
+
+    A travessia do Git continua no processo principal; apenas o código
+    fonte dos arquivos é enviado aos processos filhos.
+    """
+
+    def __init__(self, jobs, batch_bytes=DEFAULT_BATCH_BYTES):
+        self.jobs = resolve_jobs(jobs)
+        self.batch_bytes = batch_bytes
+        self._executor = ProcessPoolExecutor(max_workers=self.jobs)
+
+    def analyze(self, files):
+        """
+        Analisa uma lista de (filename, source_code).
+
+        Retorna:
+            list: (métricas, erro) de cada arquivo, na mesma ordem da entrada
+        """
+        results = [(None, None)] * len(files)
+        futures = []
+        profiler = profiling.active()
+        # Os lotes já vêm do maior para o menor: são submetidos nessa ordem
+        for batch in plan_batches(files, self.jobs, self.batch_bytes):
+            payload = [(index, files[index][0], files[index][1]) for index in batch]
+            futures.append(self._executor.submit(_analyze_batch, payload, profiler is not None))
+
+        for future in futures:
+            batch_results, records = future.result()
+            for index, metrics, error in batch_results:
+                results[index] = (metrics, error)
+            if records is not None:
+                profiler.merge_records(records)
+
+        return results
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
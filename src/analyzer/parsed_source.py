@@ -0,0 +1,167 @@
+from collections import Counter
+
+import lizard
+
+from analyzer.source_tokens import tokenize, at_line_start, has_line_start
+
+
+class ParsedSource:
+    """
+    Código de um arquivo já analisado, construído uma única vez e
+    compartilhado por todos os analisadores (lizard, acoplamento e smells).
+
+    Atributos:
+        source_code: código original
+        filename: nome do arquivo
+        lines: linhas do código (split em '\\n')
+        tokens: tuplas (início, fim, texto, é_palavra)
+        identifiers: Counter com as ocorrências de cada palavra
+        assignments: nomes atribuídos no início de linha, em ordem
+        imports: módulos importados no início de linha (sem indentação), em ordem
+        imported_modules: módulos importados em qualquer indentação
+        definitions: nomes de classes e funções definidas
+        calls: Counter de nomes seguidos de '('
+        cross_references: ocorrências de `nome.nome(`
+        analysis: FileInformation do lizard (calculado no primeiro acesso,
+            se não for informado)
+    """
+
+    def __init__(self, source_code, filename="temp.py", analysis=None):
+        self.source_code = source_code
+        self.filename = filename
+        self.lines = source_code.split('\n')
+        self.tokens = tokenize(source_code)
+        self.identifiers = Counter()
+        self.assignments = []
+        self.imports = []
+        self.imported_modules = set()
+        self.definitions = set()
+        self.calls = Counter()
+        self.cross_references = 0
+        self._analysis = analysis
+        self._index()
+
+    @property
+    def analysis(self):
+        if self._analysis is None:
+            self._analysis = lizard.analyze_file.analyze_source_code(self.filename, self.source_code)
+        return self._analysis
+
+    def _index(self):
+        """
+        Percorre os tokens uma única vez e monta todos os índices.
+
+        Reproduz exatamente as expressões regulares usadas originalmente
+        pelos analisadores (todas com re.MULTILINE quando ancoradas):
+        - atribuições: `^\\s*(\\w+)\\s*=`
+        - imports: `^(?:from\\s+(\\w+)\\s+import|import\\s+(\\w+))`
+        - módulos importados: `^import\\s+(\\w+)`, `^from\\s+(\\w+)\\s+import`,
+          `^\\s+import\\s+(\\w+)` e `^\\s+from\\s+(\\w+)\\s+import`
+        - usos de um nome: `\\bnome\\b`
+        - chamadas: `\\bnome\\s*\\(`
+        - referências cruzadas: `(\\w+)\\.(\\w+)\\s*\\(`
+        - definições: `class\\s+(\\w+)` e `def\\s+(\\w+)`
+        """
+        source_code = self.source_code
+        tokens = self.tokens
+        count = len(tokens)
+
+        # Fim do último trecho casado por cada padrão (as regex não se sobrepõem)
+        consumed = {
+            'assignment': 0, 'line_import': 0,
+            'import': 0, 'from': 0, 'indented_import': 0, 'indented_from': 0,
+            'class': 0, 'def': 0
+        }
+        previous_end = 0
+
+        for i in range(count):
+            start, end, text, is_word = tokens[i]
+            if not is_word:
+                previous_end = end
+                continue
+
+            self.identifiers[text] += 1
+            following = tokens[i + 1] if i + 1 < count else None
+
+            # Atribuição: nome no início da linha (após espaços) seguido de '='
+            if (following is not None and following[2] == '='
+                    and has_line_start(source_code, max(previous_end, consumed['assignment']), start)):
+                self.assignments.append(text)
+                consumed['assignment'] = following[1]
+
+            # Chamada: nome seguido de '('
+            if following is not None and following[2] == '(':
+                self.calls[text] += 1
+
+            # Referência cruzada: nome.nome(
+            if (i + 3 < count and following[2] == '.' and following[0] == end
+                    and tokens[i + 2][3] and tokens[i + 2][0] == following[1]
+                    and tokens[i + 3][2] == '('):
+                self.cross_references += 1
+
+            # Definições (a palavra-chave pode ser sufixo de outra palavra)
+            for keyword in ('class', 'def'):
+                if text.endswith(keyword) and end - len(keyword) >= consumed[keyword]:
+                    name = _spaced_word(tokens, i)
+                    if name is not None:
+                        self.definitions.add(name)
+                        consumed[keyword] = tokens[i + 1][1]
+
+            if text in ('import', 'from'):
+                self._index_import(i, previous_end, consumed)
+
+            previous_end = end
+
+    def _index_import(self, i, previous_end, consumed):
+        match = _match_import(self.tokens, i)
+        if match is None:
+            return
+
+        module, match_end = match
+        start, _, text, _ = self.tokens[i]
+
+        if at_line_start(self.source_code, start):
+            # Padrão único `^(?:from...|import...)`
+            if start >= consumed['line_import']:
+                self.imports.append(module)
+                consumed['line_import'] = match_end
+            # Padrões `^import...` e `^from...`
+            if start >= consumed[text]:
+                self.imported_modules.add(module)
+                consumed[text] = match_end
+
+        # Padrões `^\s+import...` e `^\s+from...`
+        indented = 'indented_' + text
+        if has_line_start(self.source_code, max(previous_end, consumed[indented]), start - 1):
+            self.imported_modules.add(module)
+            consumed[indented] = match_end
+
+
+def _match_import(tokens, i):
+    """
+    Tenta casar `import X` ou `from X import` a partir do token `i`.
+
+    Retorna:
+        tuple: (módulo, fim do trecho casado) ou None
+    """
+    name = _spaced_word(tokens, i)
+    if name is None:
+        return None
+
+    if tokens[i][2] == 'import':
+        return name, tokens[i + 1][1]
+
+    if _spaced_word(tokens, i + 1) is not None and tokens[i + 2][2].startswith('import'):
+        return name, tokens[i + 2][0] + len('import')
+
+    return None
+
+
+def _spaced_word(tokens, i):
+    """Retorna o texto do token i+1 se ele for uma palavra separada por espaço."""
+    if i + 1 >= len(tokens):
+        return None
+    start, _, text, is_word = tokens[i + 1]
+    if not is_word or start == tokens[i][1]:
+        return None
+    return text
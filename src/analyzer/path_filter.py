@@ -0,0 +1,212 @@
+import os
+import re
+import subprocess
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+CONFIG_FILENAME = ".codethermometer"
+_CONFIG_KEYS = ('include', 'exclude')
+
+
+class PathFilter:
+    """
+    Seleção dos arquivos analisados por globs de inclusão e exclusão.
+
+    Só arquivos `.py` são considerados. Os padrões seguem a sintaxe do
+    `.gitignore`: um padrão sem `/` vale em qualquer diretório (`*_pb2.py`),
+    `**` atravessa diretórios e um padrão que casa com um diretório vale
+    para tudo dentro dele (`vendor/`, `**/migrations`). Sem padrões de
+    inclusão, todos os arquivos Python entram.
+
+    O mesmo filtro é traduzido em pathspecs do git (`pathspecs`), para que a
+    travessia já descarte os commits e caminhos fora dele sem ler conteúdo.
+    """
+
+    def __init__(self, include=(), exclude=()):
+        self.include = tuple(normalize_pattern(p) for p in include)
+        self.exclude = tuple(normalize_pattern(p) for p in exclude)
+        self._include_re = _compile(self.include)
+        self._exclude_re = _compile(self.exclude)
+
+    def __bool__(self):
+        """Indica se há padrões além da restrição a arquivos Python."""
+        return bool(self.include or self.exclude)
+
+    def __repr__(self):
+        return f"PathFilter(include={list(self.include)!r}, exclude={list(self.exclude)!r})"
+
+    def matches(self, path):
+        """Indica se o arquivo (caminho relativo à raiz do repositório) é analisado."""
+        if not path.endswith(".py"):
+            return False
+        if self._include_re is not None and not _match(self._include_re, path):
+            return False
+        return self._exclude_re is None or not _match(self._exclude_re, path)
+
+    def pathspecs(self):
+        """Pathspecs do git equivalentes ao filtro (um superconjunto, sem a restrição a .py quando há inclusões)."""
+        specs = []
+        for pattern in self.include or ("**/*.py",):
+            specs.extend(f":(glob){p}" for p in _with_contents(pattern))
+        for pattern in self.exclude:
+            specs.extend(f":(glob,exclude){p}" for p in _with_contents(pattern))
+        return specs
+
+    def key(self):
+        """Identificação do filtro no estado salvo (None sem padrões)."""
+        if not self:
+            return None
+        return {'include': list(self.include), 'exclude': list(self.exclude)}
+
+
+def normalize_pattern(pattern):
+    """Normaliza um padrão no estilo `.gitignore` para um glob relativo à raiz."""
+    pattern = pattern.strip().replace("\\", "/")
+    while pattern.startswith("./"):
+        pattern = pattern[2:]
+    anchored = pattern.startswith("/")
+    pattern = pattern.strip("/")
+    if not pattern:
+        raise ValueError("Padrão de caminho vazio")
+    if not anchored and "/" not in pattern:
+        pattern = f"**/{pattern}"
+    return pattern
+
+
+def load_config(path):
+    """
+    Lê os padrões de um arquivo `.codethermometer` (TOML):
+
+        include = ["src/**"]
+        exclude = ["vendor/", "**/migrations/", "*_pb2.py"]
+
+    Retorna:
+        dict: listas 'include' e 'exclude'
+    """
+    with open(path, "rb") as f:
+        try:
+            data = tomllib.load(f)
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Configuração inválida em {path}: {e}")
+
+    unknown = set(data) - set(_CONFIG_KEYS)
+    if unknown:
+        raise ValueError(f"Chaves desconhecidas em {path}: {', '.join(sorted(unknown))}")
+    config = {}
+    for key in _CONFIG_KEYS:
+        value = data.get(key, [])
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise ValueError(f"'{key}' em {path} deve ser uma lista de padrões")
+        config[key] = value
+    return config
+
+
+def find_config(repo_url):
+    """
+    Arquivo de configuração usado quando nenhum é informado: o da raiz do
+    repositório (se for um diretório local) ou o do diretório atual.
+
+    Retorna:
+        str ou None
+    """
+    candidates = []
+    if os.path.isdir(repo_url):
+        candidates.append(os.path.join(repo_url, CONFIG_FILENAME))
+    candidates.append(CONFIG_FILENAME)
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def build_filter(include=(), exclude=(), config_path=None):
+    """Filtro com os padrões do arquivo de configuração somados aos informados."""
+    config = load_config(config_path) if config_path else {'include': [], 'exclude': []}
+    return PathFilter(config['include'] + list(include), config['exclude'] + list(exclude))
+
+
+def matching_commits(path, pathspecs, since_dt=None, until_dt=None):
+    """
+    Hashes dos commits do período que alteram algum caminho dos pathspecs
+    (sem a simplificação de histórico do git), ou None se `path` não é um
+    repositório local.
+    """
+    if not os.path.isdir(path):
+        return None
+    command = ["git", "-C", path, "rev-list", "--full-history", "HEAD"]
+    if since_dt is not None:
+        command.append(f"--since={since_dt:%Y-%m-%d %H:%M:%S}")
+    if until_dt is not None:
+        command.append(f"--until={until_dt:%Y-%m-%d %H:%M:%S}")
+    command.append("--")
+    command.extend(pathspecs)
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return set(result.stdout.split())
+
+
+def _with_contents(pattern):
+    # Pathspecs com glob não casam diretórios-pai como os padrões do .gitignore
+    if pattern.endswith("/**"):
+        return (pattern,)
+    return (pattern, f"{pattern}/**")
+
+
+def _compile(patterns):
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{_glob_to_regex(p)})" for p in patterns))
+
+
+def _match(regex, path):
+    """Casa o caminho ou algum dos diretórios que o contêm."""
+    if regex.fullmatch(path):
+        return True
+    index = path.find("/")
+    while index != -1:
+        if regex.fullmatch(path, 0, index):
+            return True
+        index = path.find("/", index + 1)
+    return False
+
+
+def _glob_to_regex(pattern):
+    """Tradução de um glob (mesma semântica do `:(glob)` do git) para regex."""
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1:end]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
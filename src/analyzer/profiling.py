@@ -0,0 +1,251 @@
+import heapq
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+DEFAULT_TOP_N = 10
+
+# Perfil ativo do processo (None = desativado)
+_active = None
+
+
+class _NullStage:
+    """Contexto vazio usado quando o perfil está desativado."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'filename', 'commit', 'start')
+
+    def __init__(self, profiler, name, filename, commit):
+        self.profiler = profiler
+        self.name = name
+        self.filename = filename
+        self.commit = commit
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.add(self.name, time.perf_counter() - self.start, self.filename, self.commit)
+        return False
+
+
+def stage(name, filename=None, commit=None):
+    """
+    Mede o trecho de código executado dentro do `with`.
+
+    `filename` e `commit` atribuem o tempo a um arquivo ou commit, para a
+    lista dos mais lentos. Com o perfil desativado, retorna um contexto
+    vazio compartilhado: o custo é só o de uma chamada de função.
+    """
+    if _active is None:
+        return _NULL_STAGE
+    return _Stage(_active, name, filename, commit)
+
+
+def timed_iter(iterable, name):
+    """Mede o tempo gasto para obter cada item de `iterable` (sem custo quando desativado)."""
+    if _active is None:
+        return iterable
+    return _timed_iter(_active, iter(iterable), name)
+
+
+def _timed_iter(profiler, iterator, name):
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            profiler.add(name, time.perf_counter() - start)
+            return
+        profiler.add(name, time.perf_counter() - start)
+        yield item
+
+
+def enable(top_n=DEFAULT_TOP_N):
+    """Ativa o perfil no processo atual e retorna o Profiler."""
+    global _active
+    _active = Profiler(top_n)
+    return _active
+
+
+def disable():
+    """Desativa o perfil e retorna o Profiler que estava ativo."""
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+def is_enabled():
+    return _active is not None
+
+
+def active():
+    return _active
+
+
+# Histograma dos percentis: cada balde é 1% mais largo que o anterior, a
+# partir de 0,1 µs (erro relativo de no máximo 1% nos percentis)
+_BUCKET_MIN = 1e-7
+_BUCKET_GROWTH = 1.01
+_LOG_GROWTH = math.log(_BUCKET_GROWTH)
+
+# Commits ainda recebendo tempo (a janela do pool e a leitura em pipeline
+# ficam bem abaixo disso); os mais antigos vão para o heap dos mais lentos
+_OPEN_COMMITS = 1024
+
+
+class StageStats:
+    """
+    Estatísticas correntes de uma etapa: chamadas, total, máximo e um
+    histograma em escala logarítmica para os percentis. A memória depende
+    da faixa de durações, e não do número de chamadas.
+    """
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        bucket = math.ceil(math.log(seconds / _BUCKET_MIN) / _LOG_GROWTH) if seconds > _BUCKET_MIN else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def percentile(self, fraction):
+        """Percentil pelo método do posto mais próximo (limite superior do balde)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(_BUCKET_MIN * _BUCKET_GROWTH ** bucket, self.max)
+        return self.max
+
+
+class Profiler:
+    """
+    Tempos por etapa de uma execução.
+
+    Guarda estatísticas correntes de cada etapa (StageStats, para totais e
+    percentis) e só os `top_n` arquivos e commits mais lentos, então a
+    memória não cresce com o tamanho do histórico. Etapas com '.' no nome
+    são subetapas de outra e não entram no tempo atribuído aos commits,
+    para não contar o mesmo trecho duas vezes. Com a leitura em pipeline,
+    etapas de threads diferentes se sobrepõem e a soma das etapas pode
+    passar do tempo total.
+    """
+
+    def __init__(self, top_n=DEFAULT_TOP_N):
+        self.top_n = top_n
+        self.started = time.perf_counter()
+        self.finished = None
+        self.stages = defaultdict(StageStats)
+        # Heaps mínimos de (segundos, nome) com os mais lentos
+        self.files = []
+        self.commits = []
+        # Tempo dos commits recentes, que ainda podem receber outras etapas
+        self._open_commits = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds, filename=None, commit=None):
+        with self._lock:
+            self.stages[name].add(seconds)
+            if filename is not None:
+                self._keep_slowest(self.files, (seconds, filename))
+            if commit is not None and '.' not in name:
+                open_commits = self._open_commits
+                open_commits[commit] = open_commits.get(commit, 0.0) + seconds
+                open_commits.move_to_end(commit)
+                if len(open_commits) > _OPEN_COMMITS:
+                    oldest, total = open_commits.popitem(last=False)
+                    self._keep_slowest(self.commits, (total, oldest))
+
+    def _keep_slowest(self, heap, entry):
+        if len(heap) < self.top_n:
+            heapq.heappush(heap, entry)
+        elif heap and entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def export_records(self):
+        """Dados de um processo filho, para enviar ao principal."""
+        return {'stages': dict(self.stages), 'files': self.files}
+
+    def merge_records(self, records):
+        """Incorpora os dados de um processo filho."""
+        with self._lock:
+            for name, stats in records['stages'].items():
+                self.stages[name].merge(stats)
+            for entry in records['files']:
+                self._keep_slowest(self.files, entry)
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def wall_seconds(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary(self):
+        """
+        Resumo da execução.
+
+        Retorna:
+            dict: tempo total, estatísticas por etapa (chamadas, total,
+            média, p50, p90, p95, p99, máximo) e os arquivos e commits mais
+            lentos
+        """
+        stages = {}
+        for name, stats in self.stages.items():
+            stages[name] = {
+                'count': stats.count,
+                'total': stats.total,
+                'mean': stats.total / stats.count if stats.count else 0.0,
+                'p50': stats.percentile(0.50),
+                'p90': stats.percentile(0.90),
+                'p95': stats.percentile(0.95),
+                'p99': stats.percentile(0.99),
+                'max': stats.max
+            }
+
+        slowest_files = sorted(self.files, reverse=True)
+        commits = list(self.commits)
+        for commit, seconds in self._open_commits.items():
+            self._keep_slowest(commits, (seconds, commit))
+        slowest_commits = sorted(commits, reverse=True)
+        return {
+            'wall_seconds': self.wall_seconds,
+            'stages': stages,
+            'slowest_files': [{'file': f, 'seconds': s} for s, f in slowest_files],
+            'slowest_commits': [{'commit': c, 'seconds': s} for s, c in slowest_commits]
+        }
+
+    def dump_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
@@ -1,92 +1,614 @@
+import itertools
+import os
+import queue
+import subprocess
+import threading
 from pydriller import Repository
 from datetime import datetime
 from analyzer.metrics_extractor import extract_metrics
+from analyzer.metrics_cache import blob_sha
+from analyzer.metrics_table import CommitMetricsTable
+from analyzer.parallel_analysis import FileAnalysisPool
+from analyzer.git_backend import NativeRepository
+from analyzer.path_filter import matching_commits
+from analyzer import profiling
 
-def analyze_repository(url, since=None, until=None):
+# Com --jobs > 1, os arquivos de vários commits são enviados juntos ao pool
+# para que commits pequenos não deixem núcleos ociosos
+FILES_PER_JOB = 16
+MAX_COMMITS_PER_WINDOW = 64
+
+# No modo pipeline, quantos commits (com o conteúdo dos arquivos) podem ser
+# lidos à frente da análise: limita a memória quando o git é mais rápido
+PIPELINE_DEPTH = 2 * MAX_COMMITS_PER_WINDOW
+
+
+def analyze_repository(url, since=None, until=None, cache=None, jobs=1, state=None, mirrors=None,
+                       shard=None, on_commit=None, progress=None, backend="pydriller", path_filter=None,
+                       pipeline=False):
     """
-    Retorna uma lista de commits com:
+    Retorna os commits com:
     - Complexidade cíclomática
     - Acoplamento
     - Índice de manutenibilidade
     - Linhas de código
     - Code smells avançados
     - Estatísticas por função
+
+    O resultado é uma CommitMetricsTable (colunar, com linhas que se
+    comportam como dicionários) ordenada por data. Os parâmetros são os
+    mesmos de `iter_repository_metrics`.
     """
+    try:
+        results = CommitMetricsTable.from_results(iter_repository_metrics(
+            url, since, until, cache=cache, jobs=jobs, state=state, mirrors=mirrors, shard=shard,
+            on_commit=on_commit, progress=progress, backend=backend, path_filter=path_filter,
+            pipeline=pipeline
+        ))
+    except Exception as e:
+        print(f"Erro ao acessar repositório: {e}")
+        return CommitMetricsTable()
+
+    results.sort_by_date()
+    return results
+
+
+def iter_repository_metrics(url, since=None, until=None, cache=None, jobs=1, state=None,
+                            mirrors=None, shard=None, on_commit=None, progress=None,
+                            backend="pydriller", path_filter=None, pool=None, pipeline=False):
+    """
+    Gera as métricas de cada commit assim que são calculadas, na ordem da
+    travessia (commits sem arquivos Python modificados são omitidos).
+
+    Se `cache` (MetricsCache) for informado, arquivos cujo conteúdo já foi
+    analisado antes reaproveitam as métricas armazenadas. Com `jobs` > 1 as
+    métricas dos arquivos são calculadas em um pool de processos; um pool
+    já aberto (FileAnalysisPool) pode ser passado em `pool` para ser
+    compartilhado entre análises, e nesse caso não é fechado aqui.
+
+    Com `state` (RunState), a análise é incremental: os resultados salvos
+    são gerados primeiro e apenas os commits posteriores ao último já
+    analisado são percorridos. O progresso é salvo periodicamente para
+    retomar execuções interrompidas.
+
+    Com `mirrors` (MirrorCache), URLs remotas são analisadas a partir de um
+    espelho local, atualizado com `git fetch` em vez de clonado de novo.
+
+    Com `shard` (Shard), apenas a faixa de commits correspondente é
+    analisada.
+
+    `on_commit(resultado, file_metrics)` é chamado para cada resultado
+    gerado, com as métricas de cada arquivo do commit (None para os
+    resultados retomados do estado salvo). É o gancho usado pelos
+    exportadores para gravar as linhas assim que são calculadas.
+
+    `progress` (ex.: LiveDashboard) acompanha a execução: `start(total,
+    done)` recebe o número de commits do período (None se não for possível
+    contar) e quantos já foram processados em execuções anteriores,
+    `restore(resultado)` cada resultado retomado do estado salvo e
+    `advance(resultado, arquivos)` cada commit percorrido (resultado None
+    se o commit não tem arquivos Python).
+
+    `backend` escolhe como o histórico é lido: "pydriller" (padrão) ou
+    "native" (NativeRepository: `git log --raw` e `git cat-file --batch`,
+    sem calcular diffs; requer repositório local ou espelho).
+
+    Com `path_filter` (PathFilter), só os arquivos selecionados entram, e o
+    filtro é aplicado na travessia: commits que não alteram nenhum desses
+    caminhos são descartados antes de qualquer diff ou leitura de conteúdo.
+
+    Com `pipeline`, uma thread lê os commits e o conteúdo dos arquivos (o
+    trabalho do git) enquanto os anteriores são analisados, até
+    PIPELINE_DEPTH commits à frente. Com `jobs` > 1 o tempo total tende ao
+    maior entre o do git e o da análise, em vez da soma dos dois.
+    """
+    if mirrors is not None:
+        url = mirrors.resolve(url)
+
     since_dt = datetime.fromisoformat(since) if since else None
     until_dt = datetime.fromisoformat(until) if until else None
 
-    results = []
+    own_pool = pool is None and jobs != 1
+    if own_pool:
+        pool = FileAnalysisPool(jobs)
 
     try:
-        for commit in Repository(url, since=since_dt, to=until_dt).traverse_commits():
-            commit_metrics = {
-                "hash": commit.hash[:7],
-                "date": commit.committer_date,
-                "author": commit.author.name,
-                "complexity": 0,
-                "coupling": 0.0,
-                "maintainability_index": 100.0,
-                "lines_of_code": 0,
-                "code_smells": 0,
-                "functions_count": 0,
-                "avg_function_length": 0.0,
-                "files_modified": 0
-            }
-            
-            file_metrics = []
-            
-            for mod in commit.modified_files:
-                if mod.filename and mod.filename.endswith(".py") and mod.source_code:
-                    try:
-                        metrics = extract_metrics(mod.source_code, mod.filename)
-                        
-                        # Agrega métricas
-                        commit_metrics["complexity"] += metrics['cyclomatic_complexity']
-                        commit_metrics["coupling"] += metrics['coupling']
-                        commit_metrics["lines_of_code"] += metrics['lines_of_code']
-                        commit_metrics["code_smells"] += metrics['code_smells']
-                        commit_metrics["functions_count"] += metrics['functions_count']
-                        
-                        file_metrics.append({
-                            'filename': mod.filename,
-                            'metrics': metrics
-                        })
-                        
-                    except Exception as e:
-                        print(f"Erro ao processar {mod.filename}: {e}")
-                        continue
-            
-            # Calcula média de manutenibilidade
-            if file_metrics:
-                commit_metrics["files_modified"] = len(file_metrics)
-                
-                # Médias ponderadas
-                if commit_metrics["functions_count"] > 0:
-                    commit_metrics["avg_function_length"] = (
-                        commit_metrics["lines_of_code"] / commit_metrics["functions_count"]
-                    )
-                
-                # Recalcula acoplamento como média
-                commit_metrics["coupling"] = (
-                    commit_metrics["coupling"] / len(file_metrics)
-                    if file_metrics else 0
-                )
-                
-                # Calcula índice de manutenibilidade do commit
-                from analyzer.maintainability_calculator import calculate_maintainability
-                commit_metrics["maintainability_index"] = calculate_maintainability(
-                    commit_metrics["complexity"],
-                    commit_metrics["lines_of_code"],
-                    commit_metrics["lines_of_code"]  # Usando LOC como proxy para volume
-                )
-            
-            # Só adiciona se tem pelo menos um arquivo Python modificado
+        commits = profiling.timed_iter(
+            _traverse_commits(url, since_dt, until_dt, state, backend, path_filter), "traversal"
+        )
+        if shard is not None:
+            commits = _select_shard(commits, shard, url, since_dt, until_dt, path_filter)
+        if progress is not None:
+            pathspecs = path_filter.pathspecs() if path_filter is not None else None
+            if shard is not None:
+                total = shard.end - shard.start
+            else:
+                total = count_commits(url, since_dt, until_dt, pathspecs)
+            progress.start(total, state.commits_seen if state is not None else 0)
+        if state is not None:
+            for result in state.saved_results():
+                if on_commit is not None:
+                    on_commit(result, None)
+                if progress is not None:
+                    progress.restore(result)
+                yield result
+
+        for commit, file_metrics in _analyze_commits(commits, cache, pool, path_filter, pipeline):
+            commit_metrics = None
+            # Só gera se tem pelo menos um arquivo Python modificado
             if file_metrics:
-                results.append(commit_metrics)
+                with profiling.stage("aggregation", commit=commit.hash[:7]):
+                    commit_metrics = _aggregate_commit(commit, file_metrics)
+            if state is not None:
+                with profiling.stage("state"):
+                    state.record(commit.hash, commit_metrics)
+            if progress is not None:
+                progress.advance(commit_metrics, len(file_metrics))
+            if commit_metrics is not None:
+                if on_commit is not None:
+                    on_commit(commit_metrics, file_metrics)
+                yield commit_metrics
+
+    finally:
+        if own_pool:
+            pool.close()
+        if state is not None:
+            state.checkpoint()
+            state.close()
+
+
+def count_commits(path, since_dt=None, until_dt=None, pathspecs=None):
+    """
+    Número de commits do período em um repositório local (o mesmo conjunto
+    percorrido pelo PyDriller), usado para estimar o tempo restante. Com
+    `pathspecs`, conta só os commits que alteram esses caminhos.
+
+    Retorna:
+        int ou None: None se `path` não é um diretório local ou o git falhou
+    """
+    if not os.path.isdir(path):
+        return None
+    command = ["git", "-C", path, "rev-list", "--count", "HEAD"]
+    if since_dt is not None:
+        command.append(f"--since={since_dt:%Y-%m-%d %H:%M:%S}")
+    if until_dt is not None:
+        command.append(f"--until={until_dt:%Y-%m-%d %H:%M:%S}")
+    if pathspecs:
+        command.extend(["--full-history", "--", *pathspecs])
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return int(result.stdout.strip())
+
+
+def _select_shard(commits, shard, url, since_dt, until_dt, path_filter=None):
+    """
+    Commits da faixa de `shard`, lidos da travessia ainda aberta.
 
+    O total de commits vem do `git rev-list --count` no repositório local;
+    para uma URL remota sem espelho, no clone temporário do PyDriller, que
+    só existe enquanto a travessia não termina.
+    """
+    commits = iter(commits)
+    first = next(commits, None)
+    if first is None:
+        return shard.select((), 0)
+    local = os.path.isdir(url)
+    path = url if local else first.project_path
+    # Sem repositório local o PyDriller não pré-seleciona commits pelo filtro
+    pathspecs = path_filter.pathspecs() if path_filter is not None and local else None
+    total = count_commits(path, since_dt, until_dt, pathspecs)
+    if total is None:
+        raise RuntimeError(f"Não foi possível contar os commits de {url}")
+    return shard.select(itertools.chain([first], commits), total)
+
+
+def _traverse_commits(url, since_dt, until_dt, state=None, backend="pydriller", path_filter=None,
+                      line_counts=False):
+    """
+    Retorna o iterador de commits do repositório.
+
+    Se houver estado salvo, começa no último commit analisado (que é
+    descartado, pois já foi processado). O estado é validado aqui, antes de
+    qualquer resultado salvo ser reaproveitado.
+    """
+    if state is None or not state.resumed:
+        return _repository_commits(url, backend, path_filter, line_counts, since=since_dt, to=until_dt)
+
+    last_commit = state.last_commit
+    try:
+        commits = iter(_repository_commits(url, backend, path_filter, line_counts,
+                                           from_commit=last_commit, to=until_dt))
+        first = next(commits, None)
     except Exception as e:
-        print(f"Erro ao acessar repositório: {e}")
-        return []
+        # Histórico reescrito (o commit salvo não existe mais): recomeça do zero
+        print(f"Estado salvo inválido ({e}); refazendo a análise completa")
+        state.reset()
+        return _repository_commits(url, backend, path_filter, line_counts, since=since_dt, to=until_dt)
+
+    if first is None or first.hash == last_commit:
+        return commits
+    return itertools.chain([first], commits)
+
+
+def _repository_commits(url, backend, path_filter=None, line_counts=False, **kwargs):
+    """
+    Commits do backend escolhido (`kwargs` são os filtros do PyDriller),
+    restritos aos que alteram caminhos de `path_filter`. Com `line_counts`,
+    o backend nativo também conta as linhas alteradas (o PyDriller sempre
+    calcula os diffs).
+    """
+    if backend == "native":
+        paths = path_filter.pathspecs() if path_filter is not None else None
+        return NativeRepository(url, paths=paths, numstat=line_counts, **kwargs).traverse_commits()
+
+    commits = Repository(url, **kwargs).traverse_commits()
+    if path_filter is None:
+        return commits
+    # O PyDriller não filtra por caminho: os commits são escolhidos antes por
+    # `git rev-list` e os demais descartados pelo hash, sem calcular o diff
+    selected = matching_commits(url, path_filter.pathspecs(), kwargs.get('since'), kwargs.get('to'))
+    if selected is None:
+        return commits
+    return (commit for commit in commits if commit.hash in selected)
+
+
+def _analyze_commits(commits, cache=None, pool=None, path_filter=None, pipeline=False):
+    """
+    Gera (commit, file_metrics) na ordem da travessia.
+
+    Sem pool, cada commit é analisado assim que lido. Com pool, os commits
+    são agrupados em janelas cujos arquivos são analisados de uma só vez.
+    Com `pipeline`, a leitura é feita à frente por outra thread.
+    """
+    window = []
+    window_files = 0
+    files_per_window = pool.jobs * FILES_PER_JOB if pool is not None else 0
+
+    def read(commit):
+        return _python_sources(commit, path_filter)
+
+    for commit, files in _read_commits(commits, read, pipeline):
+        window.append((commit, files))
+        window_files += len(files)
+
+        if window_files >= files_per_window or len(window) >= MAX_COMMITS_PER_WINDOW:
+            yield from _analyze_window(window, cache, pool)
+            window = []
+            window_files = 0
+
+    if window:
+        yield from _analyze_window(window, cache, pool)
+
+
+def _read_commits(commits, read, pipeline=False):
+    """
+    Gera (commit, read(commit)) na ordem da travessia.
+
+    Com `pipeline`, a travessia e as leituras rodam em uma thread produtora
+    (ver `_read_ahead`); os atributos do commit usados depois também são
+    lidos lá, para que só essa thread acesse o repositório.
+    """
+    def produce():
+        for commit in commits:
+            with profiling.stage("modified_files", commit=commit.hash[:7]):
+                files = read(commit)
+                if pipeline:
+                    _load_commit_fields(commit)
+            yield commit, files
+
+    if not pipeline:
+        return produce()
+    return _read_ahead(produce(), PIPELINE_DEPTH)
+
+
+def _load_commit_fields(commit):
+    # O PyDriller carrega data e autor sob demanda, pelo processo
+    # `git cat-file` do GitPython, que não pode ser usado por duas threads
+    commit.committer_date
+    commit.author.name
+
+
+def _read_ahead(iterable, depth):
+    """
+    Consome `iterable` em uma thread produtora, até `depth` itens à frente
+    de quem lê, e gera os itens na mesma ordem.
+
+    A fila limitada faz a produtora esperar quando a análise fica para
+    trás (backpressure). Uma exceção na produtora é relançada aqui, depois
+    dos itens gerados antes dela; se quem lê parar antes do fim, a
+    produtora é encerrada e o iterador fechado na própria thread.
+    """
+    buffer = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(iterable)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except BaseException as e:
+            put((done, e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name="codethermometer-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            with profiling.stage("pipeline_wait"):
+                item, error = buffer.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _analyze_window(window, cache, pool):
+    all_files = [(filename, source_code) for _, files in window for _, filename, source_code in files]
+    # Sem pool cada janela tem um único commit, ao qual o tempo é atribuído
+    commit = window[0][0].hash[:7] if len(window) == 1 else None
+    with profiling.stage("file_analysis", commit=commit):
+        all_metrics = analyze_files(all_files, cache, pool)
+
+    offset = 0
+    for commit, files in window:
+        file_metrics = []
+        for (path, filename, _), metrics in zip(files, all_metrics[offset:offset + len(files)]):
+            if metrics is not None:
+                file_metrics.append({
+                    'path': path,
+                    'filename': filename,
+                    'metrics': metrics
+                })
+        offset += len(files)
+        yield commit, file_metrics
+
+
+class FileChange:
+    """
+    Arquivo Python alterado em um commit.
+
+    `old_path` é None para arquivos adicionados e `new_path` para
+    removidos (sair ou entrar no filtro de caminhos conta como remoção ou
+    adição). Renomeações sem alteração de conteúdo e mudanças só de
+    permissão não têm `source_code`. `metrics` são as de `extract_metrics`
+    para a nova versão (None se não há conteúdo ou a análise falhou).
+    """
+
+    __slots__ = ('old_path', 'new_path', 'filename', 'source_code', 'added_lines', 'deleted_lines', 'metrics')
+
+    def __init__(self, old_path, new_path, filename, source_code=None, added_lines=None, deleted_lines=None):
+        self.old_path = old_path
+        self.new_path = new_path
+        self.filename = filename
+        self.source_code = source_code
+        self.added_lines = added_lines
+        self.deleted_lines = deleted_lines
+        self.metrics = None
+
+
+def iter_file_changes(url, since=None, until=None, cache=None, jobs=1, pool=None, mirrors=None,
+                      backend="pydriller", path_filter=None, state=None, line_counts=False, pipeline=False):
+    """
+    Gera (commit, lista de FileChange) para cada commit percorrido, com as
+    métricas de cada arquivo calculadas como em `iter_repository_metrics`
+    (mesmo cache por blob, pool e janelas de commits).
+
+    É a base das análises por arquivo, que precisam dos caminhos, das
+    remoções e renomeações e, com `line_counts`, das linhas adicionadas e
+    removidas. `state` só precisa de `resumed`, `last_commit` e `reset()`:
+    a travessia começa depois do último commit já processado. `pipeline`
+    tem o mesmo efeito que em `iter_repository_metrics`.
+    """
+    if mirrors is not None:
+        url = mirrors.resolve(url)
+
+    since_dt = datetime.fromisoformat(since) if since else None
+    until_dt = datetime.fromisoformat(until) if until else None
+
+    own_pool = pool is None and jobs != 1
+    if own_pool:
+        pool = FileAnalysisPool(jobs)
+    files_per_window = pool.jobs * FILES_PER_JOB if pool is not None else 0
+
+    try:
+        commits = profiling.timed_iter(
+            _traverse_commits(url, since_dt, until_dt, state, backend, path_filter, line_counts), "traversal"
+        )
+        window = []
+        window_files = 0
+
+        def read(commit):
+            return file_changes(commit, path_filter, line_counts)
+
+        for commit, changes in _read_commits(commits, read, pipeline):
+            window.append((commit, changes))
+            window_files += sum(1 for change in changes if change.source_code)
+
+            if window_files >= files_per_window or len(window) >= MAX_COMMITS_PER_WINDOW:
+                yield from _analyze_change_window(window, cache, pool)
+                window = []
+                window_files = 0
+
+        if window:
+            yield from _analyze_change_window(window, cache, pool)
+    finally:
+        if own_pool:
+            pool.close()
+
+
+def file_changes(commit, path_filter=None, line_counts=False):
+    """Lista os FileChange dos arquivos Python do commit (sem as métricas)."""
+    def wanted(path):
+        if path_filter is not None:
+            return path_filter.matches(path)
+        return path.endswith(".py")
+
+    changes = []
+    for mod in commit.modified_files:
+        old_path = mod.old_path.replace(os.sep, "/") if mod.old_path else None
+        new_path = mod.new_path.replace(os.sep, "/") if mod.new_path else None
+        old_path = old_path if old_path and wanted(old_path) else None
+        new_path = new_path if new_path and wanted(new_path) else None
+        if old_path is None and new_path is None:
+            continue
+        change = FileChange(old_path, new_path, mod.filename)
+        if new_path is not None:
+            change.source_code = mod.source_code
+        if line_counts:
+            change.added_lines = mod.added_lines
+            change.deleted_lines = mod.deleted_lines
+        changes.append(change)
+    return changes
+
+
+def _analyze_change_window(window, cache, pool):
+    analyzed = [change for _, changes in window for change in changes if change.source_code]
+    commit = window[0][0].hash[:7] if len(window) == 1 else None
+    with profiling.stage("file_analysis", commit=commit):
+        all_metrics = analyze_files([(change.filename, change.source_code) for change in analyzed], cache, pool)
+    for change, metrics in zip(analyzed, all_metrics):
+        change.metrics = metrics
+    yield from window
+
+
+def _python_sources(commit, path_filter=None):
+    """
+    Lista (caminho, filename, source_code) dos arquivos Python modificados
+    no commit; o caminho é relativo à raiz do repositório.
+
+    Com `path_filter`, o caminho é verificado antes de o conteúdo ser lido.
+    """
+    if path_filter is not None:
+        return [
+            (path, mod.filename, mod.source_code)
+            for mod, path in _new_paths(commit)
+            if path_filter.matches(path) and mod.source_code
+        ]
+    return [
+        (path, mod.filename, mod.source_code)
+        for mod, path in _new_paths(commit)
+        if mod.filename and mod.filename.endswith(".py") and mod.source_code
+    ]
+
+
+def _new_paths(commit):
+    for mod in commit.modified_files:
+        if mod.new_path:
+            yield mod, mod.new_path.replace(os.sep, "/")
+
+
+def analyze_files(files, cache=None, pool=None):
+    """
+    Calcula as métricas de uma lista de (filename, source_code).
+
+    Retorna:
+        list: métricas de cada arquivo na mesma ordem (None se falhou)
+    """
+    results = [None] * len(files)
+    # Conteúdos iguais na janela são analisados uma vez só:
+    # blob_sha -> índices dos arquivos com esse conteúdo
+    pending = {}
+
+    with profiling.stage("file_analysis.cache"):
+        for index, (_, source_code) in enumerate(files):
+            sha = blob_sha(source_code)
+            if sha in pending:
+                pending[sha].append(index)
+                continue
+            if cache is not None:
+                cached = cache.get(sha)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+            pending[sha] = [index]
+
+    unique = [indexes[0] for indexes in pending.values()]
+    if pool is not None:
+        computed = pool.analyze([files[index] for index in unique])
+    else:
+        computed = [_extract_serial(*files[index]) for index in unique]
+
+    for (sha, indexes), (metrics, error) in zip(pending.items(), computed):
+        if error is not None:
+            for index in indexes:
+                print(f"Erro ao processar {files[index][0]}: {error}")
+            continue
+        for index in indexes:
+            results[index] = metrics
+        if cache is not None:
+            cache.put(sha, metrics)
+
+    return results
+
+
+def _extract_serial(filename, source_code):
+    try:
+        return extract_metrics(source_code, filename), None
+    except Exception as e:
+        return None, e
+
+
+def _aggregate_commit(commit, file_metrics):
+    """Agrega as métricas dos arquivos de um commit."""
+    commit_metrics = {
+        "hash": commit.hash[:7],
+        "date": commit.committer_date,
+        "author": commit.author.name,
+        "complexity": 0,
+        "coupling": 0.0,
+        "maintainability_index": 100.0,
+        "lines_of_code": 0,
+        "code_smells": 0,
+        "functions_count": 0,
+        "avg_function_length": 0.0,
+        "files_modified": 0
+    }
+
+    for entry in file_metrics:
+        metrics = entry['metrics']
+        commit_metrics["complexity"] += metrics['cyclomatic_complexity']
+        commit_metrics["coupling"] += metrics['coupling']
+        commit_metrics["lines_of_code"] += metrics['lines_of_code']
+        commit_metrics["code_smells"] += metrics['code_smells']
+        commit_metrics["functions_count"] += metrics['functions_count']
+
+    commit_metrics["files_modified"] = len(file_metrics)
+
+    # Médias ponderadas
+    if commit_metrics["functions_count"] > 0:
+        commit_metrics["avg_function_length"] = (
+            commit_metrics["lines_of_code"] / commit_metrics["functions_count"]
+        )
+
+    # Recalcula acoplamento como média
+    commit_metrics["coupling"] = commit_metrics["coupling"] / len(file_metrics)
+
+    # Calcula índice de manutenibilidade do commit
+    from analyzer.maintainability_calculator import calculate_maintainability
+    commit_metrics["maintainability_index"] = calculate_maintainability(
+        commit_metrics["complexity"],
+        commit_metrics["lines_of_code"],
+        commit_metrics["lines_of_code"]  # Usando LOC como proxy para volume
+    )
 
-    results.sort(key=lambda x: x["date"])
-    return results
\ No newline at end of file
+    return commit_metrics
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+
+def result_to_record(result):
+    """
+    Converte o resultado de um commit em um dicionário serializável em JSON.
+
+    A data vira uma string ISO 8601 (com fuso horário, quando houver).
+    """
+    record = dict(result)
+    date = record.get("date")
+    if hasattr(date, "isoformat"):
+        record["date"] = date.isoformat()
+    return record
+
+
+def result_from_record(record):
+    """Operação inversa de `result_to_record`."""
+    result = dict(record)
+    date = result.get("date")
+    if isinstance(date, str):
+        try:
+            result["date"] = datetime.fromisoformat(date)
+        except ValueError:
+            pass
+    return result
@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from analyzer.metrics_extractor import metrics_fingerprint
+from analyzer.result_io import result_to_record, result_from_record
+
+STATE_VERSION = 1
+DEFAULT_CHECKPOINT_EVERY = 100
+
+
+def state_key(url, since=None, until=None, paths=None):
+    """Identificador estável de uma análise (repositório + período + filtro de caminhos)."""
+    if os.path.isdir(url):
+        url = os.path.abspath(url)
+    # Sem filtro a chave é a mesma de antes, preservando estados já salvos
+    raw = json.dumps([url, since, until] + ([paths] if paths else []))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class RunState:
+    """
+    Estado persistido de uma análise, para execuções incrementais.
+
+    Guarda o SHA do último commit percorrido e os resultados por commit.
+    Os resultados são anexados a um arquivo JSONL; o cabeçalho JSON, escrito
+    de forma atômica a cada checkpoint, registra até onde esse arquivo é
+    válido. Assim uma execução interrompida retoma do último checkpoint.
+    Os resultados não ficam em memória: `saved_results` os relê do arquivo.
+
+    `paths` identifica o filtro de caminhos da análise (`PathFilter.key()`):
+    análises com filtros diferentes têm estados separados.
+    """
+
+    def __init__(self, state_dir, url, since=None, until=None,
+                 checkpoint_every=DEFAULT_CHECKPOINT_EVERY, paths=None):
+        self.url = url
+        self.since = since
+        self.until = until
+        self.paths = paths
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.fingerprint = metrics_fingerprint()
+
+        os.makedirs(state_dir, exist_ok=True)
+        key = state_key(url, since, until, paths)
+        self.header_path = os.path.join(state_dir, f"{key}.json")
+        self.results_path = os.path.join(state_dir, f"{key}.jsonl")
+
+        self.last_commit = None
+        self.commits_seen = 0
+        self.results_count = 0
+        self._results_bytes = 0
+        self._uncheckpointed = 0
+        self._results_file = None
+
+        self._load()
+
+    @property
+    def resumed(self):
+        """Indica se havia estado salvo de uma execução anterior."""
+        return self.last_commit is not None
+
+    def record(self, commit_hash, result=None):
+        """
+        Registra um commit percorrido e, se houver, o seu resultado.
+
+        Deve ser chamado na ordem da travessia.
+        """
+        if result is not None:
+            line = json.dumps(result_to_record(result), default=str).encode("utf-8") + b"\n"
+            self._open_results().write(line)
+            self._results_bytes += len(line)
+            self.results_count += 1
+
+        self.last_commit = commit_hash
+        self.commits_seen += 1
+        self._uncheckpointed += 1
+        if self._uncheckpointed >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Torna duráveis os resultados registrados até agora."""
+        if self._results_file is not None:
+            self._results_file.flush()
+            os.fsync(self._results_file.fileno())
+
+        header = {
+            'version': STATE_VERSION,
+            'url': self.url,
+            'since': self.since,
+            'until': self.until,
+            'paths': self.paths,
+            'fingerprint': self.fingerprint,
+            'last_commit': self.last_commit,
+            'commits_seen': self.commits_seen,
+            'results_count': self.results_count,
+            'results_bytes': self._results_bytes,
+            'updated_at': datetime.now().isoformat()
+        }
+        tmp_path = self.header_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(header, f)
+        os.replace(tmp_path, self.header_path)
+        self._uncheckpointed = 0
+
+    def reset(self):
+        """Descarta o estado salvo e recomeça do zero."""
+        self.close()
+        for path in (self.header_path, self.results_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.last_commit = None
+        self.commits_seen = 0
+        self.results_count = 0
+        self._results_bytes = 0
+        self._uncheckpointed = 0
+
+    def saved_results(self):
+        """
+        Gera os resultados registrados até agora, na ordem da travessia,
+        lendo o arquivo JSONL linha a linha.
+        """
+        if self._results_file is not None:
+            self._results_file.flush()
+        remaining = self._results_bytes
+        if not remaining:
+            return
+        with open(self.results_path, "rb") as f:
+            for line in f:
+                remaining -= len(line)
+                if remaining < 0:
+                    break
+                yield result_from_record(json.loads(line))
+
+    def close(self):
+        if self._results_file is not None:
+            self._results_file.close()
+            self._results_file = None
+
+    def _open_results(self):
+        if self._results_file is None:
+            self._results_file = open(self.results_path, "ab")
+        return self._results_file
+
+    def _load(self):
+        try:
+            with open(self.header_path, encoding="utf-8") as f:
+                header = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if (header.get('version') != STATE_VERSION
+                or header.get('fingerprint') != self.fingerprint
+                or header.get('since') != self.since
+                or header.get('until') != self.until
+                or header.get('paths') != self.paths):
+            # Estado de outra versão dos analisadores: recomeça
+            self.reset()
+            return
+
+        results_bytes = header.get('results_bytes', 0)
+        try:
+            size = os.path.getsize(self.results_path)
+        except OSError:
+            size = 0
+
+        if size < results_bytes:
+            self.reset()
+            return
+
+        self.results_count = header.get('results_count', 0)
+        self.last_commit = header.get('last_commit')
+        self.commits_seen = header.get('commits_seen', 0)
+        self._results_bytes = results_bytes
+
+        # Descarta o que foi escrito depois do último checkpoint (o arquivo
+        # não existe se nenhum commit percorrido teve resultado)
+        if os.path.exists(self.results_path):
+            with open(self.results_path, "r+b") as f:
+                f.truncate(results_bytes)
@@ -0,0 +1,177 @@
+import json
+import os
+import re
+from datetime import datetime
+
+from analyzer.metrics_extractor import metrics_fingerprint
+from analyzer.metrics_table import CommitMetricsTable
+from analyzer.result_io import result_to_record, result_from_record
+
+PARTIAL_FORMAT = "codethermometer-partial"
+PARTIAL_VERSION = 1
+
+_SHARD_RE = re.compile(r'^\s*(\d+)\s*/\s*(\d+)\s*$')
+
+
+def parse_shard_spec(spec):
+    """
+    Interpreta o valor de --shard no formato `i/N` (i de 1 a N).
+
+    Retorna:
+        Shard
+    """
+    match = _SHARD_RE.match(str(spec))
+    if match is None:
+        raise ValueError(f"Shard inválido: {spec!r} (use i/N, por exemplo 2/4)")
+    index, count = int(match.group(1)), int(match.group(2))
+    if not 1 <= index <= count:
+        raise ValueError(f"Shard inválido: {spec!r} (i deve estar entre 1 e N)")
+    return Shard(index, count)
+
+
+def shard_bounds(total, index, count):
+    """Faixa [início, fim) dos commits do shard `index` (de 1 a `count`)."""
+    return (index - 1) * total // count, index * total // count
+
+
+class Shard:
+    """
+    Uma de N partes contíguas da lista de commits da travessia.
+
+    A partição depende só do número de commits, então máquinas diferentes
+    que percorrem o mesmo repositório e período escolhem as mesmas faixas.
+    Depois de `select`, guarda a faixa escolhida para o cabeçalho do
+    arquivo parcial.
+    """
+
+    def __init__(self, index, count):
+        self.index = index
+        self.count = count
+        self.total_commits = None
+        self.start = None
+        self.end = None
+        self.first_commit = None
+        self.last_commit = None
+
+    def select(self, commits, total):
+        """
+        Gera os commits deste shard, na ordem da travessia.
+
+        `total` é o número de commits da travessia completa (ex.:
+        `count_commits`). Os commits são filtrados pela posição à medida que
+        são lidos, sem guardar o histórico em memória, e a travessia para
+        ao fim da faixa.
+        """
+        self.total_commits = total
+        self.start, self.end = shard_bounds(total, self.index, self.count)
+        return self._range(commits)
+
+    def _range(self, commits):
+        for position, commit in enumerate(commits):
+            if position >= self.end:
+                break
+            if position >= self.start:
+                if self.first_commit is None:
+                    self.first_commit = commit.hash
+                self.last_commit = commit.hash
+                yield commit
+
+    def default_filename(self):
+        return f"codethermometer-shard-{self.index}-of-{self.count}.json"
+
+
+def write_partial(path, shard, url, since, until, results):
+    """
+    Grava o arquivo parcial de um shard.
+
+    O arquivo descreve a si mesmo: além dos resultados por commit (na ordem
+    da travessia), registra o repositório, o período, a versão dos
+    analisadores e a faixa de commits, para que `merge_partials` possa
+    validar o conjunto.
+    """
+    partial = {
+        'format': PARTIAL_FORMAT,
+        'version': PARTIAL_VERSION,
+        'url': url,
+        'since': since,
+        'until': until,
+        'fingerprint': metrics_fingerprint(),
+        'shard_index': shard.index,
+        'shard_count': shard.count,
+        'total_commits': shard.total_commits,
+        'start': shard.start,
+        'end': shard.end,
+        'first_commit': shard.first_commit,
+        'last_commit': shard.last_commit,
+        'created_at': datetime.now().isoformat(),
+        'results': [result_to_record(result) for result in results]
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(partial, f, default=str)
+    os.replace(tmp_path, path)
+
+
+def read_partial(path):
+    """Lê e valida o formato de um arquivo parcial."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            partial = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Arquivo parcial ilegível: {path} ({e})")
+
+    if not isinstance(partial, dict) or partial.get('format') != PARTIAL_FORMAT:
+        raise ValueError(f"{path} não é um arquivo parcial do CodeThermometer")
+    if partial.get('version') != PARTIAL_VERSION:
+        raise ValueError(f"{path}: versão de arquivo parcial não suportada ({partial.get('version')})")
+    return partial
+
+
+def merge_partials(paths):
+    """
+    Combina os arquivos parciais de todos os shards de uma análise.
+
+    Verifica se todos vêm da mesma análise (repositório, período e versão
+    dos analisadores), se nenhum shard falta ou se repete e se as faixas
+    são contíguas.
+
+    Retorna:
+        tuple: (cabeçalho do primeiro shard, resultados na mesma ordem que
+        `analyze_repository` retornaria)
+    """
+    partials = [read_partial(path) for path in paths]
+    if not partials:
+        raise ValueError("Nenhum arquivo parcial informado")
+
+    first = partials[0]
+    for key in ('url', 'since', 'until', 'fingerprint', 'shard_count', 'total_commits'):
+        values = {partial.get(key) for partial in partials}
+        if len(values) > 1:
+            raise ValueError(f"Arquivos parciais de análises diferentes ({key}: {sorted(map(str, values))})")
+
+    partials.sort(key=lambda partial: partial['shard_index'])
+    indexes = [partial['shard_index'] for partial in partials]
+    expected = list(range(1, first['shard_count'] + 1))
+    if indexes != expected:
+        missing = sorted(set(expected) - set(indexes))
+        repeated = sorted({i for i in indexes if indexes.count(i) > 1})
+        raise ValueError(f"Shards incompletos (faltando: {missing}, repetidos: {repeated})")
+
+    position = 0
+    for partial in partials:
+        if partial['start'] != position:
+            raise ValueError(f"Shard {partial['shard_index']} não continua o anterior")
+        position = partial['end']
+    if position != first['total_commits']:
+        raise ValueError("Os shards não cobrem todos os commits")
+
+    results = CommitMetricsTable.from_results(
+        result_from_record(record)
+        for partial in partials
+        for record in partial['results']
+    )
+    # Mesma ordenação (estável) de `analyze_repository`
+    results.sort_by_date()
+
+    header = {key: value for key, value in first.items() if key != 'results'}
+    return header, results
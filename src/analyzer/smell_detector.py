@@ -1,5 +1,18 @@
-import re
 from collections import defaultdict
+from analyzer.parsed_source import ParsedSource
+
+# Limiares usados pelos detectores (também compõem a impressão digital do cache)
+COMPLEXITY_THRESHOLDS = {
+    'complexity_high': 15,
+    'complexity_critical': 25,
+    'length_high': 100,
+    'length_critical': 200
+}
+PARAMETERS_THRESHOLD = 5
+
+# Nomes muito genéricos
+GENERIC_NAMES = {'a', 'b', 'c', 'x', 'y', 'z', 'i', 'j', 'k', 'tmp', 'temp', 'data', 'value', 'var'}
+
 
 def detect_smells(analysis, source_code):
     """
@@ -13,32 +26,39 @@ def detect_smells(analysis, source_code):
     7. Parâmetros em excesso
     8. Nomes genéricos (a, b, x, y, etc)
     
+    `source_code` pode ser o texto ou um ParsedSource já construído; todas
+    as regras são avaliadas sobre o mesmo índice de tokens.
+    
     Retorna:
         int: Total de code smells detectados
     """
     
+    if isinstance(source_code, ParsedSource):
+        parsed = source_code
+    else:
+        parsed = ParsedSource(source_code, analysis=analysis)
     total_smells = 0
     
     # 1. Complexidade alta e funções longas
     total_smells += _detect_complex_functions(analysis)
     
     # 2. Código duplicado
-    total_smells += _detect_code_duplication(source_code)
+    total_smells += _detect_code_duplication(parsed.lines)
     
     # 3. Variáveis não utilizadas
-    total_smells += _detect_unused_variables(source_code)
+    total_smells += _detect_unused_variables(parsed)
     
     # 4. Imports não utilizados
-    total_smells += _detect_unused_imports(source_code)
+    total_smells += _detect_unused_imports(parsed)
     
     # 5. Aninhamento profundo
-    total_smells += _detect_deep_nesting(source_code)
+    total_smells += _detect_deep_nesting(parsed.lines)
     
     # 6. Muitos parâmetros
     total_smells += _detect_many_parameters(analysis)
     
     # 7. Nomes genéricos
-    total_smells += _detect_generic_names(source_code)
+    total_smells += _detect_generic_names(parsed)
     
     return total_smells
 
@@ -46,12 +66,7 @@ def detect_smells(analysis, source_code):
 def _detect_complex_functions(analysis):
     """Detecta funções com alta complexidade ou muitas linhas."""
     smells = 0
-    thresholds = {
-        'complexity_high': 15,
-        'complexity_critical': 25,
-        'length_high': 100,
-        'length_critical': 200
-    }
+    thresholds = COMPLEXITY_THRESHOLDS
     
     for func in analysis.function_list:
         if func.cyclomatic_complexity > thresholds['complexity_critical']:
@@ -67,17 +82,15 @@ def _detect_complex_functions(analysis):
     return smells
 
 
-def _detect_code_duplication(source_code):
+def _detect_code_duplication(lines):
     """Detecta padrões de código duplicado."""
-    lines = source_code.split('\n')
-    
     # Mapeia sequências de linhas similares
     line_map = defaultdict(int)
     smells = 0
     
-    for i in range(len(lines) - 2):
+    for line in lines[:-2]:
         # Normaliza a linha (remove espaços, comentários)
-        normalized = re.sub(r'#.*$', '', lines[i]).strip()
+        normalized = line.split('#', 1)[0].strip()
         
         if normalized and len(normalized) > 20:
             line_map[normalized] += 1
@@ -90,73 +103,46 @@ def _detect_code_duplication(source_code):
     return min(smells, 5)  # Máximo 5 smells de duplicação
 
 
-def _detect_unused_variables(source_code):
+def _detect_unused_variables(parsed):
     """Detecta variáveis que são definidas mas nunca usadas."""
     smells = 0
     
-    # Padrão: variáveis atribuídas
-    assignment_pattern = r'^\s*(\w+)\s*='
-    # Padrão: variáveis usadas
-    usage_pattern = r'\b({var})\b'
-    
     assignments = defaultdict(int)
-    
-    for match in re.finditer(assignment_pattern, source_code, re.MULTILINE):
-        var_name = match.group(1)
+    for var_name in parsed.assignments:
         if not var_name.startswith('_'):  # Ignora convenção _ para unused
             assignments[var_name] += 1
     
-    # Verifica se as variáveis são usadas
-    for var_name in assignments.keys():
-        pattern = usage_pattern.format(var=re.escape(var_name))
-        uses = len(re.findall(pattern, source_code))
-        
-        # Se é atribuída mas nunca usada (ou usada só uma vez na atribuição)
-        if uses <= 1 and assignments[var_name] > 0:
+    # Verifica se as variáveis são usadas (a própria atribuição conta uma vez)
+    for var_name in assignments:
+        if parsed.identifiers[var_name] <= 1:
             smells += 1
     
     return min(smells, 5)
 
 
-def _detect_unused_imports(source_code):
+def _detect_unused_imports(parsed):
     """Detecta imports que não são utilizados."""
     smells = 0
     
-    # Extrai todos os imports
-    import_pattern = r'^(?:from\s+(\w+)\s+import|import\s+(\w+))'
-    
-    for match in re.finditer(import_pattern, source_code, re.MULTILINE):
-        module = match.group(1) or match.group(2)
-        
+    for module in parsed.imports:
         # Verifica se o módulo é usado no código
-        usage_count = len(re.findall(rf'\b{module}\b', source_code))
-        
-        if usage_count <= 1:  # Apenas a linha de import
+        if parsed.identifiers[module] <= 1:  # Apenas a linha de import
             smells += 1
     
     return min(smells, 3)
 
 
-def _detect_deep_nesting(source_code):
+def _detect_deep_nesting(lines):
     """Detecta aninhamento profundo de blocos (if, for, while, etc)."""
     smells = 0
     max_depth = 0
-    current_depth = 0
-    
-    # Caracteres que indicam abertura/fechamento de blocos
-    opening = {':', '(', '[', '{'}
-    closing = {':', ')', ']', '}'}
     
-    for line in source_code.split('\n'):
-        stripped = line.strip()
-        
-        # Conta a profundidade de indentação
-        indent_level = (len(line) - len(line.lstrip())) // 4
-        
+    for line in lines:
         # Se tem dois pontos no final, é início de bloco
-        if stripped.endswith(':'):
-            current_depth = indent_level
-            max_depth = max(max_depth, current_depth)
+        if line.strip().endswith(':'):
+            # Conta a profundidade de indentação
+            indent_level = (len(line) - len(line.lstrip())) // 4
+            max_depth = max(max_depth, indent_level)
     
     # Aninhamento profundo (5+ níveis) é um smell
     if max_depth >= 5:
@@ -170,7 +156,7 @@ def _detect_deep_nesting(source_code):
 def _detect_many_parameters(analysis):
     """Detecta funções com muitos parâmetros."""
     smells = 0
-    threshold = 5
+    threshold = PARAMETERS_THRESHOLD
     
     for func in analysis.function_list:
         # Lizard fornece informação sobre parâmetros
@@ -180,20 +166,12 @@ def _detect_many_parameters(analysis):
     return smells
 
 
-def _detect_generic_names(source_code):
+def _detect_generic_names(parsed):
     """Detecta nomes de variáveis genéricos ou muito curtos."""
     smells = 0
     
-    # Nomes muito genéricos
-    generic_names = {'a', 'b', 'c', 'x', 'y', 'z', 'i', 'j', 'k', 'tmp', 'temp', 'data', 'value', 'var'}
-    
-    # Padrão: atribuição de variável
-    pattern = r'^\s*(\w+)\s*='
-    
-    for match in re.finditer(pattern, source_code, re.MULTILINE):
-        var_name = match.group(1)
-        
-        if var_name in generic_names and len(var_name) <= 3:
+    for var_name in parsed.assignments:
+        if var_name in GENERIC_NAMES and len(var_name) <= 3:
             smells += 1
     
-    return min(smells, 3)
\ No newline at end of file
+    return min(smells, 3)
@@ -0,0 +1,301 @@
+from collections import OrderedDict
+from datetime import datetime
+
+import git
+from pydriller import Repository
+
+from analyzer.maintainability_calculator import calculate_maintainability
+from analyzer.parallel_analysis import FileAnalysisPool
+from analyzer import profiling
+from analyzer.repo_miner import analyze_files
+
+SNAPSHOT_PERIODS = ('daily', 'weekly', 'tags')
+
+# Blobs cujas métricas ficam em memória (LRU); os mais antigos voltam
+# pelo MetricsCache, se houver
+KNOWN_BLOBS = 512
+
+
+def parse_snapshot_spec(spec):
+    """
+    Interpreta o valor de --snapshot.
+
+    Aceita um número N (um snapshot a cada N commits), 'daily', 'weekly' ou
+    'tags'.
+
+    Retorna:
+        tuple: (modo, N) — N só é usado no modo 'commits'
+    """
+    spec = str(spec).strip().lower()
+    if spec in SNAPSHOT_PERIODS:
+        return spec, None
+    if spec.isdigit() and int(spec) > 0:
+        return 'commits', int(spec)
+    raise ValueError(
+        f"Snapshot inválido: {spec!r} (use um número de commits, 'daily', 'weekly' ou 'tags')"
+    )
+
+
+def iter_snapshot_metrics(url, since=None, until=None, spec="100", cache=None, jobs=1, mirrors=None,
+                          path_filter=None):
+    """
+    Gera métricas de todo o código Python do repositório em pontos
+    escolhidos do histórico (a cada N commits, diariamente, semanalmente ou
+    nas tags).
+
+    Ao contrário do modo por commit, complexidade, LOC e smells são somados
+    sobre todos os arquivos `.py` da árvore, e não só sobre os modificados.
+    Entre um snapshot e o seguinte apenas os arquivos alterados são lidos e
+    analisados: o custo é proporcional ao que mudou.
+
+    Os dicionários gerados têm as mesmas chaves do modo por commit;
+    `files_modified` passa a ser o número de arquivos Python da árvore.
+    Com `path_filter` (PathFilter), só os arquivos selecionados são somados.
+    """
+    mode, every = parse_snapshot_spec(spec)
+    if mirrors is not None:
+        url = mirrors.resolve(url)
+    since_dt = datetime.fromisoformat(since) if since else None
+    until_dt = datetime.fromisoformat(until) if until else None
+
+    pool = FileAnalysisPool(jobs) if jobs != 1 else None
+    tree = None
+
+    try:
+        commits = Repository(url, since=since_dt, to=until_dt).traverse_commits()
+        for commit in _select_snapshots(commits, mode, every):
+            if tree is None:
+                tree = SnapshotTree(commit.project_path, cache, pool, path_filter=path_filter)
+            tree.advance(commit.hash)
+            if tree.files_count:
+                yield tree.commit_metrics(commit)
+
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+def _select_snapshots(commits, mode, every=None):
+    """Escolhe, entre os commits da travessia, os pontos de snapshot."""
+    if mode == 'commits':
+        commit = None
+        for index, commit in enumerate(commits, start=1):
+            if index % every == 0:
+                yield commit
+        # Sempre inclui o estado final
+        if commit is not None and index % every != 0:
+            yield commit
+        return
+
+    if mode == 'tags':
+        tagged = None
+        for commit in commits:
+            if tagged is None:
+                repo = git.Repo(commit.project_path)
+                tagged = {tag.commit.hexsha for tag in repo.tags}
+            if commit.hash in tagged:
+                yield commit
+        return
+
+    # daily/weekly: o último commit de cada período representa o seu estado
+    pending = None
+    pending_period = None
+    for commit in commits:
+        period = _period_of(commit.committer_date, mode)
+        if pending is not None and period != pending_period:
+            yield pending
+        pending = commit
+        pending_period = period
+    if pending is not None:
+        yield pending
+
+
+def _period_of(date, mode):
+    if mode == 'daily':
+        return date.date()
+    year, week, _ = date.isocalendar()
+    return year, week
+
+
+class SnapshotTree:
+    """
+    Estado dos arquivos Python da árvore no último snapshot.
+
+    Guarda, por caminho, o blob e as suas métricas, além dos totais do
+    repositório. Avançar para outro commit aplica só a diferença entre as
+    árvores (`git diff-tree`) e atualiza os totais incrementalmente.
+
+    Com `clones` (CloneIndex), o índice de clones acompanha a árvore com as
+    mesmas diferenças; com `metrics=False` as métricas não são calculadas
+    (só o índice é mantido). Com `path_filter` (PathFilter), só os arquivos
+    selecionados fazem parte da árvore.
+    """
+
+    def __init__(self, repo_path, cache=None, pool=None, clones=None, metrics=True, path_filter=None):
+        self.repo = git.Repo(repo_path)
+        self.cache = cache
+        self.pool = pool
+        self.clones = clones
+        self.metrics = metrics
+        self.path_filter = path_filter
+        self.commit = None
+        self.files = {}
+        # Métricas dos blobs vistos por último (LRU): voltar a um commit
+        # próximo (como na amostragem adaptativa) não relê nem reanalisa
+        # arquivos, e a memória não cresce com o histórico
+        self._known = OrderedDict()
+        # Acoplamento somado em centésimos (os valores já vêm arredondados a
+        # 2 casas): somar e subtrair inteiros não acumula erro
+        self._totals = {
+            'complexity': 0,
+            'coupling_cents': 0,
+            'lines_of_code': 0,
+            'code_smells': 0,
+            'functions_count': 0
+        }
+
+    @property
+    def files_count(self):
+        return len(self.files)
+
+    def advance(self, commit_hash):
+        """Atualiza o estado para a árvore de `commit_hash`."""
+        with profiling.stage("tree_diff", commit=commit_hash[:7]):
+            if self.commit is None:
+                changes = self._list_tree(commit_hash)
+            else:
+                changes = self._diff_trees(self.commit, commit_hash)
+        self.commit = commit_hash
+
+        removed = [path for path, blob in changes if blob is None]
+        added = [(path, blob) for path, blob in changes if blob is not None]
+
+        for path in removed:
+            self._remove(path)
+
+        sources = []
+        for path, blob in added:
+            self._remove(path)
+            known = self._recall(blob) if self.metrics else None
+            needs_metrics = self.metrics and known is None
+            needs_clones = self.clones is not None and not self.clones.has_blob(blob)
+            source_code = None
+            if needs_metrics or needs_clones:
+                with profiling.stage("blob_read", commit=commit_hash[:7]):
+                    source_code = self._read_blob(blob)
+            if self.clones is not None:
+                with profiling.stage("clone_index", commit=commit_hash[:7]):
+                    self.clones.add(path, blob, source_code or "")
+            if not self.metrics:
+                self.files[path] = (blob, None)
+            elif known is not None:
+                self._add(path, blob, known)
+            elif source_code:
+                sources.append((path, blob, source_code))
+
+        with profiling.stage("file_analysis", commit=commit_hash[:7]):
+            all_metrics = analyze_files(
+                [(path.rsplit('/', 1)[-1], source_code) for path, _, source_code in sources],
+                self.cache, self.pool
+            )
+        for (path, blob, _), metrics in zip(sources, all_metrics):
+            if metrics is not None:
+                self._remember(blob, metrics)
+                self._add(path, blob, metrics)
+
+    def commit_metrics(self, commit):
+        """Monta o dicionário de métricas do snapshot (mesmas chaves do modo por commit)."""
+        totals = self._totals
+        files_count = len(self.files)
+        complexity = totals['complexity']
+        lines_of_code = totals['lines_of_code']
+        functions_count = totals['functions_count']
+
+        return {
+            "hash": commit.hash[:7],
+            "date": commit.committer_date,
+            "author": commit.author.name,
+            "complexity": complexity,
+            "coupling": totals['coupling_cents'] / 100 / files_count if files_count else 0.0,
+            "maintainability_index": calculate_maintainability(complexity, lines_of_code, lines_of_code),
+            "lines_of_code": lines_of_code,
+            "code_smells": totals['code_smells'],
+            "functions_count": functions_count,
+            "avg_function_length": lines_of_code / functions_count if functions_count else 0.0,
+            "files_modified": files_count
+        }
+
+    def _add(self, path, blob, metrics):
+        self.files[path] = (blob, metrics)
+        self._apply(metrics, 1)
+
+    def _remove(self, path):
+        entry = self.files.pop(path, None)
+        if entry is not None and entry[1] is not None:
+            self._apply(entry[1], -1)
+            self._remember(*entry)
+        if self.clones is not None:
+            self.clones.remove(path)
+
+    def _recall(self, blob):
+        metrics = self._known.get(blob)
+        if metrics is not None:
+            self._known.move_to_end(blob)
+        return metrics
+
+    def _remember(self, blob, metrics):
+        self._known[blob] = metrics
+        self._known.move_to_end(blob)
+        if len(self._known) > KNOWN_BLOBS:
+            self._known.popitem(last=False)
+
+    def _apply(self, metrics, sign):
+        totals = self._totals
+        totals['complexity'] += sign * metrics['cyclomatic_complexity']
+        totals['coupling_cents'] += sign * round(metrics['coupling'] * 100)
+        totals['lines_of_code'] += sign * metrics['lines_of_code']
+        totals['code_smells'] += sign * metrics['code_smells']
+        totals['functions_count'] += sign * metrics['functions_count']
+
+    def _list_tree(self, commit_hash):
+        """Lista (caminho, blob) de todos os arquivos .py da árvore."""
+        output = self.repo.git.ls_tree('-r', '-z', '--full-tree', commit_hash)
+        changes = []
+        for entry in output.split('\0'):
+            if not entry:
+                continue
+            meta, path = entry.split('\t', 1)
+            _, object_type, blob = meta.split()
+            if object_type == 'blob' and self._wanted(path):
+                changes.append((path, blob))
+        return changes
+
+    def _diff_trees(self, old, new):
+        """
+        Lista os arquivos .py alterados entre dois commits.
+
+        Retorna:
+            list: (caminho, novo blob) — blob None quando o arquivo foi removido
+        """
+        output = self.repo.git.diff_tree('-r', '-z', '--no-renames', old, new)
+        parts = output.split('\0')
+        changes = []
+        for meta, path in zip(parts[0::2], parts[1::2]):
+            if not self._wanted(path):
+                continue
+            _, new_mode, _, new_blob, status = meta.lstrip(':').split()
+            if status == 'D' or new_mode == '160000':
+                changes.append((path, None))
+            else:
+                changes.append((path, new_blob))
+        return changes
+
+    def _wanted(self, path):
+        if self.path_filter is not None:
+            return self.path_filter.matches(path)
+        return path.endswith('.py')
+
+    def _read_blob(self, blob):
+        content = self.repo.odb.stream(bytes.fromhex(blob)).read()
+        # Mesma decodificação usada pelo PyDriller
+        return content.decode("utf-8", "ignore")
@@ -0,0 +1,35 @@
+import re
+
+# Um token é uma sequência de caracteres de palavra (\w+) ou um único
+# caractere de pontuação. Tudo entre dois tokens é espaço em branco.
+_TOKEN_RE = re.compile(r'(\w+)|[^\w\s]')
+
+
+def tokenize(source_code):
+    """
+    Quebra o código em tokens em uma única passada.
+
+    Retorna:
+        list: tuplas (início, fim, texto, é_palavra)
+    """
+    return [
+        (m.start(), m.end(), m.group(), m.lastindex == 1)
+        for m in _TOKEN_RE.finditer(source_code)
+    ]
+
+
+def at_line_start(source_code, pos):
+    """Indica se `pos` é início de linha (equivalente a `^` com re.MULTILINE)."""
+    return pos == 0 or source_code[pos - 1] == '\n'
+
+
+def has_line_start(source_code, lo, hi):
+    """
+    Indica se existe um início de linha em [lo, hi].
+
+    Usado para emular `^\\s*`: entre `lo` e `hi` só há espaço em branco, então
+    o padrão casa se algum ponto desse intervalo for início de linha.
+    """
+    if lo > hi:
+        return False
+    return lo == 0 or source_code.find('\n', lo - 1, hi) != -1
@@ -1,6 +1,97 @@
+import os
+import time
+from datetime import datetime
+
 import click
-from analyzer.repo_miner import analyze_repository
-from visualizer.cli_view import display_timeline
+from analyzer.repo_miner import analyze_repository, iter_repository_metrics
+from analyzer.aggregation import ReportAccumulator
+from analyzer.metrics_cache import MetricsCache, DEFAULT_MAX_SIZE_MB, default_cache_dir
+from analyzer.exporters import ResultExporter, EXPORT_FORMATS, DEFAULT_ROW_GROUP_SIZE
+from analyzer.metrics_table import CommitMetricsTable
+from analyzer.mirror_cache import MirrorCache
+from analyzer.run_state import RunState, DEFAULT_CHECKPOINT_EVERY
+from analyzer.adaptive_sampling import analyze_adaptive, DEFAULT_BUDGET, DEFAULT_THRESHOLD
+from analyzer.sharding import parse_shard_spec, write_partial, merge_partials
+from analyzer.snapshot import iter_snapshot_metrics, parse_snapshot_spec
+from analyzer.clone_detector import CloneIndex, iter_snapshot_clones
+from analyzer.git_backend import BACKENDS
+from analyzer.path_filter import CONFIG_FILENAME, build_filter, find_config
+from analyzer.batch import DEFAULT_FETCH_JOBS, iter_batch, load_manifest, write_summary
+from analyzer.function_index import FunctionIndex, DEFAULT_TOP, update_function_index
+from analyzer.hotspots import iter_hotspots, SORT_KEYS, DEFAULT_TOP as DEFAULT_HOTSPOTS
+from analyzer import profiling
+from visualizer.cli_view import (display_timeline, display_profile, display_clones, display_batch,
+                                 display_function_growth, display_hotspots, DEFAULT_TABLE_LIMIT)
+from visualizer.dashboard import LiveDashboard
+
+
+def _analysis_options(command):
+    """Opções de execução compartilhadas por `analyze` e `report`."""
+    options = [
+        click.option("--cache-dir", default=None, envvar="CODETHERMOMETER_CACHE_DIR",
+                     help="Diretório do cache de métricas (padrão: ~/.cache/codethermometer)"),
+        click.option("--cache-max-mb", default=DEFAULT_MAX_SIZE_MB, show_default=True,
+                     help="Tamanho máximo do cache de métricas em MB"),
+        click.option("--no-cache", is_flag=True, help="Desativa o cache de métricas por blob"),
+        click.option("--no-mirror", is_flag=True,
+                     help="Não usa o espelho local de URLs remotas (clona em um diretório temporário)"),
+        click.option("--full-clone", is_flag=True,
+                     help="Cria o espelho com todos os blobs em vez de um clone parcial"),
+        click.option("--backend", default="pydriller", show_default=True, type=click.Choice(BACKENDS),
+                     help="Leitura do histórico: PyDriller ou git log/cat-file direto (native)"),
+        click.option("--jobs", "-j", default=1, show_default=True, type=click.IntRange(min=0),
+                     help="Processos para analisar arquivos em paralelo (0 = todos os núcleos)"),
+        click.option("--pipeline", is_flag=True,
+                     help="Lê o histórico (git) em outra thread, à frente da análise dos arquivos"),
+        click.option("--fresh", is_flag=True,
+                     help="Ignora o estado salvo e refaz a análise desde o início"),
+        click.option("--checkpoint-every", default=DEFAULT_CHECKPOINT_EVERY, show_default=True,
+                     type=click.IntRange(min=1), help="Salva o progresso a cada N commits"),
+        click.option("--profile", is_flag=True, help="Mede o tempo de cada etapa e exibe um resumo"),
+        click.option("--profile-json", default=None, type=click.Path(dir_okay=False),
+                     help="Grava o perfil (totais, percentis e itens mais lentos) em JSON"),
+        click.option("--profile-top", default=profiling.DEFAULT_TOP_N, show_default=True,
+                     type=click.IntRange(min=0), help="Quantidade de arquivos e commits mais lentos no perfil"),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def _path_filter_options(command):
+    """Opções de seleção de arquivos por caminho."""
+    options = [
+        click.option("--include", multiple=True, metavar="GLOB",
+                     help="Analisa só os arquivos .py que casam com o padrão (pode repetir)"),
+        click.option("--exclude", multiple=True, metavar="GLOB",
+                     help="Ignora os arquivos que casam com o padrão, ex.: vendor/, *_pb2.py (pode repetir)"),
+        click.option("--config", "config_path", default=None, type=click.Path(exists=True, dir_okay=False),
+                     help=f"Arquivo com padrões include/exclude (padrão: {CONFIG_FILENAME} do repositório "
+                          "local ou do diretório atual)"),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def _validate_snapshot(ctx, param, value):
+    if value is None:
+        return None
+    try:
+        parse_snapshot_spec(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    return value
+
+
+def _parse_shard(ctx, param, value):
+    if value is None:
+        return None
+    try:
+        return parse_shard_spec(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
 
 @click.group()
 def cli():
@@ -11,20 +102,110 @@ def cli():
 @click.option("--since", default=None, help="Data inicial no formato YYYY-MM-DD")
 @click.option("--until", default=None, help="Data final no formato YYYY-MM-DD")
 @click.option("--verbose", "-v", is_flag=True, help="Modo verbose com mais detalhes")
-def analyze(repo_url, since, until, verbose):
+@click.option("--snapshot", default=None, metavar="N|daily|weekly|tags", callback=_validate_snapshot,
+              help="Métricas de toda a árvore .py a cada N commits, por dia, por semana ou nas tags")
+@click.option("--adaptive", is_flag=True,
+              help="Amostra commits esparsos e refina só onde as métricas da árvore saltam")
+@click.option("--budget", default=DEFAULT_BUDGET, show_default=True, type=click.IntRange(min=2),
+              help="Máximo de commits analisados no modo --adaptive")
+@click.option("--threshold", default=DEFAULT_THRESHOLD, show_default=True, type=click.FloatRange(min=0),
+              help="Variação relativa que faz o modo --adaptive refinar um intervalo")
+@click.option("--shard", default=None, metavar="i/N", callback=_parse_shard,
+              help="Analisa só a i-ésima de N faixas contíguas de commits e grava um arquivo parcial")
+@click.option("--partial-file", default=None, type=click.Path(dir_okay=False),
+              help="Arquivo parcial do --shard (padrão: codethermometer-shard-i-of-N.json)")
+@click.option("--output", "-o", default=None, type=click.Path(dir_okay=False),
+              help="Grava os resultados por commit à medida que são calculados (.jsonl, .csv ou .parquet)")
+@click.option("--files-output", default=None, type=click.Path(dir_okay=False),
+              help="Grava também as métricas de cada arquivo (mesmo formato de --output)")
+@click.option("--page", default=None, type=click.IntRange(min=1),
+              help="Exibe a página N da tabela (padrão: primeiros e últimos commits)")
+@click.option("--limit", default=DEFAULT_TABLE_LIMIT, show_default=True, type=click.IntRange(min=1),
+              help="Linhas da tabela de métricas (tamanho da página)")
+@click.option("--live/--no-live", default=True,
+              help="Painel de progresso durante a análise (fora de um terminal, linhas de log)")
+@_analysis_options
+@_path_filter_options
+def analyze(repo_url, since, until, verbose, snapshot, adaptive, budget, threshold, shard, partial_file,
+            output, files_output, page, limit, live, cache_dir, cache_max_mb, no_cache, no_mirror,
+            full_clone, backend, jobs, pipeline, fresh, checkpoint_every, profile, profile_json, profile_top,
+            include, exclude, config_path):
     """
     Analisa a evolução de métricas de um repositório Git.
     
     Exemplo:
         python src/main.py analyze https://github.com/user/repo
         python src/main.py analyze https://github.com/user/repo --since 2025-01-01 --until 2025-12-31
+        python src/main.py analyze https://github.com/user/repo --jobs 8
+        python src/main.py analyze https://github.com/user/repo --snapshot weekly
+        python src/main.py analyze https://github.com/user/repo --adaptive --budget 300
+        python src/main.py analyze https://github.com/user/repo --shard 2/4
+        python src/main.py analyze https://github.com/user/repo --output commits.jsonl
+        python src/main.py analyze https://github.com/user/repo --page 3 --limit 50
+        python src/main.py analyze https://github.com/user/repo --backend native
+        python src/main.py analyze https://github.com/user/repo --exclude vendor/ --exclude '*_pb2.py'
     """
+    if snapshot and adaptive:
+        raise click.UsageError("--snapshot e --adaptive não podem ser usados juntos")
+    if shard and (snapshot or adaptive):
+        raise click.UsageError("--shard não pode ser usado com --snapshot ou --adaptive")
+    if shard and output:
+        raise click.UsageError("--shard grava um arquivo parcial; use --partial-file em vez de --output")
+    if files_output and not output:
+        raise click.UsageError("--files-output requer --output")
+    path_filter = _open_path_filter(repo_url, include, exclude, config_path)
+
     click.echo(click.style("CodeThermometer - Iniciando análise...", fg="cyan", bold=True))
+    _start_profile(profile, profile_json, profile_top)
     
     try:
         # Analisa repositório
         click.echo(f"Analisando repositório: {repo_url}")
-        results = analyze_repository(repo_url, since, until)
+        cache = _open_cache(cache_dir, cache_max_mb, no_cache)
+        mirrors = _open_mirrors(cache_dir, no_mirror, full_clone)
+        exporter = _open_exporter(output, None, files_output)
+        on_commit = exporter.write if exporter is not None else None
+        try:
+            if shard:
+                _run_shard(repo_url, since, until, shard, partial_file, cache, jobs, mirrors, backend,
+                           path_filter, pipeline)
+                return
+            if adaptive:
+                results = analyze_adaptive(
+                    repo_url, since, until, budget=budget, threshold=threshold,
+                    cache=cache, jobs=jobs, mirrors=mirrors, path_filter=path_filter
+                )
+                for result in results if on_commit is not None else ():
+                    on_commit(result)
+            elif snapshot:
+                results = CommitMetricsTable()
+                for result in iter_snapshot_metrics(
+                    repo_url, since, until, snapshot, cache=cache, jobs=jobs, mirrors=mirrors,
+                    path_filter=path_filter
+                ):
+                    if on_commit is not None:
+                        on_commit(result)
+                    results.append(result)
+            else:
+                # As métricas por arquivo não ficam no estado salvo: com
+                # --files-output o histórico é percorrido de novo, sem usar
+                # nem descartar o estado (o cache de métricas evita recalcular)
+                state = None if files_output else _open_state(
+                    repo_url, since, until, cache_dir, fresh, checkpoint_every, path_filter
+                )
+                progress = LiveDashboard(cache) if live else None
+                try:
+                    results = analyze_repository(
+                        repo_url, since, until, cache=cache, jobs=jobs, state=state, mirrors=mirrors,
+                        on_commit=on_commit, progress=progress, backend=backend, path_filter=path_filter,
+                        pipeline=pipeline
+                    )
+                finally:
+                    if progress is not None:
+                        progress.close()
+        finally:
+            _close_cache(cache)
+            _close_exporter(exporter)
         
         if not results:
             click.echo(click.style("Nenhum resultado encontrado!", fg="red", bold=True))
@@ -33,7 +214,8 @@ def analyze(repo_url, since, until, verbose):
         click.echo(click.style(f"Análise concluída: {len(results)} commits processados", fg="green"))
         
         # Exibe timeline
-        display_timeline(results)
+        with profiling.stage("display_timeline"):
+            display_timeline(results, page=page, limit=limit)
         
         # Modo verbose: exibe mais detalhes
         if verbose:
@@ -45,27 +227,303 @@ def analyze(repo_url, since, until, verbose):
             import traceback
             traceback.print_exc()
         raise click.Exit(1)
+    finally:
+        _finish_profile(profile_json)
 
 
 @cli.command()
 @click.argument("repo_url", required=True)
 @click.option("--since", default=None, help="Data inicial no formato YYYY-MM-DD")
 @click.option("--until", default=None, help="Data final no formato YYYY-MM-DD")
-def report(repo_url, since, until):
+@_analysis_options
+@_path_filter_options
+def report(repo_url, since, until, cache_dir, cache_max_mb, no_cache, no_mirror, full_clone, backend,
+           jobs, pipeline, fresh, checkpoint_every, profile, profile_json, profile_top, include, exclude, config_path):
     """
     Gera um relatório detalhado de análise evolutiva.
     """
+    path_filter = _open_path_filter(repo_url, include, exclude, config_path)
     click.echo(click.style("Gerando relatório...", fg="cyan", bold=True))
+    _start_profile(profile, profile_json, profile_top)
     
-    results = analyze_repository(repo_url, since, until)
-    
+    try:
+        cache = _open_cache(cache_dir, cache_max_mb, no_cache)
+        mirrors = _open_mirrors(cache_dir, no_mirror, full_clone)
+        state = _open_state(repo_url, since, until, cache_dir, fresh, checkpoint_every, path_filter)
+        # Os agregados são calculados enquanto os commits passam, sem
+        # guardar a lista de resultados
+        accumulator = ReportAccumulator()
+        try:
+            for result in iter_repository_metrics(
+                repo_url, since, until, cache=cache, jobs=jobs, state=state, mirrors=mirrors,
+                backend=backend, path_filter=path_filter, pipeline=pipeline
+            ):
+                accumulator.add(result)
+        except Exception as e:
+            click.echo(f"Erro ao acessar repositório: {e}")
+            accumulator = ReportAccumulator()
+        finally:
+            _close_cache(cache)
+        
+        if not accumulator.count:
+            click.echo(click.style("Nenhum resultado encontrado!", fg="red"))
+            return
+        
+        with profiling.stage("report"):
+            _print_report(repo_url, accumulator.stats())
+    finally:
+        _finish_profile(profile_json)
+
+
+@cli.command()
+@click.argument("repo_url", required=True)
+@click.option("--output", "-o", required=True, type=click.Path(dir_okay=False),
+              help="Arquivo de saída com uma linha por commit")
+@click.option("--format", "fmt", default=None, type=click.Choice(EXPORT_FORMATS),
+              help="Formato de saída (padrão: deduzido da extensão de --output)")
+@click.option("--files-output", default=None, type=click.Path(dir_okay=False),
+              help="Arquivo de saída com uma linha por arquivo Python de cada commit")
+@click.option("--row-group-size", default=DEFAULT_ROW_GROUP_SIZE, show_default=True,
+              type=click.IntRange(min=1), help="Linhas por row group no formato Parquet")
+@click.option("--since", default=None, help="Data inicial no formato YYYY-MM-DD")
+@click.option("--until", default=None, help="Data final no formato YYYY-MM-DD")
+@_analysis_options
+@_path_filter_options
+def export(repo_url, output, fmt, files_output, row_group_size, since, until, cache_dir, cache_max_mb,
+           no_cache, no_mirror, full_clone, backend, jobs, pipeline, fresh, checkpoint_every, profile,
+           profile_json, profile_top, include, exclude, config_path):
+    """
+    Exporta as métricas por commit (e opcionalmente por arquivo) em JSONL, CSV ou Parquet.
+
+    As linhas são gravadas à medida que os commits são processados, na
+    ordem da travessia, sem manter o histórico em memória.
+
+    Exemplo:
+        python src/main.py export https://github.com/user/repo -o commits.parquet
+        python src/main.py export https://github.com/user/repo -o commits.csv --files-output files.csv
+    """
+    path_filter = _open_path_filter(repo_url, include, exclude, config_path)
+    _start_profile(profile, profile_json, profile_top)
+    try:
+        cache = _open_cache(cache_dir, cache_max_mb, no_cache)
+        mirrors = _open_mirrors(cache_dir, no_mirror, full_clone)
+        exporter = _open_exporter(output, fmt, files_output, row_group_size)
+        # As métricas por arquivo não ficam no estado salvo: com --files-output
+        # o histórico é percorrido de novo, sem usar nem descartar o estado
+        # (o cache de métricas evita recalcular)
+        state = None if files_output else _open_state(
+            repo_url, since, until, cache_dir, fresh, checkpoint_every, path_filter
+        )
+        try:
+            for _ in iter_repository_metrics(
+                repo_url, since, until, cache=cache, jobs=jobs, state=state, mirrors=mirrors,
+                on_commit=exporter.write, backend=backend, path_filter=path_filter, pipeline=pipeline
+            ):
+                pass
+        finally:
+            _close_cache(cache)
+            _close_exporter(exporter)
+    finally:
+        _finish_profile(profile_json)
+
+
+@cli.command()
+@click.argument("repo_url", required=True)
+@click.option("--since", default=None, help="Data inicial no formato YYYY-MM-DD")
+@click.option("--until", default=None, help="Data final no formato YYYY-MM-DD")
+@click.option("--snapshot", default="1", show_default=True, metavar="N|daily|weekly|tags",
+              callback=_validate_snapshot, help="Commits analisados (a cada N commits ou por período)")
+@click.option("--top", default=10, show_default=True, type=click.IntRange(min=0),
+              help="Pares de clones exibidos para o último commit")
+@click.option("--limit", default=DEFAULT_TABLE_LIMIT, show_default=True, type=click.IntRange(min=1),
+              help="Linhas da tabela de duplicação")
+@click.option("--cache-dir", default=None, envvar="CODETHERMOMETER_CACHE_DIR",
+              help="Diretório do cache (padrão: ~/.cache/codethermometer)")
+@click.option("--no-mirror", is_flag=True,
+              help="Não usa o espelho local de URLs remotas (clona em um diretório temporário)")
+@click.option("--full-clone", is_flag=True,
+              help="Cria o espelho com todos os blobs em vez de um clone parcial")
+@_path_filter_options
+def clones(repo_url, since, until, snapshot, top, limit, cache_dir, no_mirror, full_clone, include, exclude,
+           config_path):
+    """
+    Detecta código duplicado entre arquivos ao longo do histórico.
+
+    Para cada commit, exibe a fração dos fingerprints (trechos de tokens
+    normalizados) que se repetem na árvore e o número de pares de arquivos
+    com trechos em comum; ao final, os maiores pares de clones.
+
+    Exemplo:
+        python src/main.py clones https://github.com/user/repo --snapshot weekly --top 20
+    """
+    path_filter = _open_path_filter(repo_url, include, exclude, config_path)
+    mirrors = _open_mirrors(cache_dir, no_mirror, full_clone)
+    index = CloneIndex()
+    try:
+        rows = list(iter_snapshot_clones(repo_url, since, until, snapshot, mirrors=mirrors, index=index,
+                                         path_filter=path_filter))
+    except Exception as e:
+        raise click.ClickException(f"Erro ao acessar repositório: {e}")
+    display_clones(rows, index.clone_pairs(top) if top else [], limit=limit)
+
+
+@cli.command()
+@click.argument("repo_url", required=True)
+@click.option("--since", default=None, help="Data inicial no formato YYYY-MM-DD")
+@click.option("--until", default=None, help="Data final no formato YYYY-MM-DD")
+@click.option("--at", "at", multiple=True, metavar="YYYY-MM-DD",
+              help="Exibe também o ranking nesta data, na mesma travessia (pode repetir)")
+@click.option("--top", default=DEFAULT_HOTSPOTS, show_default=True, type=click.IntRange(min=1),
+              help="Arquivos exibidos em cada ranking")
+@click.option("--sort", default="score", show_default=True, type=click.Choice(SORT_KEYS),
+              help="Critério: score (commits × complexidade), churn, commits ou complexity")
+@click.option("--cache-dir", default=None, envvar="CODETHERMOMETER_CACHE_DIR",
+              help="Diretório do cache de métricas (padrão: ~/.cache/codethermometer)")
+@click.option("--cache-max-mb", default=DEFAULT_MAX_SIZE_MB, show_default=True,
+              help="Tamanho máximo do cache de métricas em MB")
+@click.option("--no-cache", is_flag=True, help="Desativa o cache de métricas por blob")
+@click.option("--no-mirror", is_flag=True,
+              help="Não usa o espelho local de URLs remotas (clona em um diretório temporário)")
+@click.option("--full-clone", is_flag=True,
+              help="Cria o espelho com todos os blobs em vez de um clone parcial")
+@click.option("--backend", default="pydriller", show_default=True, type=click.Choice(BACKENDS),
+              help="Leitura do histórico: PyDriller ou git log/cat-file direto (native)")
+@click.option("--jobs", "-j", default=1, show_default=True, type=click.IntRange(min=0),
+              help="Processos para analisar arquivos em paralelo (0 = todos os núcleos)")
+@click.option("--pipeline", is_flag=True,
+              help="Lê o histórico (git) em outra thread, à frente da análise dos arquivos")
+@_path_filter_options
+def hotspots(repo_url, since, until, at, top, sort, cache_dir, cache_max_mb, no_cache, no_mirror, full_clone,
+             backend, jobs, pipeline, include, exclude, config_path):
+    """
+    Arquivos onde o risco se concentra: alterados com frequência e complexos.
+
+    O churn (commits, linhas adicionadas e removidas) de cada arquivo e as
+    métricas da sua última versão são mantidos enquanto o histórico é
+    percorrido, atualizando só os arquivos de cada commit; o ranking em
+    cada data de --at sai da mesma travessia.
+
+    Exemplo:
+        python src/main.py hotspots https://github.com/user/repo --since 2024-01-01 --top 30
+        python src/main.py hotspots . --at 2024-06-30 --at 2024-12-31 --sort churn
+    """
+    for point in at:
+        try:
+            datetime.fromisoformat(point)
+        except ValueError:
+            raise click.BadParameter(f"data inválida: {point}", param_hint="--at")
+    path_filter = _open_path_filter(repo_url, include, exclude, config_path)
+    click.echo(click.style("CodeThermometer - Calculando hotspots...", fg="cyan", bold=True))
+
+    cache = _open_cache(cache_dir, cache_max_mb, no_cache)
+    mirrors = _open_mirrors(cache_dir, no_mirror, full_clone)
+    try:
+        for point, last_commit, ranking in iter_hotspots(
+            repo_url, since, until, at=at, top=top, sort=sort, cache=cache, jobs=jobs, mirrors=mirrors,
+            backend=backend, path_filter=path_filter, pipeline=pipeline
+        ):
+            label = f"em {point:%Y-%m-%d}" if point is not None else "ao final do período"
+            commit = f", commit {last_commit[:7]}" if last_commit else ""
+            display_hotspots(ranking, f"Hotspots {label}{commit}")
+    except Exception as e:
+        raise click.ClickException(f"Erro ao acessar repositório: {e}")
+    finally:
+        _close_cache(cache)
+
+
+@cli.command()
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option("--fetch-jobs", default=DEFAULT_FETCH_JOBS, show_default=True, type=click.IntRange(min=1),
+              help="Clones/fetches simultâneos, independentes dos processos de --jobs")
+@click.option("--output-dir", default=None, type=click.Path(file_okay=False),
+              help="Grava os resultados por commit de cada repositório (<nome>.<formato>) e summary.json")
+@click.option("--format", "fmt", default="jsonl", show_default=True, type=click.Choice(EXPORT_FORMATS),
+              help="Formato dos arquivos de --output-dir")
+@_analysis_options
+@_path_filter_options
+def batch(manifest, fetch_jobs, output_dir, fmt, cache_dir, cache_max_mb, no_cache, no_mirror, full_clone,
+          backend, jobs, pipeline, fresh, checkpoint_every, profile, profile_json, profile_top, include, exclude,
+          config_path):
+    """
+    Analisa vários repositórios listados em um manifesto TOML.
+
+    Todos compartilham o mesmo pool de processos e o mesmo cache de
+    métricas, então arquivos idênticos em repositórios diferentes são
+    analisados uma só vez. Os espelhos são buscados em paralelo (até
+    --fetch-jobs de cada vez) enquanto os repositórios anteriores são
+    analisados.
+
+    Exemplo:
+        python src/main.py batch repos.toml --jobs 8 --fetch-jobs 4
+        python src/main.py batch repos.toml --output-dir resultados --format parquet
+    """
+    try:
+        entries = load_manifest(manifest)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    path_filter = _open_path_filter(".", include, exclude, config_path)
+
+    click.echo(click.style(f"CodeThermometer - Analisando {len(entries)} repositórios...", fg="cyan", bold=True))
+    _start_profile(profile, profile_json, profile_top)
+    try:
+        cache = _open_cache(cache_dir, cache_max_mb, no_cache)
+        mirrors = _open_mirrors(cache_dir, no_mirror, full_clone)
+        combined = ReportAccumulator()
+        results = []
+        try:
+            for result in iter_batch(
+                entries, cache=cache, jobs=jobs, mirrors=mirrors, fetch_jobs=fetch_jobs, backend=backend,
+                path_filter=path_filter, state_dir=os.path.join(cache_dir or default_cache_dir(), "runs"),
+                fresh=fresh, checkpoint_every=checkpoint_every, output_dir=output_dir, fmt=fmt,
+                combined=combined, pipeline=pipeline
+            ):
+                results.append(result)
+                position = f"[{len(results)}/{len(entries)}] {result.entry.name}"
+                if result.ok:
+                    click.echo(f"{position}: {result.accumulator.count} commits em {result.seconds:.1f}s")
+                else:
+                    click.echo(click.style(f"{position}: erro: {result.error}", fg="red"))
+        finally:
+            _close_cache(cache)
+
+        stats = combined.stats() if combined.count else None
+        display_batch(results, stats)
+        failed = sum(1 for result in results if not result.ok)
+        if failed:
+            click.echo(click.style(f"{failed} de {len(results)} repositórios falharam", fg="red", bold=True))
+        if output_dir is not None:
+            summary_path = os.path.join(output_dir, "summary.json")
+            write_summary(summary_path, results, stats)
+            click.echo(f"Resumo gravado em {summary_path}")
+        if failed:
+            raise click.Exit(1)
+    finally:
+        _finish_profile(profile_json)
+
+
+@cli.command()
+@click.argument("partials", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+def merge(partials):
+    """
+    Combina os arquivos parciais gerados por `analyze --shard` e exibe o relatório.
+
+    Exemplo:
+        python src/main.py merge codethermometer-shard-*-of-4.json
+    """
+    try:
+        header, results = merge_partials(partials)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f"{len(partials)} shards combinados: {len(results)} commits com resultados")
     if not results:
         click.echo(click.style("Nenhum resultado encontrado!", fg="red"))
         return
-    
-    # Calcula estatísticas agregadas
-    stats = _calculate_aggregated_stats(results)
-    
+    _print_report(header['url'], _calculate_aggregated_stats(results))
+
+
+def _print_report(repo_url, stats):
+    """Exibe o relatório de evolução a partir das estatísticas agregadas."""
     # Exibe relatório
     click.echo("\n" + "="*80)
     click.echo(click.style("RELATÓRIO DE EVOLUÇÃO DE CÓDIGO", fg="cyan", bold=True).center(80))
@@ -105,73 +563,303 @@ def report(repo_url, since, until):
     click.echo("\n" + "="*80)
 
 
+def _run_shard(repo_url, since, until, shard, partial_file, cache, jobs, mirrors, backend="pydriller",
+               path_filter=None, pipeline=False):
+    """Analisa a faixa de commits do shard e grava o arquivo parcial."""
+    results = list(iter_repository_metrics(
+        repo_url, since, until, cache=cache, jobs=jobs, mirrors=mirrors, shard=shard, backend=backend,
+        path_filter=path_filter, pipeline=pipeline
+    ))
+    path = partial_file or shard.default_filename()
+    write_partial(path, shard, repo_url, since, until, results)
+    click.echo(click.style(
+        f"Shard {shard.index}/{shard.count}: commits {shard.start + 1}-{shard.end} de "
+        f"{shard.total_commits} ({len(results)} com resultados) gravados em {path}",
+        fg="green"
+    ))
+
+
+@cli.group(name="cache")
+def cache_group():
+    """
+    Gerencia os espelhos locais dos repositórios remotos.
+    """
+
+
+@cache_group.command(name="list")
+@click.option("--cache-dir", default=None, envvar="CODETHERMOMETER_CACHE_DIR",
+              help="Diretório do cache (padrão: ~/.cache/codethermometer)")
+def cache_list(cache_dir):
+    """
+    Lista os espelhos, com tamanho e data da última atualização.
+    """
+    mirrors = MirrorCache(cache_dir).list()
+    if not mirrors:
+        click.echo("Nenhum espelho no cache.")
+        return
+
+    total = 0
+    for mirror in mirrors:
+        total += mirror["size_bytes"]
+        fetched = time.strftime("%Y-%m-%d %H:%M", time.localtime(mirror["last_fetch"]))
+        click.echo(f"{mirror['size_bytes'] / 1024 / 1024:9.1f} MB  {fetched}  {mirror['url']}")
+    click.echo(f"{len(mirrors)} espelhos, {total / 1024 / 1024:.1f} MB")
+
+
+@cache_group.command(name="prune")
+@click.argument("urls", nargs=-1)
+@click.option("--older-than", default=None, type=click.IntRange(min=0), metavar="DIAS",
+              help="Remove só os espelhos não atualizados há mais de DIAS dias")
+@click.option("--all", "prune_all", is_flag=True, help="Remove todos os espelhos")
+@click.option("--cache-dir", default=None, envvar="CODETHERMOMETER_CACHE_DIR",
+              help="Diretório do cache (padrão: ~/.cache/codethermometer)")
+def cache_prune(urls, older_than, prune_all, cache_dir):
+    """
+    Remove espelhos do cache.
+
+    Exemplo:
+        python src/main.py cache prune https://github.com/user/repo
+        python src/main.py cache prune --older-than 30
+        python src/main.py cache prune --all
+    """
+    if not urls and older_than is None and not prune_all:
+        raise click.UsageError("Informe as URLs, --older-than ou --all")
+
+    removed = MirrorCache(cache_dir).prune(urls=list(urls) or None, older_than_days=older_than)
+    for mirror in removed:
+        click.echo(f"Removido: {mirror['url']}")
+    freed = sum(mirror["size_bytes"] for mirror in removed)
+    click.echo(f"{len(removed)} espelhos removidos ({freed / 1024 / 1024:.1f} MB liberados)")
+
+
+@cli.group(name="functions")
+def functions_group():
+    """
+    Índice de métricas por função ao longo do histórico.
+    """
+
+
+@functions_group.command(name="index")
+@click.argument("repo_url", required=True)
+@_analysis_options
+@_path_filter_options
+def functions_index(repo_url, cache_dir, cache_max_mb, no_cache, no_mirror, full_clone, backend, jobs, pipeline, fresh,
+                    checkpoint_every, profile, profile_json, profile_top, include, exclude, config_path):
+    """
+    Indexa as métricas de cada função em todos os commits do repositório.
+
+    Só os commits ainda não indexados são percorridos, e os arquivos já
+    analisados vêm do cache de métricas.
+
+    Exemplo:
+        python src/main.py functions index https://github.com/user/repo --backend native -j 0
+    """
+    path_filter = _open_path_filter(repo_url, include, exclude, config_path)
+    _start_profile(profile, profile_json, profile_top)
+    started = time.perf_counter()
+    try:
+        cache = _open_cache(cache_dir, cache_max_mb, no_cache)
+        mirrors = _open_mirrors(cache_dir, no_mirror, full_clone)
+        try:
+            with FunctionIndex(cache_dir) as index:
+                commits = update_function_index(
+                    repo_url, index, cache=cache, jobs=jobs, mirrors=mirrors, backend=backend,
+                    path_filter=path_filter, checkpoint_every=checkpoint_every, fresh=fresh,
+                    pipeline=pipeline
+                )
+        except Exception as e:
+            raise click.ClickException(f"Erro ao acessar repositório: {e}")
+        finally:
+            _close_cache(cache)
+        click.echo(click.style(
+            f"{commits} commits indexados em {time.perf_counter() - started:.1f}s", fg="green"
+        ))
+    finally:
+        _finish_profile(profile_json)
+
+
+@functions_group.command(name="top")
+@click.argument("repo_url", required=True)
+@click.option("--since", default=None, help="Data inicial no formato YYYY-MM-DD")
+@click.option("--until", default=None, help="Data final no formato YYYY-MM-DD")
+@click.option("--top", "-k", "top", default=DEFAULT_TOP, show_default=True, type=click.IntRange(min=1),
+              help="Quantidade de funções exibidas")
+@click.option("--cache-dir", default=None, envvar="CODETHERMOMETER_CACHE_DIR",
+              help="Diretório do cache (padrão: ~/.cache/codethermometer)")
+@_path_filter_options
+def functions_top(repo_url, since, until, top, cache_dir, include, exclude, config_path):
+    """
+    Funções cuja complexidade ciclomática mais cresceu no período.
+
+    Consulta só o índice gerado por `functions index`, sem percorrer o
+    histórico. Funções movidas ou renomeadas são acompanhadas pela
+    impressão digital do corpo.
+
+    Exemplo:
+        python src/main.py functions top https://github.com/user/repo --since 2025-01-01 -k 20
+    """
+    path_filter = _open_path_filter(repo_url, include, exclude, config_path)
+    with FunctionIndex(cache_dir) as index:
+        try:
+            rows = index.top_growth(repo_url, since, until, limit=top, paths=path_filter.key())
+        except ValueError as e:
+            raise click.UsageError(str(e))
+    if rows is None:
+        raise click.ClickException(
+            f"Repositório não indexado; execute antes: functions index {repo_url}"
+        )
+    display_function_growth(rows, since, until)
+
+
+@functions_group.command(name="history")
+@click.argument("repo_url", required=True)
+@click.argument("path", required=True)
+@click.argument("function", required=True)
+@click.option("--cache-dir", default=None, envvar="CODETHERMOMETER_CACHE_DIR",
+              help="Diretório do cache (padrão: ~/.cache/codethermometer)")
+@_path_filter_options
+def functions_history(repo_url, path, function, cache_dir, include, exclude, config_path):
+    """
+    Versões indexadas de uma função (caminho e nome no repositório).
+
+    Exemplo:
+        python src/main.py functions history . src/main.py analyze
+    """
+    path_filter = _open_path_filter(repo_url, include, exclude, config_path)
+    with FunctionIndex(cache_dir) as index:
+        versions = index.history(repo_url, path, function, paths=path_filter.key())
+    if not versions:
+        click.echo(click.style("Nenhuma versão encontrada!", fg="red"))
+        return
+    for version in versions:
+        click.echo(
+            f"{version['date']:%Y-%m-%d}  {version['hash']}  linha {version['start_line']:>5}  "
+            f"CC {version['complexity']:>3}  NLOC {version['nloc']:>4}  parâmetros {version['parameters']}"
+        )
+
+
+def _start_profile(profile, profile_json, profile_top):
+    """Ativa a medição por etapa quando --profile ou --profile-json forem usados."""
+    if profile or profile_json:
+        profiling.enable(profile_top)
+
+
+def _finish_profile(profile_json):
+    """Desativa a medição, exibe o resumo e, se pedido, grava o JSON."""
+    profiler = profiling.disable()
+    if profiler is None:
+        return
+    profiler.stop()
+    display_profile(profiler.summary())
+    if profile_json:
+        profiler.dump_json(profile_json)
+        click.echo(f"Perfil gravado em {profile_json}")
+
+
+def _open_exporter(output, fmt, files_output, row_group_size=DEFAULT_ROW_GROUP_SIZE):
+    """Abre o exportador de resultados, se --output foi informado."""
+    if not output:
+        return None
+    try:
+        return ResultExporter(output, fmt, files_output, row_group_size)
+    except (ValueError, RuntimeError) as e:
+        raise click.UsageError(str(e))
+
+
+def _close_exporter(exporter):
+    """Fecha o exportador e informa o que foi gravado."""
+    if exporter is None:
+        return
+    exporter.close()
+    click.echo(f"{exporter.commits_written} commits gravados em {exporter.path}")
+    if exporter.files_path:
+        click.echo(f"{exporter.files_written} arquivos gravados em {exporter.files_path}")
+
+
+def _open_cache(cache_dir, cache_max_mb, no_cache):
+    """Abre o cache de métricas por blob, a menos que tenha sido desativado."""
+    if no_cache:
+        return None
+    return MetricsCache(cache_dir, max_size_mb=cache_max_mb)
+
+
+def _open_mirrors(cache_dir, no_mirror, full_clone):
+    """Abre o cache de espelhos de repositórios remotos, a menos que tenha sido desativado."""
+    if no_mirror:
+        return None
+    return MirrorCache(cache_dir, partial=not full_clone)
+
+
+def _open_state(repo_url, since, until, cache_dir, fresh, checkpoint_every, path_filter=None):
+    """Abre o estado incremental da análise (commits já processados)."""
+    state_dir = os.path.join(cache_dir or default_cache_dir(), "runs")
+    paths = path_filter.key() if path_filter is not None else None
+    state = RunState(state_dir, repo_url, since, until, checkpoint_every=checkpoint_every, paths=paths)
+    if fresh:
+        state.reset()
+    elif state.resumed:
+        click.echo(
+            f"Retomando análise a partir de {state.last_commit[:7]} "
+            f"({state.commits_seen} commits já processados)"
+        )
+    return state
+
+
+def _open_path_filter(repo_url, include, exclude, config_path):
+    """Monta o filtro de caminhos com o arquivo de configuração e as opções."""
+    config_path = config_path or find_config(repo_url)
+    try:
+        path_filter = build_filter(include, exclude, config_path)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    if path_filter:
+        source = f" ({config_path})" if config_path else ""
+        click.echo(
+            f"Filtro de caminhos{source}: incluir {', '.join(path_filter.include) or 'todos'}; "
+            f"excluir {', '.join(path_filter.exclude) or 'nenhum'}"
+        )
+    return path_filter
+
+
+def _close_cache(cache):
+    """Fecha o cache e informa acertos/falhas da execução."""
+    if cache is None:
+        return
+    cache.close()
+    lookups = cache.hits + cache.misses
+    if lookups:
+        click.echo(
+            f"Cache de métricas: {cache.hits} acertos, {cache.misses} falhas "
+            f"({cache.hits / lookups:.0%} de acerto)"
+        )
+
+
 def _print_verbose_stats(results):
-    """Exibe estatísticas detalhadas em modo verbose."""
+    """
+    Exibe estatísticas detalhadas em modo verbose.
+    
+    Percorre os resultados uma única vez, então aceita também um gerador.
+    """
     click.echo("\n" + click.style("ESTATÍSTICAS DETALHADAS", fg="cyan", bold=True))
     
-    # Agrupa por autor
-    by_author = {}
-    for r in results:
-        author = r['author']
-        if author not in by_author:
-            by_author[author] = []
-        by_author[author].append(r)
+    by_author = _accumulate(results).authors
     
     click.echo("\nCommits por autor:")
-    for author, commits in sorted(by_author.items(), key=lambda x: len(x[1]), reverse=True):
-        avg_cc = sum(c.get('complexity', 0) for c in commits) / len(commits)
-        # CORREÇÃO: usar "code_smells" em vez de "smells"
-        total_smells = sum(c.get('code_smells', 0) for c in commits)
-        click.echo(f"  {author:20} - {len(commits):3} commits (CC avg: {avg_cc:.1f}, smells: {total_smells})")
+    for author, (commits, total_cc, total_smells) in sorted(by_author.items(), key=lambda x: x[1][0], reverse=True):
+        avg_cc = total_cc / commits
+        click.echo(f"  {author:20} - {commits:3} commits (CC avg: {avg_cc:.1f}, smells: {total_smells})")
 
 
 def _calculate_aggregated_stats(results):
-    """Calcula estatísticas agregadas dos resultados."""
-    import statistics
-    from datetime import datetime
-    
-    complexities = [r.get('complexity', 0) for r in results]
-    # CORREÇÃO: usar "code_smells" em vez de "smells"
-    smells = [r.get('code_smells', 0) for r in results]
-    couplings = [r.get('coupling', 0) for r in results]
-    maintainabilities = [r.get('maintainability_index', 50) for r in results]
-    
-    # Tendência de complexidade
-    if len(complexities) > 1:
-        trend = "↑ Piorando" if complexities[-1] > complexities[0] else "↓ Melhorando" if complexities[-1] < complexities[0] else "→ Estável"
-    else:
-        trend = "→ Indeterminado"
-    
-    # Nível de saúde
-    avg_mi = statistics.mean(maintainabilities)
-    if avg_mi >= 85:
-        health = "Excelente"
-    elif avg_mi >= 70:
-        health = "Bom"
-    elif avg_mi >= 50:
-        health = "Aceitável"
-    else:
-        health = "Crítico"
-    
-    # Autores
-    unique_authors = len(set(r['author'] for r in results))
-    
-    return {
-        'total_commits': len(results),
-        'total_authors': unique_authors,
-        'first_date': results[0]['date'].strftime("%Y-%m-%d") if results else "N/A",
-        'last_date': results[-1]['date'].strftime("%Y-%m-%d") if results else "N/A",
-        'avg_complexity': statistics.mean(complexities) if complexities else 0,
-        'max_complexity': max(complexities) if complexities else 0,
-        'min_complexity': min(complexities) if complexities else 0,
-        'complexity_trend': trend,
-        'total_smells': sum(smells),
-        'avg_smells': statistics.mean(smells) if smells else 0,
-        'worst_commit_smells': max(smells) if smells else 0,
-        'avg_maintainability': statistics.mean(maintainabilities) if maintainabilities else 50,
-        'health_level': health,
-        'avg_coupling': statistics.mean(couplings) if couplings else 0
-    }
+    """Calcula estatísticas agregadas dos resultados (lista, tabela ou gerador) em uma passada."""
+    return _accumulate(results).stats()
+
+
+def _accumulate(results):
+    """Agrega pelas colunas quando há tabela; linha a linha para JSONL ou geradores."""
+    if isinstance(results, CommitMetricsTable):
+        return ReportAccumulator.from_table(results)
+    return ReportAccumulator.from_results(results)
 
 
 if __name__ == "__main__":
@@ -1,19 +1,35 @@
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.progress import track
 from rich.text import Text
 from rich.layout import Layout
 from rich.align import Align
+from collections.abc import Sequence
 from datetime import datetime
 import statistics
 
+from analyzer.metrics_table import CommitMetricsTable
+
 console = Console()
 
-def display_timeline(results):
+# Linhas exibidas na tabela de métricas por padrão
+DEFAULT_TABLE_LIMIT = 40
+# Linhas do terminal reservadas ao título e às margens do gráfico
+_CHART_MARGIN = 4
+_MIN_CHART_HEIGHT = 10
+
+def display_timeline(results, page=None, limit=DEFAULT_TABLE_LIMIT):
     """
     Exibe a timeline evolutiva com visualizações avançadas.
+    
+    Aceita uma lista de resultados ou o gerador de `iter_repository_metrics`.
+    A tabela mostra só uma janela dos commits (início e fim do histórico ou
+    a página `page` de `limit` linhas) e o gráfico é reduzido à altura do
+    terminal, então o tempo de exibição não depende do tamanho do histórico.
     """
+    if not isinstance(results, Sequence):
+        results = list(results)
+
     if not results:
         console.print("[bold red]Nenhum commit encontrado![/bold red]")
         return
@@ -39,7 +55,7 @@ def display_timeline(results):
     )
     
     # Tabela de métricas principal
-    layout["metrics_table"].update(_create_metrics_table(results))
+    layout["metrics_table"].update(_create_metrics_table(results, page, limit))
     
     # Painel de estatísticas
     layout["stats_panel"].update(_create_stats_panel(results))
@@ -56,9 +72,37 @@ def display_timeline(results):
     _display_evolution_chart(results)
 
 
-def _create_metrics_table(results):
-    """Cria tabela interativa com todas as métricas."""
-    table = Table(title="Histórico de Métricas", show_footer=True)
+def table_window(total, page=None, limit=DEFAULT_TABLE_LIMIT):
+    """
+    Faixas [início, fim) de linhas exibidas na tabela de métricas.
+
+    Sem `page`, mostra as primeiras e as últimas linhas (metade de `limit`
+    cada); com `page` (a partir de 1, limitada à última), as `limit` linhas
+    daquela página.
+    """
+    limit = max(1, limit)
+    if page is not None:
+        pages = max(1, -(-total // limit))
+        page = min(max(page, 1), pages)
+        return [((page - 1) * limit, min(page * limit, total))]
+    if total <= limit:
+        return [(0, total)]
+    head = limit // 2
+    ranges = [(0, head), (total - (limit - head), total)]
+    return [(start, end) for start, end in ranges if start < end]
+
+
+def _create_metrics_table(results, page=None, limit=DEFAULT_TABLE_LIMIT):
+    """Cria tabela com as métricas da janela de commits selecionada."""
+    window = table_window(len(results), page, limit)
+    if page is not None:
+        pages = max(1, -(-len(results) // max(1, limit)))
+        title = f"Histórico de Métricas (página {min(max(page, 1), pages)} de {pages})"
+    elif window == [(0, len(results))]:
+        title = "Histórico de Métricas"
+    else:
+        title = f"Histórico de Métricas ({sum(end - start for start, end in window)} de {len(results)} commits)"
+    table = Table(title=title, show_footer=True)
     
     # Colunas
     table.add_column("Data", style="cyan", width=12)
@@ -71,37 +115,44 @@ def _create_metrics_table(results):
     table.add_column("Smells", justify="right", width=8)
     table.add_column("Tendência", justify="center", width=10)
     
-    # Adiciona linhas com indicadores de tendência
-    previous_complexity = None
-    previous_smells = None
-    
-    for r in track(results, description="Gerando tabela..."):
-        # Tendência de complexidade
-        trend_cc = _get_trend_indicator(r.get("complexity"), previous_complexity)
-        
-        # Cor baseada em severity
-        complexity_color = _get_severity_color(r.get("complexity", 0))
-        # CORREÇÃO: usar "code_smells" em vez de "smells"
-        smells_color = _get_smell_color(r.get("code_smells", 0))
-        coupling_color = _get_coupling_color(r.get("coupling", 0))
-        mi_color = _get_mi_color(r.get("maintainability_index", 50))
+    shown = 0
+    for start, end in window:
+        if start > shown:
+            # Commits fora da janela viram uma única linha
+            table.add_row("⋮", "", Text(f"{start - shown} omitidos", style="dim"), *[""] * 6)
+        # A tendência compara com o commit anterior do histórico, mesmo fora da janela
+        previous_complexity = results[start - 1].get("complexity") if start > 0 else None
         
-        # Formata a linha com cores
-        table.add_row(
-            r["date"].strftime("%Y-%m-%d") if hasattr(r["date"], "strftime") else str(r["date"]),
-            r["hash"],
-            r["author"][:18],
-            Text(str(r.get("complexity", 0)), style=complexity_color),
-            Text(f"{r.get('coupling', 0):.1f}", style=coupling_color),
-            Text(f"{r.get('maintainability_index', 50):.1f}", style=mi_color),
-            Text(str(r.get("lines_of_code", 0)), style="dim"),
+        for index in range(start, end):
+            r = results[index]
+            trend_cc = _get_trend_indicator(r.get("complexity"), previous_complexity)
+            
+            # Cor baseada em severity
+            complexity_color = _get_severity_color(r.get("complexity", 0))
             # CORREÇÃO: usar "code_smells" em vez de "smells"
-            Text(str(r.get("code_smells", 0)), style=smells_color),
-            trend_cc
-        )
-        
-        previous_complexity = r.get("complexity")
-        previous_smells = r.get("code_smells")
+            smells_color = _get_smell_color(r.get("code_smells", 0))
+            coupling_color = _get_coupling_color(r.get("coupling", 0))
+            mi_color = _get_mi_color(r.get("maintainability_index", 50))
+            
+            # Formata a linha com cores
+            table.add_row(
+                r["date"].strftime("%Y-%m-%d") if hasattr(r["date"], "strftime") else str(r["date"]),
+                r["hash"],
+                r["author"][:18],
+                Text(str(r.get("complexity", 0)), style=complexity_color),
+                Text(f"{r.get('coupling', 0):.1f}", style=coupling_color),
+                Text(f"{r.get('maintainability_index', 50):.1f}", style=mi_color),
+                Text(str(r.get("lines_of_code", 0)), style="dim"),
+                # CORREÇÃO: usar "code_smells" em vez de "smells"
+                Text(str(r.get("code_smells", 0)), style=smells_color),
+                trend_cc
+            )
+            
+            previous_complexity = r.get("complexity")
+        shown = end
+    
+    if shown < len(results):
+        table.add_row("⋮", "", Text(f"{len(results) - shown} omitidos", style="dim"), *[""] * 6)
     
     return table
 
@@ -109,14 +160,21 @@ def _create_metrics_table(results):
 def _create_stats_panel(results):
     """Cria painel com estatísticas da evolução."""
     
-    complexities = [r.get("complexity", 0) for r in results]
-    # CORREÇÃO: usar "code_smells" em vez de "smells"
-    smells_list = [r.get("code_smells", 0) for r in results]
-    couplings = [r.get("coupling", 0) for r in results]
-    maintainabilities = [r.get("maintainability_index", 50) for r in results]
+    if isinstance(results, CommitMetricsTable):
+        # Agrega direto sobre as colunas, sem montar as linhas
+        complexities = results.column("complexity")
+        smells_list = results.column("code_smells")
+        couplings = results.column("coupling")
+        maintainabilities = results.column("maintainability_index")
+    else:
+        complexities = [r.get("complexity", 0) for r in results]
+        # CORREÇÃO: usar "code_smells" em vez de "smells"
+        smells_list = [r.get("code_smells", 0) for r in results]
+        couplings = [r.get("coupling", 0) for r in results]
+        maintainabilities = [r.get("maintainability_index", 50) for r in results]
     
     # Cálculos
-    avg_complexity = statistics.mean(complexities) if complexities else 0
+    avg_complexity = sum(complexities) / len(complexities) if complexities else 0
     max_complexity = max(complexities) if complexities else 0
     total_smells = sum(smells_list)
     avg_coupling = statistics.mean(couplings) if couplings else 0
@@ -144,29 +202,175 @@ def _create_stats_panel(results):
     return Panel(stats_text, style="blue")
 
 
-def _display_evolution_chart(results):
-    """Exibe um gráfico ASCII simples de evolução."""
+def display_profile(summary):
+    """
+    Exibe o tempo gasto em cada etapa da execução (saída de --profile).
+
+    `summary` é o dicionário de `Profiler.summary()`.
+    """
+    wall = summary["wall_seconds"]
+    table = Table(title=f"Perfil da execução: {wall:.2f} s (tempos por chamada em ms)")
+    table.add_column("Etapa", style="cyan", no_wrap=True)
+    table.add_column("Chamadas", justify="right")
+    table.add_column("Total (s)", justify="right", style="yellow")
+    table.add_column("%", justify="right")
+    table.add_column("Média", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("p99", justify="right")
+    table.add_column("Máx", justify="right")
+
+    for name, stats in sorted(summary["stages"].items()):
+        # Subetapas aparecem recuadas sob a etapa correspondente
+        label = "  " + name.split(".", 1)[1] if "." in name else name
+        table.add_row(
+            label,
+            str(stats["count"]),
+            f"{stats['total']:.3f}",
+            f"{stats['total'] / wall:.1%}" if wall else "-",
+            f"{stats['mean'] * 1000:.2f}",
+            f"{stats['p50'] * 1000:.2f}",
+            f"{stats['p95'] * 1000:.2f}",
+            f"{stats['p99'] * 1000:.2f}",
+            f"{stats['max'] * 1000:.2f}"
+        )
+    console.print(table)
+
+    for title, key, label in (("Arquivos mais lentos", "slowest_files", "file"),
+                              ("Commits mais lentos", "slowest_commits", "commit")):
+        if summary[key]:
+            console.print(f"\n[bold cyan]{title}[/bold cyan]")
+            for entry in summary[key]:
+                console.print(f"  {entry['seconds'] * 1000:10.2f} ms  {entry[label]}")
+
+
+def display_clones(rows, pairs, limit=DEFAULT_TABLE_LIMIT):
+    """
+    Exibe a duplicação de código por snapshot e os maiores pares de clones
+    do último snapshot.
+
+    `rows` são os dicionários de `iter_snapshot_clones` e `pairs` a lista de
+    ClonePair; como na timeline, só o início e o fim do histórico entram na
+    tabela.
+    """
+    if not rows:
+        console.print("[bold red]Nenhum commit encontrado![/bold red]")
+        return
+
+    table = Table(title="Duplicação de Código por Commit")
+    table.add_column("Data", style="cyan", width=12)
+    table.add_column("Commit", style="magenta", width=8)
+    table.add_column("Arquivos", justify="right")
+    table.add_column("Trechos", justify="right")
+    table.add_column("Repetidos", justify="right")
+    table.add_column("Dupl.", justify="right", style="yellow")
+    table.add_column("Pares", justify="right")
+
+    shown = 0
+    for start, end in table_window(len(rows), limit=limit):
+        if start > shown:
+            table.add_row("⋮", "", Text(f"{start - shown} omitidos", style="dim"), *[""] * 4)
+        for r in rows[start:end]:
+            table.add_row(
+                r["date"].strftime("%Y-%m-%d") if hasattr(r["date"], "strftime") else str(r["date"]),
+                r["hash"],
+                str(r["files"]),
+                str(r["fingerprints"]),
+                str(r["duplicated"]),
+                f"{r['duplication_ratio']:.1%}",
+                str(r["clone_pairs"])
+            )
+        shown = end
+    console.print(table)
+
+    if not pairs:
+        console.print("\n[green]Nenhum par de clones no último commit.[/green]")
+        return
+
+    pairs_table = Table(title=f"Maiores Clones em {rows[-1]['hash']}")
+    pairs_table.add_column("Arquivo A", style="green")
+    pairs_table.add_column("Linhas A", style="dim")
+    pairs_table.add_column("Arquivo B", style="green")
+    pairs_table.add_column("Linhas B", style="dim")
+    pairs_table.add_column("Trechos", justify="right", style="yellow")
+    for pair in pairs:
+        pairs_table.add_row(
+            pair.path_a, _format_ranges(pair.lines_a),
+            pair.path_b, _format_ranges(pair.lines_b),
+            str(pair.shared)
+        )
+    console.print(pairs_table)
+
+
+def _format_ranges(ranges, shown=3):
+    text = ", ".join(f"{start}-{end}" for start, end in ranges[:shown])
+    if len(ranges) > shown:
+        text += f" (+{len(ranges) - shown})"
+    return text
+
+
+def minmax_buckets(values, buckets):
+    """
+    Reduz uma série a no máximo `buckets` grupos contíguos de tamanho
+    quase igual, guardando o mínimo e o máximo de cada um; ao contrário de
+    uma média ou amostragem, picos isolados continuam visíveis.
+
+    Retorna:
+        list: tuplas (início, fim, mínimo, máximo), com fim exclusivo
+    """
+    count = len(values)
+    if count <= buckets:
+        return [(i, i + 1, value, value) for i, value in enumerate(values)]
+    bounds = [i * count // buckets for i in range(buckets + 1)]
+    reduced = []
+    for start, end in zip(bounds, bounds[1:]):
+        chunk = values[start:end]
+        reduced.append((start, end, min(chunk), max(chunk)))
+    return reduced
+
+
+def _display_evolution_chart(results, height=None):
+    """
+    Exibe um gráfico ASCII de evolução com uma linha por commit ou, se o
+    histórico não couber na altura do terminal, uma linha por grupo de
+    commits (mínimo em █, faixa até o máximo em ▒).
+    """
+    if isinstance(results, CommitMetricsTable):
+        complexities = results.column("complexity")
+    else:
+        complexities = [r.get("complexity", 0) for r in results]
+    if height is None:
+        height = max(_MIN_CHART_HEIGHT, console.size.height - _CHART_MARGIN)
+    buckets = minmax_buckets(complexities, height)
     
-    console.print("\n[bold cyan]Evolução da Complexidade[/bold cyan]")
+    if len(buckets) < len(complexities):
+        console.print(
+            f"\n[bold cyan]Evolução da Complexidade[/bold cyan] "
+            f"[dim]({len(complexities)} commits em {len(buckets)} linhas; ▒ = faixa mín–máx)[/dim]"
+        )
+    else:
+        console.print("\n[bold cyan]Evolução da Complexidade[/bold cyan]")
     
-    complexities = [r.get("complexity", 0) for r in results]
     if not complexities:
         return
     
-    max_complexity = max(complexities)
+    max_complexity = max(high for _, _, _, high in buckets)
     if max_complexity == 0:
         return
     
     # Cria gráfico ASCII (escala 40 caracteres)
     chart_width = 40
-    for i, (r, cc) in enumerate(zip(results, complexities)):
-        bar_length = int((cc / max_complexity) * chart_width)
-        bar = "█" * bar_length + "░" * (chart_width - bar_length)
+    for start, end, low, high in buckets:
+        low_length = int((low / max_complexity) * chart_width)
+        high_length = int((high / max_complexity) * chart_width)
+        bar = "█" * low_length + "▒" * (high_length - low_length) + "░" * (chart_width - high_length)
         
-        # Data simplificada
-        date_str = r["date"].strftime("%m-%d") if hasattr(r["date"], "strftime") else str(r["date"])[:5]
+        # Data simplificada (início do grupo)
+        date = results[start]["date"]
+        date_str = date.strftime("%m-%d") if hasattr(date, "strftime") else str(date)[:5]
+        value = str(high) if low == high else f"{low}–{high}"
         
-        console.print(f"{date_str} │{bar}│ {cc}")
+        console.print(f"{date_str} │{bar}│ {value}")
 
 
 def _get_severity_color(value):
@@ -227,4 +431,120 @@ def _get_trend_indicator(current, previous):
     elif current < previous * 0.9:  # 10% de diminuição
         return Text("↓", style="bold green")
     else:
-        return Text("→", style="dim")
\ No newline at end of file
+        return Text("→", style="dim")
+
+def display_batch(results, combined=None):
+    """
+    Exibe o resumo de uma análise em lote: uma linha por repositório (na
+    ordem do manifesto) e, com `combined` (estatísticas de
+    `ReportAccumulator.stats()`), o total dos repositórios analisados.
+    """
+    table = Table(title="Análise em Lote")
+    table.add_column("Repositório", style="green")
+    table.add_column("Commits", justify="right")
+    table.add_column("Autores", justify="right")
+    table.add_column("CC Médio", justify="right")
+    table.add_column("CC Máx", justify="right")
+    table.add_column("Smells", justify="right")
+    table.add_column("MI", justify="right")
+    table.add_column("Tendência")
+    table.add_column("Tempo", justify="right", style="dim")
+
+    for result in results:
+        name = result.entry.name
+        seconds = f"{result.seconds:.1f}s"
+        if not result.ok:
+            table.add_row(name, Text(f"erro: {result.error}", style="red"), *[""] * 6, seconds)
+            continue
+        stats = result.accumulator.stats()
+        table.add_row(name, *_batch_columns(stats), seconds)
+
+    if combined is not None:
+        table.add_section()
+        table.add_row(Text("Total", style="bold"), *_batch_columns(combined), "")
+    console.print(table)
+
+
+def _batch_columns(stats):
+    if not stats['total_commits']:
+        return ["0", "0", "-", "-", "-", "-", "-"]
+    return [
+        str(stats['total_commits']),
+        str(stats['total_authors']),
+        f"[{_get_severity_color(stats['avg_complexity'])}]{stats['avg_complexity']:.1f}[/]",
+        str(stats['max_complexity']),
+        f"[{_get_smell_color(stats['avg_smells'])}]{stats['total_smells']}[/]",
+        f"[{_get_mi_color(stats['avg_maintainability'])}]{stats['avg_maintainability']:.1f}[/]",
+        stats['complexity_trend']
+    ]
+
+
+def display_function_growth(rows, since=None, until=None):
+    """
+    Exibe as funções cuja complexidade mais cresceu no período (`rows` de
+    `FunctionIndex.top_growth`).
+    """
+    if not rows:
+        console.print("[bold red]Nenhuma função alterada no período![/bold red]")
+        return
+
+    period = f"{since or 'início'} a {until or 'hoje'}"
+    table = Table(title=f"Funções com Maior Crescimento de Complexidade ({period})")
+    table.add_column("Arquivo", style="green")
+    table.add_column("Função", style="cyan")
+    table.add_column("Linha", justify="right", style="dim")
+    table.add_column("CC", justify="right")
+    table.add_column("Δ CC", justify="right")
+    table.add_column("NLOC", justify="right")
+    table.add_column("Parâm.", justify="right")
+    table.add_column("Alterações", justify="right", style="dim")
+    for r in rows:
+        growth_color = "red" if r['growth'] > 0 else "green" if r['growth'] < 0 else "white"
+        table.add_row(
+            r['file'],
+            r['function'],
+            str(r['start_line']),
+            f"{r['start_complexity']} → [{_get_severity_color(r['complexity'])}]{r['complexity']}[/]",
+            f"[{growth_color}]{r['growth']:+d}[/]",
+            str(r['nloc']),
+            str(r['parameters']),
+            str(r['versions'])
+        )
+    console.print(table)
+
+
+def display_hotspots(ranking, title="Hotspots (churn × complexidade)"):
+    """
+    Exibe o ranking de hotspots (`HotspotTracker.ranking`): um arquivo por
+    linha, do maior para o menor.
+    """
+    if not ranking:
+        console.print("[bold red]Nenhum arquivo alterado no período![/bold red]")
+        return
+
+    table = Table(title=title)
+    table.add_column("#", justify="right", style="dim")
+    table.add_column("Arquivo", style="green")
+    table.add_column("Commits", justify="right")
+    table.add_column("+", justify="right", style="green")
+    table.add_column("-", justify="right", style="red")
+    table.add_column("CC", justify="right")
+    table.add_column("Smells", justify="right")
+    table.add_column("LOC", justify="right")
+    table.add_column("Score", justify="right", style="bold yellow")
+    table.add_column("Última alteração", style="cyan")
+    for position, f in enumerate(ranking, 1):
+        last = f['last_modified']
+        table.add_row(
+            str(position),
+            f['path'],
+            str(f['commits']),
+            str(f['added_lines']),
+            str(f['deleted_lines']),
+            f"[{_get_severity_color(f['complexity'])}]{f['complexity']}[/]",
+            f"[{_get_smell_color(f['code_smells'])}]{f['code_smells']}[/]",
+            str(f['lines_of_code']),
+            str(f['score']),
+            last.strftime("%Y-%m-%d") if last is not None else "-"
+        )
+    console.print(table)
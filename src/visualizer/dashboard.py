@@ -0,0 +1,177 @@
+import time
+from collections import deque
+
+from rich.console import Group
+from rich.live import Live
+from rich.panel import Panel
+from rich.table import Table
+
+from analyzer.aggregation import ReportAccumulator
+from visualizer import cli_view
+
+# Commits recentes exibidos no painel
+DEFAULT_LATEST = 8
+# Intervalo mínimo entre redesenhos no terminal e entre linhas de log
+DEFAULT_REFRESH_SECONDS = 0.25
+DEFAULT_LOG_SECONDS = 10.0
+
+
+class LiveDashboard:
+    """
+    Painel atualizado enquanto os commits são analisados.
+
+    Mostra commits/s, arquivos/s, tempo restante estimado, taxa de acerto do
+    cache, os últimos commits e os agregados até o momento. É o objeto
+    `progress` de `iter_repository_metrics`.
+
+    Os redesenhos são limitados a um a cada `refresh_seconds`, e o painel só
+    é montado quando vai ser desenhado, então o custo não cresce com a
+    velocidade da análise. Fora de um terminal (saída redirecionada), em
+    vez do painel é impressa uma linha de log a cada `log_seconds`.
+    """
+
+    def __init__(self, cache=None, latest=DEFAULT_LATEST, refresh_seconds=DEFAULT_REFRESH_SECONDS,
+                 log_seconds=DEFAULT_LOG_SECONDS, console=None, clock=time.monotonic):
+        self.cache = cache
+        self.console = console or cli_view.console
+        self.refresh_seconds = refresh_seconds
+        self.log_seconds = log_seconds
+        self.total = None
+        self.done = 0
+        self.commits = 0
+        self.files = 0
+        self.aggregates = ReportAccumulator()
+        self.latest = deque(maxlen=latest)
+        self._clock = clock
+        self._started = None
+        self._last_draw = None
+        self._live = None
+
+    def start(self, total, done=0):
+        """Início da travessia: `total` commits no período, `done` já processados antes."""
+        self.total = total
+        self.done = done
+        self._started = self._last_draw = self._clock()
+        if self.console.is_terminal:
+            self._live = Live(self.render(), console=self.console, auto_refresh=False, transient=True)
+            self._live.start()
+
+    def restore(self, result):
+        """Resultado retomado do estado salvo: entra nos agregados, mas não na taxa."""
+        self.aggregates.add(result)
+        self.latest.append(result)
+
+    def advance(self, result, files):
+        """Um commit percorrido, com `files` arquivos analisados."""
+        self.commits += 1
+        self.files += files
+        if result is not None:
+            self.aggregates.add(result)
+            self.latest.append(result)
+
+        now = self._clock()
+        interval = self.refresh_seconds if self._live is not None else self.log_seconds
+        if now - self._last_draw >= interval:
+            self._last_draw = now
+            self._draw()
+
+    def close(self):
+        """Encerra o painel (ou imprime a última linha de log)."""
+        if self._started is None:
+            return
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+        else:
+            self.console.print(self.log_line(), markup=False, highlight=False)
+        self._started = None
+
+    def rates(self):
+        """(commits/s, arquivos/s, segundos restantes ou None)."""
+        elapsed = self._clock() - self._started if self._started is not None else 0
+        if elapsed <= 0:
+            return 0.0, 0.0, None
+        commits_rate = self.commits / elapsed
+        files_rate = self.files / elapsed
+        eta = None
+        if self.total is not None and commits_rate > 0:
+            eta = max(0, self.total - self.done - self.commits) / commits_rate
+        return commits_rate, files_rate, eta
+
+    def _draw(self):
+        if self._live is not None:
+            self._live.update(self.render(), refresh=True)
+        else:
+            self.console.print(self.log_line(), markup=False, highlight=False)
+
+    def _progress_text(self):
+        processed = self.done + self.commits
+        if self.total:
+            position = f"{processed}/{self.total} commits ({min(processed / self.total, 1):.0%})"
+        else:
+            position = f"{processed} commits"
+        commits_rate, files_rate, eta = self.rates()
+        parts = [position, f"{commits_rate:.1f} commits/s", f"{files_rate:.1f} arquivos/s",
+                 f"ETA {_format_seconds(eta)}"]
+        lookups = self.cache.hits + self.cache.misses if self.cache is not None else 0
+        if lookups:
+            parts.append(f"cache {self.cache.hits / lookups:.0%}")
+        return " | ".join(parts)
+
+    def log_line(self):
+        """Linha de progresso usada fora do terminal."""
+        return f"[{_format_seconds(self._clock() - self._started)}] {self._progress_text()}"
+
+    def render(self):
+        """Monta o painel com o estado atual."""
+        header = Panel(self._progress_text(), title="Analisando", style="cyan")
+
+        latest = Table(title="Últimos commits", expand=True)
+        latest.add_column("Data", style="cyan", no_wrap=True)
+        latest.add_column("Commit", style="magenta")
+        latest.add_column("Autor", style="green", max_width=18, no_wrap=True)
+        latest.add_column("CC", justify="right", style="yellow")
+        latest.add_column("Smells", justify="right")
+        latest.add_column("MI", justify="right")
+        for r in reversed(self.latest):
+            date = r["date"]
+            latest.add_row(
+                date.strftime("%Y-%m-%d") if hasattr(date, "strftime") else str(date),
+                r["hash"],
+                r["author"],
+                str(r.get("complexity", 0)),
+                str(r.get("code_smells", 0)),
+                f"{r.get('maintainability_index', 50):.1f}"
+            )
+
+        if self.aggregates.count:
+            stats = self.aggregates.stats()
+            stats_text = (
+                f"[yellow]Commits com Python:[/yellow] {stats['total_commits']}\n"
+                f"[yellow]Autores:[/yellow] {stats['total_authors']}\n"
+                f"[yellow]CC Médio:[/yellow] {stats['avg_complexity']:.1f}\n"
+                f"[yellow]CC Máximo:[/yellow] {stats['max_complexity']}\n"
+                f"[yellow]Total Smells:[/yellow] {stats['total_smells']}\n"
+                f"[yellow]Manutenibilidade:[/yellow] {stats['avg_maintainability']:.1f}\n"
+                f"[yellow]Acoplamento Médio:[/yellow] {stats['avg_coupling']:.1f}\n"
+                f"[yellow]Tendência:[/yellow] {stats['complexity_trend']}"
+            )
+        else:
+            stats_text = "Aguardando commits com arquivos Python..."
+
+        body = Table.grid(expand=True)
+        body.add_column(ratio=2)
+        body.add_column(ratio=1)
+        body.add_row(latest, Panel(stats_text, title="Até agora", style="blue"))
+        return Group(header, body)
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
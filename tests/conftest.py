@@ -1,5 +1,73 @@
 import sys
 import os
+import pathlib
+import subprocess
 
 # Adiciona o diretório src ao PYTHONPATH
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
\ No newline at end of file
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Evita que os testes da CLI escrevam no cache real do usuário."""
+    monkeypatch.setenv("CODETHERMOMETER_CACHE_DIR", str(tmp_path / "cache"))
+
+
+def run_git(repo, *args, date=None, author="Dev"):
+    """Roda o git em `repo` com o autor `author` e, se informada, a mesma data de autor e de commit."""
+    env = {"GIT_COMMITTER_DATE": date, "GIT_AUTHOR_DATE": date} if date else {}
+    result = subprocess.run(
+        ["git", "-c", f"user.name={author}", "-c", "user.email=dev@example.com", *args],
+        cwd=repo, check=True, capture_output=True, text=True, env={**os.environ, **env}
+    )
+    return result.stdout.strip()
+
+
+class GitRepo:
+    """Repositório git de teste em um diretório temporário."""
+
+    def __init__(self, path, author="Dev"):
+        self.path = str(path)
+        self.author = author
+
+    @property
+    def uri(self):
+        """URL file:// do repositório, para testes que o tratam como remoto."""
+        return pathlib.Path(self.path).as_uri()
+
+    def git(self, *args, date=None):
+        return run_git(self.path, *args, date=date, author=self.author)
+
+    def write(self, files):
+        for name, content in files.items():
+            path = os.path.join(self.path, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write(content)
+
+    def commit(self, message, files=None, date=None, removed=()):
+        """Grava `files` ({caminho: conteúdo}), remove `removed` e commita tudo o que mudou."""
+        self.write(files or {})
+        for name in removed:
+            self.git("rm", "-q", name)
+        self.git("add", "-A")
+        self.git("commit", "-qm", message, date=date)
+
+
+@pytest.fixture
+def git():
+    """`git(repo, *args, date=None)`: roda um comando git no repositório e retorna a saída."""
+    return run_git
+
+
+@pytest.fixture
+def make_repo(tmp_path):
+    """`make_repo(nome="repo", *argumentos do git init, author="Dev")`: cria um GitRepo vazio em tmp_path."""
+    def make(name="repo", *init_args, author="Dev"):
+        path = tmp_path / name
+        path.mkdir(parents=True)
+        run_git(path, "init", "-q", *init_args)
+        return GitRepo(path, author)
+    return make
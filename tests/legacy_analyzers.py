@@ -0,0 +1,212 @@
+"""
+Implementações originais (baseadas em regex) dos analisadores.
+
+Servem de oráculo para os testes diferenciais e para os benchmarks: as
+versões em `src/analyzer` precisam produzir exatamente os mesmos valores.
+"""
+import re
+from collections import defaultdict
+
+
+def detect_code_duplication(source_code):
+    """Detecta padrões de código duplicado."""
+    lines = source_code.split('\n')
+    
+    # Mapeia sequências de linhas similares
+    line_map = defaultdict(int)
+    smells = 0
+    
+    for i in range(len(lines) - 2):
+        # Normaliza a linha (remove espaços, comentários)
+        normalized = re.sub(r'#.*$', '', lines[i]).strip()
+        
+        if normalized and len(normalized) > 20:
+            line_map[normalized] += 1
+    
+    # Linhas que aparecem 3+ vezes são consideradas duplicação
+    for count in line_map.values():
+        if count >= 3:
+            smells += 1
+    
+    return min(smells, 5)  # Máximo 5 smells de duplicação
+
+
+def detect_unused_variables(source_code):
+    """Detecta variáveis que são definidas mas nunca usadas."""
+    smells = 0
+    
+    # Padrão: variáveis atribuídas
+    assignment_pattern = r'^\s*(\w+)\s*='
+    # Padrão: variáveis usadas
+    usage_pattern = r'\b({var})\b'
+    
+    assignments = defaultdict(int)
+    
+    for match in re.finditer(assignment_pattern, source_code, re.MULTILINE):
+        var_name = match.group(1)
+        if not var_name.startswith('_'):  # Ignora convenção _ para unused
+            assignments[var_name] += 1
+    
+    # Verifica se as variáveis são usadas
+    for var_name in assignments.keys():
+        pattern = usage_pattern.format(var=re.escape(var_name))
+        uses = len(re.findall(pattern, source_code))
+        
+        # Se é atribuída mas nunca usada (ou usada só uma vez na atribuição)
+        if uses <= 1 and assignments[var_name] > 0:
+            smells += 1
+    
+    return min(smells, 5)
+
+
+def detect_unused_imports(source_code):
+    """Detecta imports que não são utilizados."""
+    smells = 0
+    
+    # Extrai todos os imports
+    import_pattern = r'^(?:from\s+(\w+)\s+import|import\s+(\w+))'
+    
+    for match in re.finditer(import_pattern, source_code, re.MULTILINE):
+        module = match.group(1) or match.group(2)
+        
+        # Verifica se o módulo é usado no código
+        usage_count = len(re.findall(rf'\b{module}\b', source_code))
+        
+        if usage_count <= 1:  # Apenas a linha de import
+            smells += 1
+    
+    return min(smells, 3)
+
+
+def detect_deep_nesting(source_code):
+    """Detecta aninhamento profundo de blocos (if, for, while, etc)."""
+    smells = 0
+    max_depth = 0
+    current_depth = 0
+    
+    # Caracteres que indicam abertura/fechamento de blocos
+    opening = {':', '(', '[', '{'}
+    closing = {':', ')', ']', '}'}
+    
+    for line in source_code.split('\n'):
+        stripped = line.strip()
+        
+        # Conta a profundidade de indentação
+        indent_level = (len(line) - len(line.lstrip())) // 4
+        
+        # Se tem dois pontos no final, é início de bloco
+        if stripped.endswith(':'):
+            current_depth = indent_level
+            max_depth = max(max_depth, current_depth)
+    
+    # Aninhamento profundo (5+ níveis) é um smell
+    if max_depth >= 5:
+        smells += 2
+    elif max_depth >= 4:
+        smells += 1
+    
+    return smells
+
+
+def detect_generic_names(source_code):
+    """Detecta nomes de variáveis genéricos ou muito curtos."""
+    smells = 0
+    
+    # Nomes muito genéricos
+    generic_names = {'a', 'b', 'c', 'x', 'y', 'z', 'i', 'j', 'k', 'tmp', 'temp', 'data', 'value', 'var'}
+    
+    # Padrão: atribuição de variável
+    pattern = r'^\s*(\w+)\s*='
+    
+    for match in re.finditer(pattern, source_code, re.MULTILINE):
+        var_name = match.group(1)
+        
+        if var_name in generic_names and len(var_name) <= 3:
+            smells += 1
+    
+    return min(smells, 3)
+
+
+def analyze_coupling(source_code):
+    """
+    Analisa o acoplamento externo (dependências) do código.
+    
+    Métricas:
+    - Número de imports externos
+    - Número de classes/funções usadas de outros módulos
+    - Índice de acoplamento efetivo
+    
+    Retorna:
+        float: Score de acoplamento (0.0 - 10.0)
+    """
+    
+    # Imports externos
+    imports = count_external_imports(source_code)
+    
+    # Referências cruzadas
+    cross_references = count_cross_references(source_code)
+    
+    # Análise de dependências internas
+    internal_deps = analyze_internal_dependencies(source_code)
+    
+    # Cálculo do índice de acoplamento (escala 0-10)
+    # Baseado em: imports + referências cruzadas + dependências internas
+    coupling_score = min(10.0, (imports * 0.5 + cross_references * 0.3 + internal_deps * 0.2))
+    
+    return coupling_score
+
+
+def count_external_imports(source_code):
+    """Conta imports externos (não-stdlib e não-locais)."""
+    import_patterns = [
+        r'^import\s+(\w+)',
+        r'^from\s+(\w+)\s+import',
+        r'^\s+import\s+(\w+)',
+        r'^\s+from\s+(\w+)\s+import'
+    ]
+    
+    stdlib_modules = {
+        'os', 'sys', 're', 'json', 'time', 'datetime', 'collections',
+        'itertools', 'functools', 'math', 'random', 'logging', 'unittest'
+    }
+    
+    imports = set()
+    for pattern in import_patterns:
+        matches = re.findall(pattern, source_code, re.MULTILINE)
+        for match in matches:
+            module_name = match.split('.')[0]
+            if module_name not in stdlib_modules and not module_name.startswith('_'):
+                imports.add(module_name)
+    
+    return len(imports)
+
+
+def count_cross_references(source_code):
+    """Conta referências a outros módulos/classes dentro do código."""
+    # Padrão: Class.method() ou module.function()
+    pattern = r'(\w+)\.(\w+)\s*\('
+    references = len(re.findall(pattern, source_code))
+    return min(references / 10, 5)  # Normaliza para escala 0-5
+
+
+def analyze_internal_dependencies(source_code):
+    """Analisa dependências entre funções/classes internas."""
+    
+    # Extrai definições de classes e funções
+    class_pattern = r'class\s+(\w+)'
+    func_pattern = r'def\s+(\w+)'
+    
+    classes = set(re.findall(class_pattern, source_code))
+    functions = set(re.findall(func_pattern, source_code))
+    defined_items = classes | functions
+    
+    # Conta referências a items definidos
+    dependency_count = 0
+    for item in defined_items:
+        # Conta quantas vezes cada item é referenciado
+        pattern = rf'\b{item}\s*\('
+        refs = len(re.findall(pattern, source_code))
+        if refs > 1:  # Mais de uma referência indica dependência
+            dependency_count += 1
+    
+    return min(dependency_count / 5, 3)  # Normaliza para escala 0-3
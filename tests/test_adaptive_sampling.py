@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+from analyzer.adaptive_sampling import adaptive_sample, analyze_adaptive, metrics_jump
+
+SIMPLE = "def f{i}(x):\n    return x + {i}\n"
+COMPLEX = "def g(x):\n" + "".join(f"    if x == {k}:\n        return {k}\n" for k in range(30)) + "    return 0\n"
+
+
+def _metrics(complexity, smells=0, mi=80.0):
+    return {"complexity": complexity, "code_smells": smells, "maintainability_index": mi}
+
+
+@pytest.fixture
+def repo(make_repo):
+    """20 commits pequenos; o 13º (índice 12) adiciona uma função muito complexa."""
+    repo = make_repo()
+    for i in range(20):
+        files = {f"m{i}.py": SIMPLE.format(i=i)}
+        if i == 12:
+            files["complex.py"] = COMPLEX
+        repo.commit(f"c{i}", files)
+    return repo.path
+
+
+def test_metrics_jump_is_relative():
+    assert metrics_jump(_metrics(100), _metrics(105)) == pytest.approx(5 / 105)
+    assert metrics_jump(None, _metrics(0, smells=3)) == pytest.approx(1.0)
+
+
+def test_flat_history_keeps_only_initial_samples():
+    evaluated = []
+
+    def evaluate(index):
+        evaluated.append(index)
+        return _metrics(10)
+
+    results = adaptive_sample(1000, evaluate, budget=40, threshold=0.05)
+
+    assert len(results) == 10
+    assert 0 in results and 999 in results
+    assert len(evaluated) == len(set(evaluated))
+
+
+def test_step_is_pinpointed_within_budget():
+    def evaluate(index):
+        return _metrics(10 if index < 617 else 50)
+
+    results = adaptive_sample(1000, evaluate, budget=40, threshold=0.05)
+
+    assert len(results) <= 40
+    assert 616 in results and 617 in results
+
+
+def test_budget_stops_refinement():
+    results = adaptive_sample(1000, lambda index: _metrics(index), budget=12, threshold=0.0)
+
+    assert len(results) == 12
+
+
+def test_analyze_adaptive_finds_regression_commit(repo):
+    results = analyze_adaptive(repo, budget=10, threshold=0.5)
+    complexities = [r["complexity"] for r in results]
+
+    assert len(results) <= 10
+    # A amostra imediatamente antes e a imediatamente depois do salto são commits vizinhos
+    jump = next(i for i, cc in enumerate(complexities) if cc > 30)
+    assert complexities[jump - 1] == 12
+    assert complexities[jump] == 13 + 31
+
+
+def test_analyze_adaptive_keeps_remote_clone_until_done(repo, tmp_path, monkeypatch):
+    # Sem espelho, a URL remota é clonada em um diretório temporário que
+    # precisa existir durante toda a amostragem (e é removido no fim)
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    expected = analyze_adaptive(repo, budget=10, threshold=0.5)
+    assert analyze_adaptive(f"file://{repo}", budget=10, threshold=0.5) == expected
+    assert not any(name.startswith("codethermometer-") for name in os.listdir(tmp_path))
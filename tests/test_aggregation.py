@@ -0,0 +1,128 @@
+import math
+import random
+import statistics
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from analyzer.aggregation import ExactSum, ReportAccumulator, RunningStats
+from analyzer.metrics_table import CommitMetricsTable
+from main import _calculate_aggregated_stats
+
+
+def _results(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "hash": f"{i:07x}",
+            # Várias datas repetidas para exercitar os empates
+            "date": start + timedelta(days=rng.randrange(count // 3 + 1)),
+            "author": f"Autor {rng.randrange(4)}",
+            "complexity": rng.randrange(500),
+            "coupling": rng.random() * 10,
+            "maintainability_index": rng.uniform(20, 100),
+            "lines_of_code": rng.randrange(5000),
+            "code_smells": rng.randrange(30),
+            "functions_count": rng.randrange(100),
+            "avg_function_length": rng.random() * 40,
+            "files_modified": 1
+        }
+        for i in range(count)
+    ]
+
+
+def _reference(results):
+    """Estatísticas calculadas sobre a lista completa (implementação anterior)."""
+    complexities = [r["complexity"] for r in results]
+    smells = [r["code_smells"] for r in results]
+    return {
+        "first_date": results[0]["date"].strftime("%Y-%m-%d"),
+        "last_date": results[-1]["date"].strftime("%Y-%m-%d"),
+        "avg_complexity": sum(complexities) / len(complexities),
+        "complexity_trend": "↑ Piorando" if complexities[-1] > complexities[0]
+        else "↓ Melhorando" if complexities[-1] < complexities[0] else "→ Estável",
+        "avg_smells": sum(smells) / len(smells),
+        "avg_maintainability": statistics.mean(r["maintainability_index"] for r in results),
+        "avg_coupling": statistics.mean(r["coupling"] for r in results),
+        "total_authors": len({r["author"] for r in results}),
+    }
+
+
+def test_exact_sum_matches_statistics_mean():
+    values = [0.1] * 10 + [1e16, 1.0, -1e16, 2.5e-8]
+    total = ExactSum()
+    for value in values:
+        total.add(value)
+    assert total.mean(len(values)) == statistics.mean(values)
+    assert total.total == math.fsum(values)
+
+    ints = ExactSum()
+    for value in (1, 2, 4):
+        ints.add(value)
+    assert ints.total == 7 and isinstance(ints.total, int)
+
+
+def test_running_stats():
+    values = [3, 1, 4, 1, 5, 9, 2, 6]
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+
+    assert (stats.count, stats.min, stats.max, stats.first, stats.last) == (8, 1, 9, 3, 6)
+    assert stats.total == 31
+    assert stats.mean == statistics.mean(values)
+    assert stats.variance == pytest.approx(statistics.variance(values))
+    assert RunningStats().mean == 0
+
+
+def test_streamed_stats_match_sorted_list_in_any_order():
+    results = _results(300)
+    ordered = sorted(results, key=lambda r: r["date"])
+    expected = _reference(ordered)
+
+    random.Random(1).shuffle(results)
+    stats = ReportAccumulator.from_results(results).stats()
+
+    assert {key: stats[key] for key in expected} == expected
+    assert stats == _calculate_aggregated_stats(ordered)
+    assert stats == _calculate_aggregated_stats(CommitMetricsTable.from_results(ordered))
+
+
+def test_author_totals():
+    results = _results(50)
+    accumulator = ReportAccumulator.from_results(results)
+
+    for author, (commits, total_cc, total_smells) in accumulator.authors.items():
+        mine = [r for r in results if r["author"] == author]
+        assert (commits, total_cc, total_smells) == (
+            len(mine), sum(r["complexity"] for r in mine), sum(r["code_smells"] for r in mine)
+        )
+
+
+def test_merge_equals_accumulating_everything():
+    results = _results(300, seed=7)
+    for split in (0, 1, 150, 300):
+        merged = ReportAccumulator.from_results(results[:split])
+        merged.merge(ReportAccumulator.from_results(results[split:]))
+        whole = ReportAccumulator.from_results(results)
+        assert merged.stats() == whole.stats()
+        assert merged.authors == whole.authors
+        assert merged.complexity.variance == pytest.approx(whole.complexity.variance)
+        assert (merged.complexity.first, merged.complexity.last) == (whole.complexity.first, whole.complexity.last)
+
+
+def test_table_is_aggregated_by_columns():
+    results = sorted(_results(300, seed=3), key=lambda r: r["date"])
+    table = CommitMetricsTable.from_results(results)
+
+    with patch.object(CommitMetricsTable, "__iter__", side_effect=AssertionError("percorreu as linhas")):
+        columns = ReportAccumulator.from_table(table)
+        assert _calculate_aggregated_stats(table) == columns.stats()
+    rows = ReportAccumulator.from_results(results)
+
+    assert columns.stats() == rows.stats()
+    assert columns.authors == rows.authors
+    assert columns.complexity.variance == pytest.approx(rows.complexity.variance)
+    assert ReportAccumulator.from_table(CommitMetricsTable()).stats() == ReportAccumulator().stats()
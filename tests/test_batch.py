@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from analyzer.aggregation import ReportAccumulator
+from analyzer.batch import BatchEntry, iter_batch, load_manifest, prefetch, repository_name
+from analyzer.metrics_cache import MetricsCache
+from analyzer.metrics_extractor import extract_metrics
+from analyzer.repo_miner import analyze_repository
+from main import cli
+
+MODULE = "def f{i}(x):\n    if x > {i}:\n        return x\n    return {i}\n"
+VENDORED = "def vendored(a, b):\n    for i in range(a):\n        if i > b:\n            return i\n    return b\n"
+
+
+@pytest.fixture
+def repos(make_repo):
+    """Três commits com um arquivo próprio e um arquivo vendorizado idêntico em todos os repositórios."""
+    paths = []
+    for name, offset in (("alpha", 0), ("beta", 10)):
+        repo = make_repo(name)
+        repo.write({"lib.py": VENDORED})
+        for i in range(3):
+            repo.commit(f"c{i}", {"app.py": MODULE.format(i=offset + i)},
+                        date=f"2025-01-{offset + i + 1:02d}T10:00:00")
+        paths.append(repo.path)
+    return paths
+
+
+def test_load_manifest(tmp_path):
+    path = tmp_path / "repos.toml"
+    path.write_text(
+        'since = 2025-01-01\nexclude = ["vendor/"]\n\n'
+        '[[repos]]\nurl = "https://example.com/org/api.git"\n\n'
+        '[[repos]]\nurl = "/srv/other/api"\nuntil = "2025-06-30"\nexclude = ["*_pb2.py"]\n\n'
+        '[[repos]]\nurl = "/srv/legacy"\nname = "old"\nsince = "2020-01-01"\n'
+    )
+    entries = load_manifest(str(path))
+    assert [e.name for e in entries] == ["api", "api-2", "old"]
+    assert [(e.since, e.until) for e in entries] == [
+        ("2025-01-01", None), ("2025-01-01", "2025-06-30"), ("2020-01-01", None)
+    ]
+    assert entries[1].exclude == ("vendor/", "*_pb2.py")
+
+    for content in ('since = "2025"\n', '[[repos]]\nname = "x"\n', '[[repos]]\nurl = "a"\nbranch = "b"\n',
+                    'repos = [\n', 'jobs = 2\n[[repos]]\nurl = "a"\n'):
+        path.write_text(content)
+        with pytest.raises(ValueError):
+            load_manifest(str(path))
+
+
+def test_repository_name():
+    assert repository_name("https://github.com/org/repo.git/") == "repo"
+    assert repository_name("git@github.com:org/my repo") == "my_repo"
+    assert repository_name("/srv/git/legacy") == "legacy"
+
+
+def test_prefetch_keeps_order_and_limits_concurrency():
+    class Mirrors:
+        def __init__(self):
+            self.running = 0
+            self.peak = 0
+            self.lock = threading.Lock()
+
+        def resolve(self, url):
+            with self.lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            time.sleep(0.01 if url != "r0" else 0.05)
+            with self.lock:
+                self.running -= 1
+            if url == "r3":
+                raise RuntimeError("falhou")
+            return f"/mirrors/{url}"
+
+    mirrors = Mirrors()
+    entries = [BatchEntry(f"r{i}") for i in range(10)]
+    fetched = list(prefetch(entries, mirrors, fetch_jobs=3))
+    assert [entry.url for entry, _, _ in fetched] == [f"r{i}" for i in range(10)]
+    assert fetched[0][1] == "/mirrors/r0" and fetched[0][2] is None
+    assert fetched[3][1] is None and isinstance(fetched[3][2], RuntimeError)
+    assert 1 < mirrors.peak <= 3
+
+
+def test_batch_shares_cache_and_matches_single_analysis(repos, tmp_path):
+    entries = [BatchEntry(path) for path in repos] + [BatchEntry(str(tmp_path / "missing"))]
+    combined = ReportAccumulator()
+    with MetricsCache(str(tmp_path / "cache")) as cache:
+        with patch("analyzer.repo_miner.extract_metrics", wraps=extract_metrics) as extract:
+            results = list(iter_batch(entries, cache=cache, combined=combined))
+
+    # O arquivo vendorizado é igual nos dois repositórios: analisado uma vez
+    assert [call.args[1] for call in extract.call_args_list].count("lib.py") == 1
+    assert [r.entry.name for r in results] == ["alpha", "beta", "missing"]
+    assert [r.ok for r in results] == [True, True, False]
+    for result, path in zip(results, repos):
+        assert result.accumulator.stats() == ReportAccumulator.from_results(analyze_repository(path)).stats()
+    assert combined.count == 6
+
+
+def test_batch_uses_one_pool(repos):
+    entries = [BatchEntry(path) for path in repos]
+    with patch("analyzer.repo_miner.FileAnalysisPool", side_effect=AssertionError):
+        results = list(iter_batch(entries, jobs=2))
+    assert all(r.ok and r.accumulator.count == 3 for r in results)
+
+
+def test_batch_command(repos, tmp_path):
+    manifest = tmp_path / "repos.toml"
+    manifest.write_text("".join(f'[[repos]]\nurl = "{path}"\n' for path in repos))
+    out = tmp_path / "out"
+    result = CliRunner().invoke(cli, ["batch", str(manifest), "--output-dir", str(out),
+                                      "--cache-dir", str(tmp_path / "cache")])
+    assert result.exit_code == 0, result.output
+    assert "[2/2] beta: 3 commits" in result.output
+    assert "Análise em Lote" in result.output
+
+    summary = json.loads((out / "summary.json").read_text())
+    assert [r["name"] for r in summary["repositories"]] == ["alpha", "beta"]
+    assert summary["combined"]["total_commits"] == 6
+    with open(out / "alpha.jsonl") as f:
+        assert len(f.readlines()) == 3
+
+    manifest.write_text(manifest.read_text() + f'[[repos]]\nurl = "{tmp_path / "missing"}"\n')
+    result = CliRunner().invoke(cli, ["batch", str(manifest), "--cache-dir", str(tmp_path / "cache")])
+    assert result.exit_code == 1
+    assert "1 de 3 repositórios falharam" in result.output
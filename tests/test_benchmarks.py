@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from bench_suite import compare_to_baseline  # noqa: E402
+from synthetic_repo import generate_repository, parse_distribution  # noqa: E402
+
+
+def _files_in_head(path):
+    output = subprocess.run(["git", "ls-files"], cwd=path, capture_output=True, text=True).stdout
+    return output.split()
+
+
+def test_synthetic_repository_is_deterministic(tmp_path):
+    first = generate_repository(str(tmp_path / "a"), commits=5, files_per_commit=2, file_lines=30, seed=7)
+    second = generate_repository(str(tmp_path / "b"), commits=5, files_per_commit=2, file_lines=30, seed=7)
+    other = generate_repository(str(tmp_path / "c"), commits=5, files_per_commit=2, file_lines=30, seed=8)
+
+    assert first == second
+    assert first != other
+    count = subprocess.run(["git", "rev-list", "--count", "HEAD"], cwd=tmp_path / "a",
+                           capture_output=True, text=True).stdout.strip()
+    assert count == "5"
+    assert all(name.endswith(".py") for name in _files_in_head(tmp_path / "a"))
+
+
+def test_complexity_distribution_controls_generated_functions(tmp_path):
+    import lizard
+
+    path = tmp_path / "repo"
+    generate_repository(str(path), commits=1, files_per_commit=1, file_lines=100, complexity="7:1")
+    (name,) = _files_in_head(path)
+    analysis = lizard.analyze_file.analyze_source_code(name, (path / name).read_text())
+
+    assert {f.cyclomatic_complexity for f in analysis.function_list} == {7}
+
+
+def test_parse_distribution_rejects_invalid_spec():
+    assert parse_distribution("1:50,5:50") == ([1, 5], [50.0, 50.0])
+    with pytest.raises(ValueError):
+        parse_distribution("0:10")
+
+
+def test_compare_to_baseline_flags_slowdowns():
+    baseline = {"benchmarks": {"a": {"seconds": 1.0}, "b": {"seconds": 2.0}}}
+    current = {"benchmarks": {"a": {"seconds": 1.1}, "b": {"seconds": 3.0}, "c": {"seconds": 1.0}}}
+
+    comparison = compare_to_baseline(current, baseline, max_slowdown=0.2)
+
+    assert [(name, regressed) for name, _, _, _, regressed in comparison] == [("a", False), ("b", True)]
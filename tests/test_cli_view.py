@@ -1,5 +1,7 @@
 from unittest.mock import patch
-from visualizer.cli_view import display_timeline
+from visualizer.cli_view import (
+    display_timeline, table_window, minmax_buckets, _create_metrics_table, _display_evolution_chart
+)
 from datetime import datetime
 
 @patch("visualizer.cli_view.console.print")
@@ -29,4 +31,79 @@ def test_display_timeline(mock_print):
 
     display_timeline(results)
 
-    assert mock_print.call_count > 0
\ No newline at end of file
+    assert mock_print.call_count > 0
+
+@patch("visualizer.cli_view.console.print")
+def test_display_timeline_accepts_generator(mock_print):
+    results = (
+        {
+            "hash": f"abc123{i}",
+            "date": datetime(2025, 1, i + 1),
+            "author": "Developer",
+            "complexity": i,
+            "coupling": 1.0,
+            "maintainability_index": 80.0,
+            "lines_of_code": 10,
+            "code_smells": 0
+        }
+        for i in range(3)
+    )
+
+    display_timeline(results)
+
+    assert mock_print.call_count > 0
+
+
+def _results(count):
+    return [
+        {
+            "hash": f"{i:07x}",
+            "date": datetime(2025, 1, 1),
+            "author": "Developer",
+            "complexity": 50 if i == 777 else i % 10,
+            "coupling": 1.0,
+            "maintainability_index": 80.0,
+            "lines_of_code": 10,
+            "code_smells": 0
+        }
+        for i in range(count)
+    ]
+
+
+def test_table_window():
+    assert table_window(10, limit=40) == [(0, 10)]
+    assert table_window(100, limit=10) == [(0, 5), (95, 100)]
+    assert table_window(100, page=3, limit=10) == [(20, 30)]
+    # Páginas além da última mostram a última
+    assert table_window(95, page=50, limit=10) == [(90, 95)]
+
+
+def test_metrics_table_renders_only_the_window():
+    table = _create_metrics_table(_results(5000), limit=20)
+    # 20 commits mais a linha de omitidos
+    assert table.row_count == 21
+    assert "20 de 5000" in table.title
+
+    page = _create_metrics_table(_results(5000), page=2, limit=20)
+    assert page.row_count == 1 + 20 + 1
+    assert "página 2 de 250" in page.title
+
+
+def test_minmax_buckets_keep_spikes():
+    values = [1] * 1000
+    values[777] = 99
+    buckets = minmax_buckets(values, 10)
+
+    assert len(buckets) == 10
+    assert buckets[0][0] == 0 and buckets[-1][1] == 1000
+    assert max(high for _, _, _, high in buckets) == 99
+    assert minmax_buckets([3, 4], 10) == [(0, 1, 3, 3), (1, 2, 4, 4)]
+
+
+@patch("visualizer.cli_view.console.print")
+def test_evolution_chart_fits_height(mock_print):
+    _display_evolution_chart(_results(5000), height=12)
+
+    lines = [call.args[0] for call in mock_print.call_args_list]
+    assert len(lines) == 1 + 12
+    assert any(line.endswith("–50") for line in lines)
@@ -0,0 +1,129 @@
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from analyzer.clone_detector import CloneIndex, fingerprint, iter_snapshot_clones, normalize_tokens
+from main import cli
+
+BODY = '''def process(items, limit):
+    total = 0
+    for item in items:
+        if item.value > limit:
+            total += item.value * 2
+        elif item.value < 0:
+            total -= abs(item.value)
+        else:
+            total += 1
+    result = {"total": total, "count": len(items)}
+    return result
+'''
+# Mesma função com nomes e literais trocados e um comentário a mais
+RENAMED = BODY.replace("items", "rows").replace("total", "acc").replace("* 2", "* 3").replace(
+    "    return", "    # resultado\n    return")
+OTHER = '''class Config:
+    def __init__(self, path):
+        self.path = path
+        self.values = {}
+
+    def load(self):
+        with open(self.path) as f:
+            for line in f:
+                key, _, value = line.partition("=")
+                self.values[key.strip()] = value.strip()
+        return self.values
+'''
+
+
+def test_normalization_ignores_names_literals_and_comments():
+    assert normalize_tokens(BODY)[0] == normalize_tokens(RENAMED.replace("    # resultado\n", ""))[0]
+    assert normalize_tokens("x = 'a # b'  # c\n")[0] == normalize_tokens("y = \"z\"\n")[0]
+    assert fingerprint("x = 1\n") == []
+
+
+def test_token_memo_belongs_to_index_and_is_capped():
+    index = CloneIndex()
+    with patch("analyzer.clone_detector.MAX_TOKEN_MEMO", 5):
+        index.add("a.py", "blob-a", BODY)
+    assert len(index._token_ids) == 5
+    assert not CloneIndex()._token_ids
+
+    memo = {}
+    assert fingerprint(BODY, memo=memo) == fingerprint(BODY)
+    assert memo and not any(text[-1] in "'\"" for text in memo)
+
+
+def test_fingerprints_of_renamed_copy_match():
+    a = {h for h, _, _ in fingerprint(BODY)}
+    b = {h for h, _, _ in fingerprint(RENAMED)}
+    c = {h for h, _, _ in fingerprint(OTHER)}
+
+    assert a and a & b
+    assert not a & c
+
+
+def test_index_tracks_duplication_incrementally():
+    index = CloneIndex()
+    index.add("a.py", "blob-a", BODY)
+    index.add("c.py", "blob-c", OTHER)
+    assert index.duplicated == 0
+
+    index.add("b.py", "blob-b", "import os\n\n" + RENAMED)
+    assert index.duplicated > 0
+    assert 0 < index.duplication_ratio < 1
+    [pair] = index.clone_pairs()
+    assert (pair.path_a, pair.path_b) == ("a.py", "b.py")
+    # A cópia começa duas linhas depois
+    assert pair.lines_b[0][0] == pair.lines_a[0][0] + 2
+    assert index.pairs_count() == 1
+
+    # Removendo a cópia volta ao estado anterior
+    total = index.total
+    index.remove("b.py")
+    assert (index.duplicated, index.pairs_count()) == (0, 0)
+    assert index.total < total
+    assert not index.has_blob("blob-b")
+
+
+def test_pairs_count_is_kept_across_adds_and_removes(monkeypatch):
+    # Com no máximo 3 caminhos por hash, a 4ª cópia tira os pares do hash
+    monkeypatch.setattr("analyzer.clone_detector.MAX_FANOUT", 3)
+    index = CloneIndex()
+    steps = [("add", "a.py", BODY), ("add", "b.py", RENAMED), ("add", "c.py", OTHER),
+             ("add", "d.py", BODY), ("add", "e.py", BODY + OTHER), ("remove", "d.py", None),
+             ("add", "b.py", OTHER), ("remove", "a.py", None), ("remove", "e.py", None)]
+    for action, path, source in steps:
+        if action == "add":
+            index.add(path, f"blob-{path}-{hash(source)}", source)
+        else:
+            index.remove(path)
+        assert index.pairs_count() == len(index.clone_pairs())
+
+
+def test_same_blob_in_two_paths_shares_fingerprints():
+    index = CloneIndex()
+    index.add("a.py", "blob", BODY)
+    index.add("copy/a.py", "blob")
+
+    assert index.duplication_ratio == 1.0
+    assert len(index._blobs) == 1
+    with pytest.raises(ValueError):
+        index.add("x.py", "unknown")
+
+
+def test_snapshot_clones_follow_history(make_repo):
+    repo = make_repo()
+    repo.commit("c1", {"a.py": BODY, "c.py": OTHER})
+    repo.commit("c2", {"b.py": RENAMED})
+    repo.commit("c3", removed=["b.py"])
+
+    index = CloneIndex()
+    rows = list(iter_snapshot_clones(repo.path, index=index))
+
+    assert [r["files"] for r in rows] == [2, 3, 2]
+    assert [r["clone_pairs"] for r in rows] == [0, 1, 0]
+    assert rows[1]["duplication_ratio"] > 0 and rows[2]["duplicated"] == 0
+
+    result = CliRunner().invoke(cli, ["clones", repo.path])
+    assert result.exit_code == 0, result.output
+    assert "Nenhum par de clones" in result.output
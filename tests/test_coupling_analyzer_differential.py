@@ -0,0 +1,66 @@
+import glob
+import os
+import random
+import re
+
+import pytest
+
+import legacy_analyzers as legacy
+from analyzer.coupling_analyzer import analyze_coupling
+from analyzer.parsed_source import ParsedSource
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+EDGE_CASES = [
+    "",
+    "import os\nimport numpy as np\nfrom flask import Flask\n",
+    "\n\n  import requests\n\tfrom django.db import models\n",
+    "import\nimport os\n",
+    "from x importlib\n",
+    "a.b.c()\nobj.method ()\nobj.method\n(1)\n1.5.real()\n",
+    "class class Foo: pass\nsubclass Bar\ndef undef x\n",
+    "def foo():\n    foo()\n    foo ()\nclass K:\n    pass\nK()\nK()\n",
+    "\n".join(f"import lib_{i}" for i in range(50)),
+]
+
+FRAGMENTS = [
+    "x", "os", "np", "import", "from", "importlib", "class", "def", "subclass", "_p",
+    " ", "  ", "\t", "\n", "\n  ", ".", "(", ")", ":", "=", "#", "\r\n", "\x0c", "é",
+]
+
+
+def _corpus():
+    files = glob.glob(os.path.join(ROOT, "src", "**", "*.py"), recursive=True)
+    files += glob.glob(os.path.join(ROOT, "tests", "*.py"))
+    sources = [open(f, encoding="utf-8").read() for f in files]
+
+    rng = random.Random(4321)
+    for _ in range(500):
+        sources.append("".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 60))))
+
+    return EDGE_CASES + sources
+
+
+def _legacy_imports(source_code):
+    imports = set()
+    for pattern in (r'^import\s+(\w+)', r'^from\s+(\w+)\s+import',
+                    r'^\s+import\s+(\w+)', r'^\s+from\s+(\w+)\s+import'):
+        imports.update(re.findall(pattern, source_code, re.MULTILINE))
+    return imports
+
+
+@pytest.mark.parametrize("source_code", _corpus())
+def test_parsed_source_matches_legacy_regexes(source_code):
+    parsed = ParsedSource(source_code, analysis=False)
+
+    assert parsed.imported_modules == _legacy_imports(source_code)
+    assert parsed.cross_references == len(re.findall(r'(\w+)\.(\w+)\s*\(', source_code))
+    assert parsed.definitions == (set(re.findall(r'class\s+(\w+)', source_code))
+                                | set(re.findall(r'def\s+(\w+)', source_code)))
+    for item in parsed.definitions:
+        assert parsed.calls[item] == len(re.findall(rf'\b{item}\s*\(', source_code))
+
+
+@pytest.mark.parametrize("source_code", _corpus())
+def test_score_matches_legacy(source_code):
+    assert analyze_coupling(source_code) == legacy.analyze_coupling(source_code)
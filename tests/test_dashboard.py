@@ -0,0 +1,103 @@
+import io
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from rich.console import Console
+
+from analyzer.repo_miner import count_commits, iter_repository_metrics
+from visualizer.dashboard import LiveDashboard
+
+MODULE = "def f{i}(x):\n    if x:\n        return {i}\n    return x\n"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _result(i):
+    return {
+        "hash": f"{i:07x}", "date": datetime(2025, 1, 1 + i), "author": "Dev", "complexity": i,
+        "coupling": 1.0, "maintainability_index": 80.0, "lines_of_code": 10, "code_smells": 0,
+        "functions_count": 1, "avg_function_length": 3.0, "files_modified": 1
+    }
+
+
+@pytest.fixture
+def repo(make_repo):
+    repo = make_repo()
+    for i in range(6):
+        # Commits ímpares só alteram um arquivo de texto
+        repo.commit(f"c{i}", {"notes.txt" if i % 2 else f"m{i}.py": MODULE.format(i=i)})
+    return repo.path
+
+
+def test_rates_and_eta():
+    clock = FakeClock()
+    dashboard = LiveDashboard(console=Console(file=io.StringIO()), clock=clock)
+    dashboard.start(total=100, done=20)
+    for i in range(10):
+        dashboard.advance(_result(i) if i % 2 else None, files=3)
+    clock.now = 5.0
+
+    commits_rate, files_rate, eta = dashboard.rates()
+    assert (commits_rate, files_rate) == (2.0, 6.0)
+    assert eta == 35.0
+    assert dashboard.aggregates.count == 5
+    assert [r["hash"] for r in dashboard.latest][-1] == _result(9)["hash"]
+
+
+def test_plain_log_lines_are_throttled_when_not_a_terminal():
+    clock = FakeClock()
+    out = io.StringIO()
+    dashboard = LiveDashboard(console=Console(file=out, width=200), log_seconds=10, clock=clock)
+    dashboard.start(total=None)
+    for i in range(1000):
+        clock.now = i * 0.05
+        dashboard.advance(_result(i % 20), files=1)
+    dashboard.close()
+
+    lines = out.getvalue().splitlines()
+    # Uma linha a cada 10 s de análise (quase 50 s no total) mais a linha final
+    assert len(lines) == 4 + 1
+    assert lines[-1].startswith("[00:49] 1000 commits |")
+    assert "\x1b[" not in out.getvalue()
+
+
+def test_live_panel_renders_on_a_terminal():
+    out = io.StringIO()
+    cache = SimpleNamespace(hits=3, misses=1)
+    dashboard = LiveDashboard(cache, console=Console(file=out, force_terminal=True, width=120), refresh_seconds=0)
+    dashboard.start(total=4)
+    dashboard.advance(_result(1), files=2)
+    dashboard.close()
+
+    assert "Últimos commits" in out.getvalue()
+    assert "cache 75%" in out.getvalue()
+
+
+def test_iter_repository_metrics_reports_progress(repo):
+    events = []
+
+    class Recorder:
+        def start(self, total, done):
+            events.append(("start", total, done))
+
+        def restore(self, result):
+            events.append(("restore",))
+
+        def advance(self, result, files):
+            events.append(("advance", result is not None, files))
+
+    results = list(iter_repository_metrics(repo, progress=Recorder()))
+
+    assert count_commits(repo) == 6
+    assert count_commits(os.path.join(repo, "missing")) is None
+    assert events[0] == ("start", 6, 0)
+    assert events[1:] == [("advance", i % 2 == 0, 1 - i % 2) for i in range(6)]
+    assert len(results) == 3
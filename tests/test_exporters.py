@@ -0,0 +1,150 @@
+import csv
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from click.testing import CliRunner
+
+from analyzer.exporters import ResultExporter, detect_format, FILE_KEYS
+from analyzer.metrics_table import KEYS
+from analyzer.repo_miner import analyze_repository, iter_repository_metrics
+from main import cli
+
+MODULE = "import os\ndef f{i}(x):\n    if x:\n        return x + {i}\n    return os.sep\n"
+
+
+@pytest.fixture
+def repo(make_repo):
+    """5 commits, cada um adicionando um módulo Python."""
+    repo = make_repo()
+    for i in range(5):
+        repo.commit(f"c{i}", {f"m{i}.py": MODULE.format(i=i)}, date=f"2025-01-{i + 1:02d}T10:00:00+02:00")
+    return repo.path
+
+
+def _result(i):
+    return {
+        "hash": f"{i:07x}", "date": datetime(2025, 1, 1, tzinfo=timezone(timedelta(hours=-3))) + timedelta(days=i),
+        "author": "Dev", "complexity": i, "coupling": 0.5, "maintainability_index": 90.0,
+        "lines_of_code": 10 * i, "code_smells": 0, "functions_count": 1, "avg_function_length": 2.0,
+        "files_modified": 1
+    }
+
+
+def test_detect_format():
+    assert detect_format("out.JSONL") == "jsonl"
+    assert detect_format("out.ndjson") == "jsonl"
+    assert detect_format("out.txt", "csv") == "csv"
+    with pytest.raises(ValueError):
+        detect_format("out.txt")
+
+
+def test_jsonl_and_csv_rows_match_analysis(repo, tmp_path):
+    expected = analyze_repository(repo)
+
+    for name in ("commits.jsonl", "commits.csv"):
+        path = str(tmp_path / name)
+        with ResultExporter(path) as exporter:
+            for _ in iter_repository_metrics(repo, on_commit=exporter.write):
+                pass
+
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f] if name.endswith(".jsonl") else list(csv.DictReader(f))
+        assert [row["hash"] for row in rows] == [r["hash"] for r in expected]
+        assert list(rows[0]) == list(KEYS)
+        assert rows[0]["date"] == expected[0]["date"].isoformat()
+        assert int(rows[-1]["complexity"]) == expected[-1]["complexity"]
+
+
+def test_files_output_has_one_row_per_python_file(repo, tmp_path):
+    files_path = str(tmp_path / "files.jsonl")
+    with ResultExporter(str(tmp_path / "commits.jsonl"), files_path=files_path) as exporter:
+        for _ in iter_repository_metrics(repo, on_commit=exporter.write):
+            pass
+
+    with open(files_path, encoding="utf-8") as f:
+        rows = [json.loads(line) for line in f]
+    assert exporter.commits_written == 5
+    assert exporter.files_written == len(rows) == 5
+    assert list(rows[0]) == list(FILE_KEYS)
+    assert [row["path"] for row in rows] == [f"m{i}.py" for i in range(5)]
+
+
+def test_file_rows_are_keyed_by_repository_path(make_repo, tmp_path):
+    repo = make_repo()
+    repo.commit("pacotes", {"a/__init__.py": MODULE.format(i=1), "b/__init__.py": MODULE.format(i=2)})
+    files_path = str(tmp_path / "files.csv")
+    with ResultExporter(str(tmp_path / "commits.csv"), files_path=files_path) as exporter:
+        for _ in iter_repository_metrics(repo.path, on_commit=exporter.write):
+            pass
+
+    with open(files_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert sorted((row["path"], row["filename"]) for row in rows) == [
+        ("a/__init__.py", "__init__.py"), ("b/__init__.py", "__init__.py")
+    ]
+
+
+def test_resumed_results_are_written_without_file_rows(tmp_path):
+    with ResultExporter(str(tmp_path / "c.csv"), files_path=str(tmp_path / "f.csv")) as exporter:
+        exporter.write(_result(1))
+    assert (exporter.commits_written, exporter.files_written) == (1, 0)
+
+
+def test_parquet_is_written_in_row_groups(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "commits.parquet")
+
+    with ResultExporter(path, row_group_size=4) as exporter:
+        for i in range(10):
+            exporter.write(_result(i))
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column_names == list(KEYS)
+    assert table.column("complexity").to_pylist() == list(range(10))
+    assert table.column("date")[0].as_py() == _result(0)["date"]
+
+
+def test_export_command(repo, tmp_path):
+    output = tmp_path / "commits.csv"
+    files_output = tmp_path / "files.csv"
+
+    result = CliRunner().invoke(cli, [
+        "export", repo, "-o", str(output), "--files-output", str(files_output),
+        "--cache-dir", str(tmp_path / "cache")
+    ])
+
+    assert result.exit_code == 0, result.output
+    assert "5 commits gravados" in result.output
+    assert len(output.read_text().splitlines()) == 6
+    assert len(files_output.read_text().splitlines()) == 6
+
+
+def test_files_output_keeps_the_saved_state(repo, tmp_path):
+    cache_dir = tmp_path / "cache"
+    runner = CliRunner()
+    result = runner.invoke(cli, ["export", repo, "-o", str(tmp_path / "a.jsonl"), "--cache-dir", str(cache_dir)])
+    assert result.exit_code == 0, result.output
+    state_files = sorted(os.listdir(cache_dir / "runs"))
+    saved = [(cache_dir / "runs" / name).read_bytes() for name in state_files]
+
+    result = runner.invoke(cli, ["export", repo, "-o", str(tmp_path / "b.jsonl"),
+                                 "--files-output", str(tmp_path / "files.jsonl"), "--cache-dir", str(cache_dir)])
+    assert result.exit_code == 0, result.output
+    assert "5 commits gravados" in result.output
+    # O histórico é percorrido de novo, mas o estado salvo fica intacto
+    assert [(cache_dir / "runs" / name).read_bytes() for name in state_files] == saved
+
+
+def test_export_rejects_unknown_extension(repo, tmp_path):
+    result = CliRunner().invoke(cli, ["export", repo, "-o", str(tmp_path / "out.txt")])
+    assert result.exit_code != 0
+    assert "extensão" in result.output
+
+
+def test_analyze_output_rejects_shard(tmp_path):
+    result = CliRunner().invoke(cli, ["analyze", "repo", "--shard", "1/2", "-o", str(tmp_path / "a.jsonl")])
+    assert result.exit_code != 0
@@ -0,0 +1,125 @@
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from analyzer.function_index import FunctionIndex, update_function_index
+from analyzer.metrics_cache import MetricsCache
+from analyzer.metrics_extractor import FUNCTION_FIELDS, extract_metrics
+from analyzer.path_filter import PathFilter
+from main import cli
+
+SIMPLE = "def f(x):\n    return x\n\ndef g(y):\n    return y\n"
+BRANCHY = "def f(x):\n    if x:\n        return 1\n    if x > 2:\n        return 2\n    return x\n"
+
+
+def _commit(repo, files, day, removed=()):
+    repo.commit(f"dia {day}", files, date=f"2025-01-{day:02d}T10:00:00", removed=removed)
+
+
+@pytest.fixture
+def git_repo(make_repo):
+    """
+    f cresce em a.py; g é movida para b.py (dentro de uma classe e com outro
+    nome), b.py é renomeado para c.py e só depois g2 cresce; h nasce e some.
+    """
+    repo = make_repo()
+    _commit(repo, {"a.py": SIMPLE}, 1)
+    _commit(repo, {"a.py": BRANCHY + "\ndef g(y):\n    return y\n"}, 2)
+    _commit(repo, {"a.py": BRANCHY, "b.py": "class K:\n    def g2(self, y):\n        return y\n"}, 3)
+    repo.git("mv", "b.py", "c.py")
+    _commit(repo, {}, 4)
+    _commit(repo, {"c.py": "class K:\n    def g2(self, y):\n        if y:\n            return 0\n        return y\n"}, 5)
+    _commit(repo, {"d.py": "def h(z):\n    for i in z:\n        if i:\n            return i\n"}, 6)
+    _commit(repo, {}, 7, removed=["d.py"])
+    return repo
+
+
+@pytest.fixture
+def repo(git_repo):
+    return git_repo.path
+
+
+def test_extract_metrics_lists_functions():
+    functions = extract_metrics(BRANCHY + "\nclass K:\n    def g(self, y, z=1):\n        return y\n", "m.py")["functions"]
+    records = [dict(zip(FUNCTION_FIELDS, f)) for f in functions]
+    assert [(r["name"], r["start_line"], r["cyclomatic_complexity"], r["parameters"]) for r in records] == [
+        ("f", 1, 3, 1), ("g", 9, 1, 3)
+    ]
+    # Indentação e nome não mudam a impressão digital do corpo
+    moved = extract_metrics("def other(x):\n  if x:\n    return 1\n  if x > 2:\n    return 2\n  return x\n", "n.py")
+    assert moved["functions"][0][5] == records[0]["fingerprint"]
+    assert records[1]["fingerprint"] != records[0]["fingerprint"]
+
+
+@pytest.mark.parametrize("backend", ["pydriller", "native"])
+def test_index_follows_moved_functions(repo, tmp_path, backend):
+    with FunctionIndex(str(tmp_path / "cache")) as index:
+        assert index.top_growth(repo) is None
+        assert update_function_index(repo, index, backend=backend) == 7
+
+        rows = index.top_growth(repo)
+        assert [(r["file"], r["function"], r["start_complexity"], r["complexity"], r["versions"]) for r in rows] == [
+            ("a.py", "f", 1, 3, 3), ("c.py", "g2", 1, 2, 4)
+        ]
+        # A partir do dia 3, f não cresceu e g2 tem as versões de b.py e de c.py
+        rows = index.top_growth(repo, since="2025-01-03")
+        assert [(r["function"], r["growth"], r["versions"]) for r in rows] == [("g2", 1, 2), ("f", 0, 1)]
+        # h existia no fim deste período
+        rows = index.top_growth(repo, since="2025-01-06", until="2025-01-06T12:00:00", limit=1)
+        assert [(r["function"], r["complexity"]) for r in rows] == [("h", 3)]
+        assert [v["complexity"] for v in index.history(repo, "a.py", "f")] == [1, 3, 3]
+
+
+def test_index_is_incremental(git_repo, repo, tmp_path):
+    with MetricsCache(str(tmp_path / "cache")) as cache, FunctionIndex(str(tmp_path / "cache")) as index:
+        update_function_index(repo, index, cache=cache)
+        assert update_function_index(repo, index, cache=cache) == 0
+
+        _commit(git_repo, {"a.py": BRANCHY.replace("return x\n", "while x:\n        x -= 1\n    return x\n")}, 8)
+        with patch("analyzer.repo_miner.analyze_files", wraps=lambda files, *a: [
+            extract_metrics(source, name) for name, source in files
+        ]) as analyze:
+            assert update_function_index(repo, index, cache=cache) == 1
+        assert analyze.call_count == 1
+        assert index.top_growth(repo, since="2025-01-08")[0]["growth"] == 1
+        assert update_function_index(repo, index, cache=cache, fresh=True) == 8
+
+    # Filtros diferentes têm índices separados
+    with FunctionIndex(str(tmp_path / "cache")) as index:
+        only_a = PathFilter(include=["a.py"])
+        assert index.top_growth(repo, paths=only_a.key()) is None
+        update_function_index(repo, index, path_filter=only_a)
+        assert {r["file"] for r in index.top_growth(repo, paths=only_a.key())} == {"a.py"}
+
+
+def test_interrupted_index_resumes_from_checkpoint(repo, tmp_path):
+    with FunctionIndex(str(tmp_path)) as index:
+        with patch("analyzer.function_index._function_changes", side_effect=RuntimeError("falhou")):
+            with pytest.raises(RuntimeError):
+                update_function_index(repo, index)
+    with FunctionIndex(str(tmp_path)) as index:
+        assert not index.repository(repo).resumed
+        assert update_function_index(repo, index) == 7
+        assert len(index.history(repo, "a.py", "f")) == 3
+
+
+def test_functions_commands(repo, tmp_path):
+    runner = CliRunner()
+    cache_dir = str(tmp_path / "cache")
+    result = runner.invoke(cli, ["functions", "top", repo, "--cache-dir", cache_dir])
+    assert result.exit_code == 1
+    assert "não indexado" in result.output
+
+    result = runner.invoke(cli, ["functions", "index", repo, "--backend", "native", "--cache-dir", cache_dir])
+    assert result.exit_code == 0, result.output
+    assert "7 commits indexados" in result.output
+
+    result = runner.invoke(cli, ["functions", "top", repo, "--since", "2025-01-03", "-k", "1",
+                                 "--cache-dir", cache_dir])
+    assert result.exit_code == 0, result.output
+    assert "g2" in result.output and "+1" in result.output
+    assert " f " not in result.output
+
+    result = runner.invoke(cli, ["functions", "history", repo, "c.py", "g2", "--cache-dir", cache_dir])
+    assert result.output.count("CC ") == 1
@@ -0,0 +1,136 @@
+import os
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from pydriller import Repository
+
+from analyzer.git_backend import BlobReader, NativeRepository
+from analyzer.repo_miner import _python_sources, analyze_repository
+from analyzer.run_state import RunState
+
+MODULE = "def f{i}(x):\n    if x > {i}:\n        return x\n    return {i}\n"
+
+
+@pytest.fixture
+def repo(make_repo):
+    """Commit inicial, alteração, remoção, renomeação, permissão, subdiretório e merge."""
+    repo = make_repo("repo", "-b", "main", author="Dév")
+    repo.commit("inicial", {"a.py": MODULE.format(i=1), "b.py": MODULE.format(i=2), "notes.txt": "x"},
+                date="2025-01-01T10:00:00+03:00")
+
+    repo.write({"a.py": MODULE.format(i=3) + "# çã\n"})
+    os.makedirs(os.path.join(repo.path, "pkg"))
+    with open(os.path.join(repo.path, "pkg", "c.py"), "wb") as f:
+        f.write(MODULE.format(i=4).encode() + b"# \xff\n")
+    repo.commit("altera", date="2025-01-02T10:00:00-05:00")
+
+    repo.git("checkout", "-qb", "feature")
+    repo.commit("feature", {"d.py": MODULE.format(i=5)}, date="2025-01-03T10:00:00")
+
+    repo.git("checkout", "-q", "main")
+    repo.git("rm", "-q", "b.py")
+    repo.git("mv", "pkg/c.py", "pkg/e.py")
+    os.chmod(os.path.join(repo.path, "a.py"), 0o755)
+    repo.commit("remove e renomeia", date="2025-01-04T10:00:00")
+    repo.git("merge", "-q", "--no-ff", "-m", "merge", "feature", date="2025-01-05T10:00:00")
+
+    repo.commit("depois do merge", {"d.py": MODULE.format(i=6)}, date="2025-01-06T10:00:00")
+    return repo.path
+
+
+def _summary(commits):
+    return [
+        (c.hash, c.committer_date, c.author.name, sorted(_python_sources(c)))
+        for c in commits
+    ]
+
+
+def test_native_commits_match_pydriller(repo):
+    expected = _summary(Repository(repo).traverse_commits())
+    native = _summary(NativeRepository(repo).traverse_commits())
+    assert native == expected
+    assert len(native) == 6
+    # Merge sem arquivos; o commit inicial traz todos os arquivos Python
+    assert native[4][3] == []
+    assert [path for path, _, _ in native[0][3]] == ["a.py", "b.py"]
+
+
+def test_native_dates_and_removed_files(repo):
+    commits = list(NativeRepository(repo).traverse_commits())
+    assert commits[0].committer_date.utcoffset().total_seconds() == 3 * 3600
+    removed = [m for m in commits[3].modified_files if m.new_path is None]
+    assert [m.filename for m in removed] == ["b.py"]
+    assert all(m.source_code is None for m in removed)
+
+    # Renomeação exata: uma alteração do caminho antigo para o novo, como no PyDriller
+    expected = list(Repository(repo).traverse_commits())[3].modified_files
+    assert (sorted((m.old_path, m.new_path) for m in commits[3].modified_files)
+            == sorted((m.old_path, m.new_path) for m in expected))
+
+
+def test_native_filters_and_resume_match_pydriller(repo, git):
+    since, to = datetime(2025, 1, 3), datetime(2025, 1, 5, 12)
+    assert (_summary(NativeRepository(repo, since=since, to=to).traverse_commits())
+            == _summary(Repository(repo, since=since, to=to).traverse_commits()))
+
+    third = git(repo, "rev-parse", "HEAD~2")
+    assert (_summary(NativeRepository(repo, from_commit=third).traverse_commits())
+            == _summary(Repository(repo, from_commit=third).traverse_commits()))
+
+    with pytest.raises(ValueError):
+        next(NativeRepository(repo, from_commit="0" * 40).traverse_commits())
+
+
+def test_native_backend_gives_the_same_results(repo, tmp_path, git):
+    expected = analyze_repository(repo)
+    # O PyDriller não pode ser usado pelo backend nativo
+    with patch("analyzer.repo_miner.Repository", side_effect=AssertionError):
+        assert analyze_repository(repo, backend="native") == expected
+        first = analyze_repository(repo, state=RunState(str(tmp_path / "state"), repo), backend="native")
+
+    with open(os.path.join(repo, "g.py"), "w") as f:
+        f.write(MODULE.format(i=7))
+    git(repo, "add", ".")
+    git(repo, "commit", "-qm", "novo", date="2025-01-07T10:00:00")
+    with patch("analyzer.repo_miner.Repository", side_effect=AssertionError):
+        resumed = analyze_repository(repo, state=RunState(str(tmp_path / "state"), repo), backend="native")
+    assert len(resumed) == len(first) + 1
+    assert resumed == analyze_repository(repo)
+
+
+def test_native_detects_renames_with_edits_like_pydriller(make_repo):
+    repo = make_repo()
+    body = "".join(MODULE.format(i=i) for i in range(10))
+    repo.commit("inicial", {"old.py": body, "outro.py": MODULE.format(i=1)})
+    repo.git("mv", "old.py", "pkg_new.py")
+    repo.commit("renomeia e altera", {"pkg_new.py": body + "x = 1\n"})
+
+    def changes(commit):
+        return sorted((m.old_path, m.new_path, m.source_code, m.added_lines, m.deleted_lines)
+                      for m in commit.modified_files)
+
+    # O conteúdo só pode ser lido durante a travessia
+    expected = [changes(c) for c in Repository(repo.path).traverse_commits()][-1]
+    native = [changes(c) for c in NativeRepository(repo.path, numstat=True).traverse_commits()][-1]
+    assert native == expected
+    assert [(old, new) for old, new, *_ in native] == [("old.py", "pkg_new.py")]
+
+
+def test_native_backend_requires_a_local_path(make_repo):
+    with pytest.raises(ValueError):
+        NativeRepository("https://example.com/repo.git")
+    assert list(NativeRepository(make_repo("empty").path).traverse_commits()) == []
+
+
+def test_blob_reader_reuses_one_process(repo, git):
+    blob = git(repo, "rev-parse", "HEAD:a.py")
+    reader = BlobReader(repo)
+    try:
+        process = reader._process
+        assert reader.read(blob).startswith(b"def f3")
+        assert reader.read("0" * 40) is None
+        assert reader.read(blob) == reader.read(blob)
+        assert reader._process is process
+    finally:
+        reader.close()
@@ -0,0 +1,105 @@
+import os
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from click.testing import CliRunner
+
+from analyzer.hotspots import HotspotTracker, iter_hotspots
+from analyzer.path_filter import PathFilter
+from analyzer.repo_miner import FileChange, iter_file_changes
+from main import cli
+
+MODULE = "def f{i}(x):\n    if x > {i}:\n        return x\n    return {i}\n"
+
+
+def _commit(repo, files, day):
+    repo.commit(f"dia {day}", files, date=f"2025-01-{day:02d}T10:00:00")
+
+
+@pytest.fixture
+def repo(make_repo):
+    """core.py muda todo dia e fica mais complexo; util.py é renomeado e old.py removido."""
+    repo = make_repo()
+    _commit(repo, {"app/core.py": MODULE.format(i=0), "util.py": MODULE.format(i=1),
+                   "old.py": MODULE.format(i=2), "README.md": "x"}, 1)
+    for day in range(2, 6):
+        _commit(repo, {"app/core.py": "".join(MODULE.format(i=i) for i in range(day))}, day)
+    repo.git("mv", "util.py", "app/util.py")
+    repo.git("rm", "-q", "old.py")
+    _commit(repo, {}, 6)
+    _commit(repo, {"app/util.py": MODULE.format(i=1) + MODULE.format(i=9)}, 7)
+    return repo.path
+
+
+def _change(old_path, new_path, source="x", added=1, deleted=0, complexity=1):
+    change = FileChange(old_path, new_path, os.path.basename(new_path or old_path), source, added, deleted)
+    if source:
+        change.metrics = {'cyclomatic_complexity': complexity, 'code_smells': 0, 'lines_of_code': 10}
+    return change
+
+
+def _commit_stub(day):
+    return SimpleNamespace(hash=f"{day:040x}", committer_date=datetime(2025, 1, day))
+
+
+def test_tracker_updates_only_changed_files():
+    tracker = HotspotTracker()
+    tracker.update(_commit_stub(1), [_change(None, "a.py", added=10, complexity=5), _change(None, "b.py")])
+    tracker.update(_commit_stub(2), [_change("a.py", "a.py", added=2, deleted=3, complexity=7)])
+    # Renomeação sem conteúdo leva o histórico; remoção tira do ranking
+    tracker.update(_commit_stub(3), [_change("a.py", "src/a.py", source=None), _change("b.py", None, source=None)])
+
+    [a] = tracker.ranking()
+    assert (a["path"], a["commits"], a["churn"], a["complexity"], a["score"]) == ("src/a.py", 2, 15, 7, 14)
+    assert a["last_modified"] == datetime(2025, 1, 2)
+    assert tracker.commits == 3
+
+    tracker.update(_commit_stub(4), [_change(None, "c.py", added=100, complexity=1)])
+    assert [f["path"] for f in tracker.ranking(sort="churn")] == ["c.py", "src/a.py"]
+    assert [f["path"] for f in tracker.ranking(1)] == ["src/a.py"]
+    with pytest.raises(ValueError):
+        tracker.ranking(sort="size")
+
+
+def test_line_counts_match_between_backends(repo):
+    def summary(backend):
+        return [
+            [(c.old_path, c.new_path, c.added_lines, c.deleted_lines, bool(c.source_code)) for c in changes]
+            for _, changes in iter_file_changes(repo, backend=backend, line_counts=True)
+        ]
+
+    expected = summary("pydriller")
+    assert summary("native") == expected
+    assert sorted(expected[5]) == [("old.py", None, 0, 4, False), ("util.py", "app/util.py", 0, 0, False)]
+
+
+@pytest.mark.parametrize("backend", ["pydriller", "native"])
+def test_iter_hotspots_ranks_at_each_point(repo, backend):
+    rankings = list(iter_hotspots(repo, at=["2025-01-03T12:00:00"], backend=backend))
+    assert [point for point, _, _ in rankings] == [datetime(2025, 1, 3, 12), None]
+
+    early = {f["path"]: (f["commits"], f["complexity"]) for f in rankings[0][2]}
+    assert early == {"app/core.py": (3, 6), "util.py": (1, 2), "old.py": (1, 2)}
+
+    final = rankings[1][2]
+    assert [(f["path"], f["commits"], f["complexity"]) for f in final] == [
+        ("app/core.py", 5, 10), ("app/util.py", 2, 4)
+    ]
+    assert final[1]["added_lines"] == 8
+
+    filtered = list(iter_hotspots(repo, since="2025-01-04", backend=backend,
+                                  path_filter=PathFilter(exclude=["util.py"])))
+    assert [(f["path"], f["commits"]) for f in filtered[-1][2]] == [("app/core.py", 2)]
+
+
+def test_hotspots_command(repo, tmp_path):
+    result = CliRunner().invoke(cli, ["hotspots", repo, "--at", "2025-01-02", "--top", "1",
+                                      "--cache-dir", str(tmp_path / "cache")])
+    assert result.exit_code == 0, result.output
+    assert "Hotspots em 2025-01-02" in result.output
+    assert "Hotspots ao final do período" in result.output
+    assert "app/core.py" in result.output and "app/util.py" not in result.output
+
+    result = CliRunner().invoke(cli, ["hotspots", repo, "--at", "ontem", "--no-cache"])
+    assert result.exit_code == 2
@@ -25,5 +25,18 @@ def test_main_cli_analyze(mock_analyze, mock_display):
     result = runner.invoke(cli, ["analyze", "https://repo.com"])
 
     assert result.exit_code == 0
-    mock_analyze.assert_called_once_with("https://repo.com", None, None)
-    mock_display.assert_called_once_with(mock_analyze.return_value)
+    mock_analyze.assert_called_once()
+    assert mock_analyze.call_args.args == ("https://repo.com", None, None)
+    mock_display.assert_called_once_with(mock_analyze.return_value, page=None, limit=40)
+
+
+@patch("main.display_timeline")
+@patch("main.analyze_repository")
+def test_main_cli_analyze_no_cache(mock_analyze, mock_display):
+    mock_analyze.return_value = []
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["analyze", "https://repo.com", "--no-cache"])
+
+    assert result.exit_code == 0
+    assert mock_analyze.call_args.kwargs["cache"] is None
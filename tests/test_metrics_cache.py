@@ -0,0 +1,59 @@
+from analyzer.metrics_cache import MetricsCache, blob_sha
+
+METRICS = {
+    'cyclomatic_complexity': 3,
+    'coupling': 1.5,
+    'maintainability_index': 80.0,
+    'lines_of_code': 20,
+    'code_smells': 1,
+    'functions_count': 2,
+    'avg_function_length': 10.0
+}
+
+
+def test_blob_sha_matches_git():
+    # Mesmo valor de `printf 'hello\n' | git hash-object --stdin`
+    assert blob_sha("hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+
+def test_cache_hit_and_miss_counters(tmp_path):
+    with MetricsCache(str(tmp_path)) as cache:
+        assert cache.get("abc") is None
+        cache.put("abc", METRICS)
+        assert cache.get("abc") == METRICS
+
+        assert cache.hits == 1
+        assert cache.misses == 1
+        assert cache.stats()['entries'] == 1
+
+
+def test_cache_persists_across_runs(tmp_path):
+    with MetricsCache(str(tmp_path)) as cache:
+        cache.get_or_compute("x = 1\n", lambda: METRICS)
+
+    calls = []
+    with MetricsCache(str(tmp_path)) as cache:
+        metrics = cache.get_or_compute("x = 1\n", lambda: calls.append(1) or {})
+
+    assert metrics == METRICS
+    assert calls == []
+
+
+def test_cache_fingerprint_isolates_entries(tmp_path):
+    with MetricsCache(str(tmp_path), fingerprint="v1") as cache:
+        cache.put("abc", METRICS)
+
+    with MetricsCache(str(tmp_path), fingerprint="v2") as cache:
+        assert cache.get("abc") is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    with MetricsCache(str(tmp_path), max_size_mb=0.0005) as cache:  # ~520 bytes
+        for i in range(5):
+            cache.put(f"blob{i}", METRICS)
+        cache.get("blob0")  # blob0 passa a ser o mais recente
+        cache.flush()
+
+        assert cache.get("blob0") == METRICS
+        assert cache.get("blob1") is None
+        assert cache.stats()['size_bytes'] <= cache.max_size_bytes
@@ -0,0 +1,101 @@
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from analyzer.metrics_table import CommitMetricsTable
+from main import _calculate_aggregated_stats
+
+BRT = timezone(timedelta(hours=-3))
+
+
+def _result(i, date=None, author=None):
+    return {
+        "hash": f"{i:07x}",
+        "date": date or datetime(2025, 1, 1, 12, tzinfo=BRT) + timedelta(hours=i),
+        "author": author or f"Autor {i % 3}",
+        "complexity": i,
+        "coupling": i / 4,
+        "maintainability_index": 100.0 - i / 8,
+        "lines_of_code": 10 * i,
+        "code_smells": i % 5,
+        "functions_count": i % 7,
+        "avg_function_length": 1.5 * i,
+        "files_modified": 1 + i % 2
+    }
+
+
+def test_rows_behave_like_the_original_dicts():
+    results = [_result(i) for i in range(5)]
+    table = CommitMetricsTable.from_results(results)
+
+    assert len(table) == 5
+    assert table == results
+    assert dict(table[-1]) == results[-1]
+    assert list(table[2]) == list(results[2])
+    assert table[1].get("code_smells") == 1
+    assert table[0]["date"].utcoffset() == timedelta(hours=-3)
+    assert [r["hash"] for r in table[1:3]] == ["0000001", "0000002"]
+    with pytest.raises(IndexError):
+        table[5]
+
+
+def test_naive_dates_are_preserved():
+    naive = CommitMetricsTable.from_results([_result(1, date=datetime(2025, 3, 1, 8, 30, 0, 15))])
+    assert naive[0]["date"] == datetime(2025, 3, 1, 8, 30, 0, 15)
+    assert naive[0]["date"].tzinfo is None
+
+
+def test_sort_by_date_is_stable():
+    same_day = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    results = [_result(0, date=same_day), _result(1, date=datetime(2025, 1, 1, tzinfo=BRT)),
+               _result(2, date=same_day)]
+    table = CommitMetricsTable.from_results(results)
+    table.sort_by_date()
+
+    results.sort(key=lambda x: x["date"])
+    assert table == results
+
+
+def test_date_bounds_pick_first_and_last_of_ties():
+    same_day = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    table = CommitMetricsTable.from_results([
+        _result(0, date=same_day), _result(1, date=datetime(2025, 1, 1, tzinfo=BRT)),
+        _result(2, date=same_day), _result(3, date=datetime(2025, 1, 1, 21, tzinfo=timezone.utc))
+    ])
+
+    assert table.date_bounds() == (1, 2)
+    assert table.author_totals("complexity") == {"Autor 0": 3, "Autor 1": 1, "Autor 2": 2}
+
+
+def test_authors_are_interned_and_columns_are_typed():
+    table = CommitMetricsTable.from_results(_result(i) for i in range(9))
+
+    assert table.authors == ["Autor 0", "Autor 1", "Autor 2"]
+    assert table.author_counts() == {"Autor 0": 3, "Autor 1": 3, "Autor 2": 3}
+    assert table.column("complexity").typecode == "q"
+    assert table.column("coupling").typecode == "d"
+
+
+def test_aggregated_stats_on_columns_match_list():
+    results = [_result(i) for i in range(50)]
+
+    assert _calculate_aggregated_stats(CommitMetricsTable.from_results(results)) == \
+        _calculate_aggregated_stats(results)
+
+
+def test_table_uses_much_less_memory_than_dicts():
+    count = 5000
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    as_dicts = [_result(i) for i in range(count)]
+    dicts_size = tracemalloc.get_traced_memory()[0] - before
+
+    before = tracemalloc.get_traced_memory()[0]
+    table = CommitMetricsTable.from_results(_result(i) for i in range(count))
+    table_size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    assert len(table) == len(as_dicts)
+    assert dicts_size / table_size >= 5
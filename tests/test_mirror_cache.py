@@ -0,0 +1,89 @@
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from analyzer.mirror_cache import MirrorCache, is_remote_url, mirror_name
+from analyzer.repo_miner import analyze_repository
+from main import cli
+
+MODULE = "def f{i}(x):\n    if x:\n        return x + {i}\n    return 0\n"
+
+
+def _commit(repo, i):
+    repo.commit(f"c{i}", {f"m{i}.py": MODULE.format(i=i)})
+
+
+@pytest.fixture
+def remote(make_repo):
+    """Repositório servido por file://, com filtros de clone parcial habilitados."""
+    repo = make_repo("remote")
+    repo.git("config", "uploadpack.allowFilter", "true")
+    for i in range(1, 3):
+        _commit(repo, i)
+    return repo
+
+
+def test_is_remote_url(tmp_path):
+    assert is_remote_url("https://github.com/user/repo")
+    assert is_remote_url("git@github.com:user/repo.git")
+    assert is_remote_url("file:///srv/repo")
+    assert not is_remote_url(str(tmp_path))
+
+
+def test_mirror_name_is_stable_and_readable():
+    assert mirror_name("https://github.com/user/repo.git").startswith("repo-")
+    assert mirror_name("https://a/x") == mirror_name("https://a/x")
+    assert mirror_name("https://a/x") != mirror_name("https://b/x")
+
+
+def test_local_directory_is_not_mirrored(tmp_path, remote):
+    mirrors = MirrorCache(str(tmp_path / "cache"))
+
+    assert mirrors.resolve(remote.path) == remote.path
+    assert mirrors.list() == []
+
+
+def test_first_run_clones_partial_mirror_and_next_run_fetches(tmp_path, remote, git):
+    mirrors = MirrorCache(str(tmp_path / "cache"))
+    url = remote.uri
+
+    path = mirrors.resolve(url)
+    assert path == mirrors.path_for(url)
+    assert git(path, "config", "remote.origin.promisor") == "true"
+    assert len(analyze_repository(url, mirrors=mirrors)) == 2
+
+    _commit(remote, 3)
+    assert mirrors.resolve(url) == path
+    assert len(analyze_repository(url, mirrors=mirrors)) == 3
+    assert [m["url"] for m in mirrors.list()] == [url]
+
+
+def test_prune_by_url_and_age(tmp_path, remote):
+    mirrors = MirrorCache(str(tmp_path / "cache"))
+    url = remote.uri
+    path = mirrors.resolve(url)
+
+    assert mirrors.prune(older_than_days=1) == []
+    assert mirrors.prune(urls=["https://outro/repo"]) == []
+
+    removed = mirrors.prune(urls=[url])
+    assert [m["url"] for m in removed] == [url]
+    assert not os.path.exists(path)
+
+
+def test_cache_cli_list_and_prune(tmp_path, remote):
+    cache_dir = str(tmp_path / "cache")
+    MirrorCache(cache_dir).resolve(remote.uri)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["cache", "list", "--cache-dir", cache_dir])
+    assert result.exit_code == 0
+    assert remote.uri in result.output
+
+    result = runner.invoke(cli, ["cache", "prune", "--cache-dir", cache_dir])
+    assert result.exit_code != 0
+
+    result = runner.invoke(cli, ["cache", "prune", "--all", "--cache-dir", cache_dir])
+    assert result.exit_code == 0
+    assert MirrorCache(cache_dir).list() == []
@@ -0,0 +1,65 @@
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+from analyzer.metrics_extractor import extract_metrics
+from analyzer.parallel_analysis import FileAnalysisPool, plan_batches
+from analyzer.repo_miner import analyze_files, analyze_repository
+
+SOURCES = [
+    ("small.py", "x = 1\n"),
+    ("medium.py", "def foo(a, b):\n    if a:\n        return b\n    return a\n" * 20),
+    ("large.py", "import os\n\ndef bar(x):\n    for i in x:\n        print(os.path.join(i))\n" * 200),
+    ("tiny.py", "y = 2\n"),
+]
+
+
+def test_plan_batches_covers_every_file_largest_first():
+    batches = plan_batches(SOURCES, jobs=2, batch_bytes=1024)
+
+    flat = [i for batch in batches for i in batch]
+    assert sorted(flat) == list(range(len(SOURCES)))
+    assert batches[0] == [2]  # large.py sozinho e primeiro
+
+
+def test_plan_batches_groups_small_files():
+    files = [(f"f{i}.py", "x = 1\n") for i in range(10)]
+
+    assert len(plan_batches(files, jobs=1, batch_bytes=1024)) == 1
+
+
+def test_pool_matches_serial_results():
+    with FileAnalysisPool(2) as pool:
+        results = pool.analyze(SOURCES)
+
+    expected = [extract_metrics(source, name) for name, source in SOURCES]
+    assert [metrics for metrics, _ in results] == expected
+
+
+@patch("analyzer.repo_miner.Repository")
+def test_parallel_repository_matches_serial(mock_repo):
+    commits = [
+        MagicMock(
+            hash=f"abc123{i}",
+            committer_date=datetime(2025, 1, i + 1),
+            author=MagicMock(name="Author X"),
+            modified_files=[MagicMock(filename=name, source_code=source) for name, source in SOURCES[i:]]
+        )
+        for i in range(len(SOURCES))
+    ]
+    mock_repo.return_value.traverse_commits.side_effect = lambda: iter(commits)
+
+    serial = analyze_repository("fake_url")
+    parallel = analyze_repository("fake_url", jobs=2)
+
+    assert parallel == serial
+    assert len(parallel) == len(SOURCES)
+
+
+def test_same_content_in_window_is_analyzed_once():
+    files = [SOURCES[1], ("copy.py", SOURCES[1][1]), SOURCES[0], ("moved.py", SOURCES[1][1])]
+    pool = MagicMock()
+    pool.analyze.side_effect = lambda batch: [(extract_metrics(source, name), None) for name, source in batch]
+
+    results = analyze_files(files, pool=pool)
+
+    assert pool.analyze.call_args[0][0] == [SOURCES[1], SOURCES[0]]
+    assert results == [extract_metrics(source, name) for name, source in files]
@@ -0,0 +1,42 @@
+from unittest.mock import patch
+import lizard
+from analyzer import source_tokens
+from analyzer.metrics_extractor import extract_metrics
+from analyzer.parsed_source import ParsedSource
+
+SOURCE = """import os
+from flask import Flask
+
+class Service:
+    def run(self, data):
+        total = os.path.join(data)
+        return helper(total)
+
+def helper(x):
+    return x
+"""
+
+
+def test_parsed_source_indexes():
+    parsed = ParsedSource(SOURCE, "service.py")
+
+    assert parsed.imports == ["os", "flask"]
+    assert parsed.imported_modules == {"os", "flask"}
+    assert parsed.definitions == {"Service", "run", "helper"}
+    assert parsed.assignments == ["total"]
+    assert parsed.calls["helper"] == 2
+    assert parsed.cross_references == 1
+    assert parsed.identifiers["total"] == 2
+    assert len(parsed.analysis.function_list) == 2
+
+
+def test_extract_metrics_parses_source_once():
+    analyze_source_code = lizard.analyze_file.analyze_source_code
+    with patch("analyzer.parsed_source.tokenize", wraps=source_tokens.tokenize) as tokenize_spy, \
+            patch("analyzer.metrics_extractor.lizard.analyze_file.analyze_source_code",
+                  wraps=analyze_source_code) as lizard_spy:
+        metrics = extract_metrics(SOURCE, "service.py")
+
+    assert metrics['functions_count'] == 2
+    assert tokenize_spy.call_count == 1
+    assert lizard_spy.call_count == 1
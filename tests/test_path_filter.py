@@ -0,0 +1,150 @@
+import os
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from analyzer.metrics_extractor import extract_metrics
+from analyzer.path_filter import PathFilter, build_filter, find_config, load_config, normalize_pattern
+from analyzer.repo_miner import _traverse_commits, analyze_repository
+from analyzer.run_state import RunState, state_key
+from analyzer.snapshot import iter_snapshot_metrics
+from main import cli
+
+MODULE = "def f{i}(x):\n    if x > {i}:\n        return x\n    return {i}\n"
+
+PATHS = [
+    "setup.py", "app/main.py", "app/models.py", "app/migrations/0001_init.py",
+    "app/api_pb2.py", "vendor/lib/six.py", "docs/conf.py", "README.md", "app/data.json",
+]
+
+
+def _write(root, path, content):
+    full = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full) or root, exist_ok=True)
+    with open(full, "w") as f:
+        f.write(content)
+
+
+@pytest.fixture
+def repo(make_repo):
+    """Um commit com todos os caminhos e depois um commit por caminho."""
+    repo = make_repo()
+    repo.commit("inicial", {name: MODULE.format(i=i) for i, name in enumerate(PATHS)}, date="2025-01-01T10:00:00")
+    for i, name in enumerate(PATHS):
+        repo.commit(f"altera {name}", {name: MODULE.format(i=i + 100)}, date=f"2025-01-{i + 2:02d}T10:00:00")
+    return repo.path
+
+
+def test_normalize_pattern_follows_gitignore():
+    assert normalize_pattern("*_pb2.py") == "**/*_pb2.py"
+    assert normalize_pattern("vendor/") == "**/vendor"
+    assert normalize_pattern("/setup.py") == "setup.py"
+    assert normalize_pattern("./app/migrations/") == "app/migrations"
+    with pytest.raises(ValueError):
+        normalize_pattern("/")
+
+
+def test_matches():
+    f = PathFilter(exclude=["vendor/", "migrations", "*_pb2.py", "/setup.py"])
+    assert [p for p in PATHS if f.matches(p)] == ["app/main.py", "app/models.py", "docs/conf.py"]
+
+    f = PathFilter(include=["app/**"], exclude=["app/m[!a]*"])
+    assert [p for p in PATHS if f.matches(p)] == ["app/main.py", "app/api_pb2.py"]
+    assert not PathFilter() and PathFilter().matches("a/b.py") and not PathFilter().matches("a.pyc")
+
+
+@pytest.mark.parametrize("include, exclude", [
+    ((), ()),
+    ((), ("vendor/", "migrations", "*_pb2.py")),
+    (("app",), ("*_pb2.py",)),
+    (("app/**", "/setup.py"), ("app/m?dels.py",)),
+    (("*.py",), ("docs/", "/setup.py")),
+])
+def test_pathspecs_select_the_same_paths(repo, git, include, exclude):
+    f = PathFilter(include, exclude)
+    listed = git(repo, "ls-files", "--", *f.pathspecs()).split("\n")
+    assert [p for p in listed if p.endswith(".py")] == sorted(p for p in PATHS if f.matches(p))
+
+
+def test_load_config(tmp_path):
+    path = tmp_path / ".codethermometer"
+    path.write_text('include = "app/**"\nexclude = ["*_pb2.py"]\n')
+    assert load_config(str(path)) == {"include": ["app/**"], "exclude": ["*_pb2.py"]}
+    f = build_filter(exclude=["vendor/"], config_path=str(path))
+    assert f.include == ("app/**",) and f.exclude == ("**/*_pb2.py", "**/vendor")
+
+    for content in ('exclud = ["x"]\n', 'exclude = [1]\n', 'exclude = [\n'):
+        path.write_text(content)
+        with pytest.raises(ValueError):
+            load_config(str(path))
+
+
+def test_find_config_prefers_the_repository(repo, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert find_config(repo) is None
+    _write(str(tmp_path), ".codethermometer", "")
+    assert find_config(repo) == ".codethermometer"
+    _write(repo, ".codethermometer", "")
+    assert find_config(repo) == os.path.join(repo, ".codethermometer")
+
+
+@pytest.mark.parametrize("backend", ["pydriller", "native"])
+def test_traversal_skips_commits_outside_the_filter(repo, git, backend):
+    f = PathFilter(exclude=["vendor/", "migrations", "*_pb2.py"])
+    messages = {}
+    for line in git(repo, "log", "--format=%H %s").split("\n"):
+        commit_hash, message = line.split(" ", 1)
+        messages[commit_hash] = message
+
+    commits = list(_traverse_commits(repo, None, None, backend=backend, path_filter=f))
+    assert [messages[c.hash] for c in commits] == [
+        "inicial", "altera setup.py", "altera app/main.py", "altera app/models.py", "altera docs/conf.py"
+    ]
+
+
+@pytest.mark.parametrize("backend", ["pydriller", "native"])
+def test_filtered_analysis_reads_only_selected_files(repo, backend):
+    f = PathFilter(include=["app/**"], exclude=["*_pb2.py"])
+    with patch("analyzer.repo_miner.extract_metrics", wraps=extract_metrics) as extract:
+        results = analyze_repository(repo, path_filter=f, backend=backend)
+    analyzed = {call.args[1] for call in extract.call_args_list}
+    assert analyzed == {"main.py", "models.py", "0001_init.py"}
+    assert [r["files_modified"] for r in results] == [3, 1, 1, 1]
+
+    unfiltered = analyze_repository(repo, path_filter=PathFilter(), backend=backend)
+    assert unfiltered == analyze_repository(repo)
+
+
+def test_snapshot_tree_respects_the_filter(repo):
+    rows = list(iter_snapshot_metrics(repo, spec="1", path_filter=PathFilter(exclude=["vendor/", "app/"])))
+    assert {r["files_modified"] for r in rows} == {2}
+
+
+def test_state_is_separated_by_filter(tmp_path):
+    assert state_key("repo") == state_key("repo", paths=None)
+    assert state_key("repo") != state_key("repo", paths={"include": [], "exclude": ["**/vendor"]})
+
+    state = RunState(str(tmp_path), "repo", paths={"include": [], "exclude": ["**/vendor"]})
+    state.record("a" * 40)
+    state.checkpoint()
+    state.close()
+    assert RunState(str(tmp_path), "repo", paths={"include": [], "exclude": ["**/vendor"]}).resumed
+    assert not RunState(str(tmp_path), "repo").resumed
+
+
+def test_cli_reads_config_and_options(repo, tmp_path):
+    _write(repo, ".codethermometer", 'exclude = ["vendor/"]\n')
+    runner = CliRunner()
+    with patch("main.iter_repository_metrics", return_value=iter([])) as mocked:
+        result = runner.invoke(cli, ["report", repo, "--exclude", "*_pb2.py", "--cache-dir", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert "Filtro de caminhos" in result.output
+    path_filter = mocked.call_args.kwargs["path_filter"]
+    assert path_filter.exclude == ("**/vendor", "**/*_pb2.py")
+
+    bad = tmp_path / "bad.toml"
+    bad.write_text("include = 3\n")
+    result = runner.invoke(cli, ["report", repo, "--config", str(bad), "--cache-dir", str(tmp_path)])
+    assert result.exit_code == 2
+    assert "lista de padrões" in result.output
@@ -0,0 +1,105 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from analyzer import profiling
+from analyzer.repo_miner import _python_sources, _read_ahead, analyze_repository, iter_file_changes
+
+MODULE = "def f{i}(x):\n    if x > {i}:\n        return x\n    return {i}\n"
+
+
+@pytest.fixture
+def repo(make_repo):
+    repo = make_repo()
+    for i in range(12):
+        source = MODULE.format(i=i) * (i + 1)
+        repo.commit(f"c{i}", {"a.py": source, f"m{i % 4}.py": source}, date=f"2025-01-{i + 1:02d}T10:00:00")
+    return repo.path
+
+
+def test_read_ahead_keeps_order_and_bounds_the_queue():
+    produced = []
+
+    def items():
+        for i in range(50):
+            produced.append(i)
+            yield i
+
+    consumed = []
+    for item in _read_ahead(items(), depth=4):
+        time.sleep(0.001)
+        # A produtora nunca passa de `depth` itens na fila (mais o que está segurando)
+        assert len(produced) - len(consumed) <= 4 + 2
+        consumed.append(item)
+    assert consumed == list(range(50))
+
+
+def test_read_ahead_raises_errors_after_earlier_items():
+    def items():
+        yield 1
+        yield 2
+        raise RuntimeError("git falhou")
+
+    received = []
+    with pytest.raises(RuntimeError, match="git falhou"):
+        for item in _read_ahead(items(), depth=8):
+            received.append(item)
+    assert received == [1, 2]
+
+
+def test_read_ahead_stops_the_producer_when_abandoned():
+    closed = threading.Event()
+
+    def items():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    reader = _read_ahead(items(), depth=2)
+    assert [next(reader) for _ in range(3)] == [0, 1, 2]
+    reader.close()
+    assert closed.is_set()
+    assert not any(t.name == "codethermometer-reader" for t in threading.enumerate())
+
+
+@pytest.mark.parametrize("backend", ["pydriller", "native"])
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_pipeline_gives_the_same_results(repo, backend, jobs):
+    expected = analyze_repository(repo, backend=backend)
+    assert len(expected) == 12
+    assert analyze_repository(repo, backend=backend, jobs=jobs, pipeline=True) == expected
+
+    def changes(pipeline):
+        return [
+            (c.hash, [(f.new_path, f.added_lines, f.metrics) for f in files])
+            for c, files in iter_file_changes(repo, backend=backend, line_counts=True, pipeline=pipeline)
+        ]
+    assert changes(True) == changes(False)
+
+
+def test_pipeline_reads_git_in_the_producer_thread(repo):
+    threads = set()
+
+    def sources(commit, path_filter=None):
+        threads.add(threading.current_thread().name)
+        return _python_sources(commit, path_filter)
+
+    with patch("analyzer.repo_miner._python_sources", side_effect=sources):
+        analyze_repository(repo, pipeline=True)
+    assert threads == {"codethermometer-reader"}
+
+
+def test_pipeline_profile_measures_the_wait(repo):
+    profiler = profiling.enable()
+    try:
+        analyze_repository(repo, pipeline=True)
+    finally:
+        profiling.disable()
+    assert set(profiler.stages) >= {"modified_files", "file_analysis", "pipeline_wait"}
+    assert profiler.stages["modified_files"].count == 12
@@ -0,0 +1,89 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from analyzer import profiling
+from analyzer.parallel_analysis import FileAnalysisPool
+from analyzer.repo_miner import analyze_files
+from main import cli
+
+SOURCE = "import os\n\ndef f(x):\n    if x:\n        return os.sep\n    return x\n"
+
+
+@pytest.fixture(autouse=True)
+def reset_profiling():
+    yield
+    profiling.disable()
+
+
+def test_disabled_stage_is_shared_noop():
+    assert profiling.stage("a") is profiling.stage("b")
+    items = [1, 2]
+    assert profiling.timed_iter(items, "x") is items
+
+
+def test_summary_has_totals_percentiles_and_slowest_items():
+    profiler = profiling.enable(top_n=2)
+    for i, seconds in enumerate([0.1, 0.2, 0.3, 0.4]):
+        profiler.add("extract_metrics", seconds, filename=f"f{i}.py")
+        profiler.add("extract_metrics.lizard", seconds / 2, commit="c1")
+        profiler.add("modified_files", seconds, commit=f"c{i}")
+
+    summary = profiler.summary()
+    stats = summary["stages"]["extract_metrics"]
+
+    assert stats["count"] == 4
+    assert stats["total"] == pytest.approx(1.0)
+    assert stats["p50"] == pytest.approx(0.2, rel=0.01)
+    assert stats["p95"] == pytest.approx(0.4, rel=0.01)
+    assert [f["file"] for f in summary["slowest_files"]] == ["f3.py", "f2.py"]
+    # Subetapas não são somadas aos commits
+    assert summary["slowest_commits"][0] == {"commit": "c3", "seconds": 0.4}
+
+
+def test_memory_does_not_grow_with_number_of_files():
+    profiler = profiling.Profiler(top_n=3)
+    for i in range(5000):
+        seconds = 0.001 + i * 1e-6
+        profiler.add("analyze_file", seconds, filename=f"f{i}.py")
+        profiler.add("commit", seconds, commit=f"c{i}")
+    summary = profiler.summary()
+    assert len(profiler.files) == 3 and len(profiler.commits) <= 3
+    assert len(profiler.stages["analyze_file"].buckets) < 500
+    assert summary["stages"]["analyze_file"]["count"] == 5000
+    assert [f["file"] for f in summary["slowest_files"]] == ["f4999.py", "f4998.py", "f4997.py"]
+    assert summary["slowest_commits"][0]["commit"] == "c4999"
+
+
+def test_stages_of_extract_metrics_are_recorded():
+    profiler = profiling.enable()
+    analyze_files([("a.py", SOURCE), ("b.py", SOURCE + "\n")])
+
+    stages = profiler.summary()["stages"]
+    for name in ("extract_metrics", "extract_metrics.lizard", "extract_metrics.smells",
+                 "extract_metrics.coupling", "file_analysis.cache"):
+        assert name in stages
+    assert stages["extract_metrics"]["count"] == 2
+
+
+def test_worker_timings_are_merged_into_parent_profile():
+    profiler = profiling.enable()
+    with FileAnalysisPool(2) as pool:
+        results = pool.analyze([(f"m{i}.py", SOURCE * (i + 1)) for i in range(4)])
+
+    assert all(error is None for _, error in results)
+    assert profiler.summary()["stages"]["extract_metrics"]["count"] == 4
+
+
+@patch("main.iter_repository_metrics")
+def test_report_profile_json(mock_iter, tmp_path):
+    mock_iter.return_value = iter([])
+    path = tmp_path / "profile.json"
+
+    result = CliRunner().invoke(cli, ["report", "https://repo.com", "--profile-json", str(path)])
+
+    assert result.exit_code == 0
+    assert set(json.loads(path.read_text())) == {"wall_seconds", "stages", "slowest_files", "slowest_commits"}
+    assert not profiling.is_enabled()
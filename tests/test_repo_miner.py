@@ -1,3 +1,4 @@
+from datetime import datetime
 from unittest.mock import patch, MagicMock
 from analyzer.repo_miner import analyze_repository
 
@@ -32,12 +33,12 @@ def test_repository_metrics_aggregation(mock_repo, mock_extract):
         }
     ]
 
-    fake_mod1 = MagicMock(filename="a.py", source_code="...")
-    fake_mod2 = MagicMock(filename="b.py", source_code="...")
+    fake_mod1 = MagicMock(filename="a.py", source_code="a = 1")
+    fake_mod2 = MagicMock(filename="b.py", source_code="b = 2")
 
     fake_commit = MagicMock(
         hash="abc1234",
-        committer_date="2025-01-01",
+        committer_date=datetime(2025, 1, 1),
         author=MagicMock(name="Author X"),
         modified_files=[fake_mod1, fake_mod2]
     )
@@ -55,7 +56,7 @@ def test_ignore_non_python_files(mock_repo, mock_extract):
     fake_mod = MagicMock(filename="readme.txt", source_code="whatever")
     fake_commit = MagicMock(
         hash="abc1234",
-        committer_date="2025-01-01",
+        committer_date=datetime(2025, 1, 1),
         author=MagicMock(name="Author X"),
         modified_files=[fake_mod]
     )
@@ -63,4 +64,74 @@ def test_ignore_non_python_files(mock_repo, mock_extract):
 
     analyze_repository("fake_url")
 
-    mock_extract.assert_not_called()
\ No newline at end of file
+    mock_extract.assert_not_called()
+
+@patch("analyzer.repo_miner.extract_metrics")
+@patch("analyzer.repo_miner.Repository")
+def test_cache_avoids_reanalyzing_identical_blobs(mock_repo, mock_extract, tmp_path):
+    from analyzer.metrics_cache import MetricsCache
+
+    mock_extract.return_value = {
+        'cyclomatic_complexity': 2,
+        'coupling': 1.0,
+        'maintainability_index': 90.0,
+        'lines_of_code': 10,
+        'code_smells': 0,
+        'functions_count': 1,
+        'avg_function_length': 10.0
+    }
+    commits = [
+        MagicMock(
+            hash=f"abc123{i}",
+            committer_date=datetime(2025, 1, i + 1),
+            author=MagicMock(name="Author X"),
+            modified_files=[MagicMock(filename="a.py", source_code="x = 1\n")]
+        )
+        for i in range(3)
+    ]
+    mock_repo.return_value.traverse_commits.return_value = commits
+
+    with MetricsCache(str(tmp_path)) as cache:
+        results = analyze_repository("fake_url", cache=cache)
+
+        assert len(results) == 3
+        assert mock_extract.call_count == 1
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+
+@patch("analyzer.repo_miner.extract_metrics")
+@patch("analyzer.repo_miner.Repository")
+def test_iter_repository_metrics_is_lazy(mock_repo, mock_extract):
+    from analyzer.repo_miner import iter_repository_metrics
+
+    mock_extract.return_value = {
+        'cyclomatic_complexity': 1,
+        'coupling': 0.0,
+        'maintainability_index': 100.0,
+        'lines_of_code': 1,
+        'code_smells': 0,
+        'functions_count': 0,
+        'avg_function_length': 0.0
+    }
+    traversed = []
+
+    def traverse():
+        for i in range(3):
+            traversed.append(i)
+            yield MagicMock(
+                hash=f"abc123{i}",
+                committer_date=datetime(2025, 1, 3 - i),
+                author=MagicMock(name="Author X"),
+                modified_files=[MagicMock(filename="a.py", source_code=f"x = {i}")]
+            )
+
+    mock_repo.return_value.traverse_commits.side_effect = traverse
+
+    stream = iter_repository_metrics("fake_url")
+    first = next(stream)
+
+    assert first["hash"] == "abc1230"
+    assert traversed == [0]
+    # Ordem da travessia, não da data
+    assert [r["hash"] for r in stream] == ["abc1231", "abc1232"]
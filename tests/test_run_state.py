@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+from unittest.mock import patch, MagicMock
+from analyzer.metrics_extractor import extract_metrics
+from analyzer.repo_miner import analyze_repository
+from analyzer.run_state import RunState
+
+
+def _result(hash_, day):
+    return {
+        "hash": hash_,
+        "date": datetime(2025, 1, day, tzinfo=timezone.utc),
+        "author": "Author X",
+        "complexity": day,
+        "coupling": 0.5,
+        "maintainability_index": 90.0,
+        "lines_of_code": 10 * day,
+        "code_smells": 0,
+        "functions_count": 1,
+        "avg_function_length": 10.0 * day,
+        "files_modified": 1
+    }
+
+
+def test_state_roundtrip(tmp_path):
+    state = RunState(str(tmp_path), "repo")
+    state.record("a" * 40, _result("aaaaaaa", 1))
+    state.record("b" * 40)  # commit sem arquivos Python
+    state.checkpoint()
+    state.close()
+
+    reloaded = RunState(str(tmp_path), "repo")
+    assert reloaded.resumed
+    assert reloaded.last_commit == "b" * 40
+    assert reloaded.commits_seen == 2
+    assert list(reloaded.saved_results()) == [_result("aaaaaaa", 1)]
+
+
+def test_state_discards_uncheckpointed_results(tmp_path):
+    state = RunState(str(tmp_path), "repo", checkpoint_every=1000)
+    state.record("a" * 40, _result("aaaaaaa", 1))
+    state.checkpoint()
+    state.record("b" * 40, _result("bbbbbbb", 2))  # "crash" antes do checkpoint
+    state.close()
+
+    reloaded = RunState(str(tmp_path), "repo")
+    assert reloaded.last_commit == "a" * 40
+    assert reloaded.results_count == 1
+
+    reloaded.record("c" * 40, _result("ccccccc", 3))
+    reloaded.checkpoint()
+    reloaded.close()
+    assert [r["hash"] for r in RunState(str(tmp_path), "repo").saved_results()] == ["aaaaaaa", "ccccccc"]
+
+
+def test_state_does_not_keep_results_in_memory(tmp_path):
+    state = RunState(str(tmp_path), "repo")
+    for day in range(1, 4):
+        state.record(str(day) * 40, _result(str(day) * 7, day))
+    assert not hasattr(state, "results")
+    # Os resultados registrados são relidos do arquivo
+    assert [r["hash"] for r in state.saved_results()] == ["1111111", "2222222", "3333333"]
+    state.checkpoint()
+    state.close()
+    assert RunState(str(tmp_path), "repo").results_count == 3
+
+
+def test_state_is_separate_per_period(tmp_path):
+    state = RunState(str(tmp_path), "repo", since="2025-01-01")
+    state.record("a" * 40, _result("aaaaaaa", 1))
+    state.checkpoint()
+    state.close()
+
+    assert not RunState(str(tmp_path), "repo").resumed
+
+
+def _commit(hash_, day):
+    return MagicMock(
+        hash=hash_,
+        committer_date=datetime(2025, 1, day, tzinfo=timezone.utc),
+        author=MagicMock(name="Author X"),
+        modified_files=[MagicMock(filename="a.py", source_code=f"x = {day}\n")]
+    )
+
+
+@patch("analyzer.repo_miner.Repository")
+def test_incremental_run_only_traverses_new_commits(mock_repo, tmp_path):
+    first, second, third = _commit("1" * 40, 1), _commit("2" * 40, 2), _commit("3" * 40, 3)
+
+    mock_repo.return_value.traverse_commits.return_value = [first, second]
+    results = analyze_repository("repo", state=RunState(str(tmp_path), "repo"))
+    assert len(results) == 2
+
+    # Segunda execução: PyDriller devolve o último commit analisado e os novos
+    mock_repo.return_value.traverse_commits.return_value = [second, third]
+    with patch("analyzer.repo_miner.extract_metrics", wraps=extract_metrics) as spy:
+        results = analyze_repository("repo", state=RunState(str(tmp_path), "repo"))
+
+    assert mock_repo.call_args.kwargs["from_commit"] == "2" * 40
+    assert spy.call_count == 1
+    assert [r["hash"] for r in results] == ["1111111", "2222222", "3333333"]
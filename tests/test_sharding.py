@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from analyzer.repo_miner import analyze_repository
+from analyzer.sharding import merge_partials, parse_shard_spec, shard_bounds, write_partial, Shard
+from main import cli, _calculate_aggregated_stats
+
+MAIN = os.path.join(os.path.dirname(__file__), "..", "src", "main.py")
+MODULE = "import os\ndef f{i}(x):\n    if x:\n        return x + {i}\n    return os.sep\n"
+
+
+@pytest.fixture
+def repo(make_repo):
+    """10 commits; os de índice múltiplo de 4 só alteram um arquivo de texto."""
+    repo = make_repo()
+    for i in range(10):
+        files = {"notes.txt": str(i)} if i % 4 == 0 else {f"m{i}.py": MODULE.format(i=i)}
+        repo.commit(f"c{i}", files, date=f"2025-01-{i + 1:02d}T10:00:00")
+    return repo.path
+
+
+def test_parse_shard_spec():
+    shard = parse_shard_spec("2/4")
+    assert (shard.index, shard.count) == (2, 4)
+    for spec in ("0/4", "5/4", "2-4"):
+        with pytest.raises(ValueError):
+            parse_shard_spec(spec)
+
+
+def test_shard_bounds_are_contiguous_and_cover_everything():
+    for total in (0, 1, 7, 100):
+        bounds = [shard_bounds(total, i, 3) for i in range(1, 4)]
+        assert bounds[0][0] == 0 and bounds[-1][1] == total
+        assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+
+
+def test_select_reads_only_up_to_the_end_of_the_range():
+    read = []
+
+    def commits():
+        for i in range(10):
+            read.append(i)
+            yield type("Commit", (), {"hash": f"h{i}"})
+
+    shard = Shard(2, 3)
+    assert [c.hash for c in shard.select(commits(), 10)] == ["h3", "h4", "h5"]
+    assert read == list(range(7))
+    assert (shard.start, shard.end, shard.first_commit, shard.last_commit) == (3, 6, "h3", "h5")
+
+
+def test_merge_rejects_incomplete_or_mixed_partials(tmp_path):
+    paths = []
+    for index, url in ((1, "repo-a"), (2, "repo-b")):
+        shard = Shard(index, 3)
+        shard.select([], 0)
+        path = str(tmp_path / f"p{index}.json")
+        write_partial(path, shard, url, None, None, [])
+        paths.append(path)
+
+    with pytest.raises(ValueError, match="análises diferentes"):
+        merge_partials(paths)
+    with pytest.raises(ValueError, match="incompletos"):
+        merge_partials(paths[:1])
+
+
+def test_parallel_shards_merge_to_full_analysis(repo, tmp_path):
+    # Cada shard simula uma máquina: cache e espelho próprios do mesmo remoto
+    url = f"file://{repo}"
+    paths = [str(tmp_path / f"shard-{i}.json") for i in range(1, 4)]
+    processes = [
+        subprocess.Popen(
+            [sys.executable, MAIN, "analyze", url, "--shard", f"{i}/3", "--partial-file", path],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            env={**os.environ, "CODETHERMOMETER_CACHE_DIR": str(tmp_path / f"cache-{i}")}
+        )
+        for i, path in enumerate(paths, start=1)
+    ]
+    for process in processes:
+        output = process.communicate()[0].decode()
+        assert process.returncode == 0, output
+
+    _, merged = merge_partials(reversed(paths))
+    expected = analyze_repository(repo)
+
+    assert merged == expected
+    assert _calculate_aggregated_stats(merged) == _calculate_aggregated_stats(expected)
+
+    result = CliRunner().invoke(cli, ["merge", *paths])
+    assert result.exit_code == 0
+    assert "Total de commits analisados: 7" in result.output
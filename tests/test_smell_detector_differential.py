@@ -0,0 +1,72 @@
+import glob
+import os
+import random
+import re
+from collections import Counter
+
+import pytest
+
+import legacy_analyzers as legacy
+from analyzer import smell_detector
+from analyzer.parsed_source import ParsedSource
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+EDGE_CASES = [
+    "",
+    "x = 1",
+    "x == 1\ny = x\n",
+    "\n\n   total   =  3\n",
+    "import os\nimport os\nfrom sys import path\n",
+    "from os.path import join\nimport os.path\nimportlib = 1\n",
+    "import\nimport os\n",
+    "from x importlib\nx()\n",
+    "  import indented\nfrom\nfoo import bar\n",
+    "data = 1\ntmp = 2\na = 3\nb = data + tmp\n",
+    "x\n= 1\n",
+    "_private = 1\n__dunder__ = 2\n",
+    "s = 'x = 1'  # comentário = 2\n",
+    "if a:\n" + "".join(" " * 4 * n + "if a:\n" for n in range(1, 7)),
+    "long_line_that_repeats = 1234567\n" * 6,
+    "ação = 1\nvalor = ação\n",
+]
+
+FRAGMENTS = [
+    "x", "y", "data", "tmp", "_a", "os", "import", "from", "importlib", "=", "==",
+    " ", "  ", "\t", "\n", "\n\n", "#", ".", "(", ")", ":", "    ", "1", "'", "\r\n",
+]
+
+
+def _corpus():
+    files = glob.glob(os.path.join(ROOT, "src", "**", "*.py"), recursive=True)
+    files += glob.glob(os.path.join(ROOT, "tests", "*.py"))
+    sources = [open(f, encoding="utf-8").read() for f in files]
+
+    rng = random.Random(1234)
+    for _ in range(500):
+        sources.append("".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 60))))
+
+    return EDGE_CASES + sources
+
+
+@pytest.mark.parametrize("source_code", _corpus())
+def test_parsed_source_matches_legacy_rules(source_code):
+    parsed = ParsedSource(source_code, analysis=False)
+
+    assert smell_detector._detect_code_duplication(parsed.lines) == legacy.detect_code_duplication(source_code)
+    assert smell_detector._detect_unused_variables(parsed) == legacy.detect_unused_variables(source_code)
+    assert smell_detector._detect_unused_imports(parsed) == legacy.detect_unused_imports(source_code)
+    assert smell_detector._detect_deep_nesting(parsed.lines) == legacy.detect_deep_nesting(source_code)
+    assert smell_detector._detect_generic_names(parsed) == legacy.detect_generic_names(source_code)
+
+
+@pytest.mark.parametrize("source_code", _corpus())
+def test_parsed_source_matches_legacy_regexes(source_code):
+    parsed = ParsedSource(source_code, analysis=False)
+
+    assert parsed.assignments == re.findall(r'^\s*(\w+)\s*=', source_code, re.MULTILINE)
+    assert parsed.imports == [
+        m.group(1) or m.group(2)
+        for m in re.finditer(r'^(?:from\s+(\w+)\s+import|import\s+(\w+))', source_code, re.MULTILINE)
+    ]
+    assert parsed.identifiers == Counter(re.findall(r'\w+', source_code))
@@ -0,0 +1,64 @@
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from analyzer.metrics_extractor import extract_metrics
+from analyzer.snapshot import SnapshotTree, iter_snapshot_metrics, parse_snapshot_spec, _select_snapshots
+
+MODULE = "import os\ndef f{i}(x):\n    if x:\n        return x + {i}\n    return os.sep\n"
+
+
+@pytest.fixture
+def repo(make_repo):
+    """Repositório com 6 commits: cada um cria m<i>.py; o 4º remove m1.py."""
+    repo = make_repo()
+    for i in range(1, 7):
+        repo.commit(f"c{i}", {f"m{i}.py": MODULE.format(i=i)}, date=f"2025-01-0{i}T10:00:00",
+                    removed=["m1.py"] if i == 4 else ())
+    return repo.path
+
+
+def test_parse_snapshot_spec():
+    assert parse_snapshot_spec("25") == ("commits", 25)
+    assert parse_snapshot_spec("Weekly") == ("weekly", None)
+    with pytest.raises(ValueError):
+        parse_snapshot_spec("0")
+
+
+def test_select_daily_keeps_last_commit_of_each_day():
+    commits = [
+        MagicMock(hash=h, committer_date=datetime(2025, 1, day, hour))
+        for h, day, hour in [("a", 1, 9), ("b", 1, 18), ("c", 2, 8), ("d", 4, 12)]
+    ]
+
+    assert [c.hash for c in _select_snapshots(commits, "daily")] == ["b", "c", "d"]
+
+
+def test_snapshot_metrics_cover_whole_tree(repo):
+    results = list(iter_snapshot_metrics(repo, spec="2"))
+
+    # Cada módulo tem CC 2; m1.py é removido no 4º commit
+    assert [r["files_modified"] for r in results] == [2, 3, 5]
+    assert [r["complexity"] for r in results] == [4, 6, 10]
+
+
+def test_snapshot_only_analyzes_changed_blobs(repo):
+    with patch("analyzer.repo_miner.extract_metrics", wraps=extract_metrics) as spy:
+        list(iter_snapshot_metrics(repo, spec="1"))
+
+    # Um arquivo novo por commit: nenhum blob é analisado duas vezes
+    assert spy.call_count == 6
+
+
+def test_known_blobs_are_bounded(repo, git):
+    hashes = git(repo, "rev-list", "--reverse", "HEAD").split()
+    tree = SnapshotTree(repo)
+    with patch("analyzer.snapshot.KNOWN_BLOBS", 2):
+        for commit_hash in hashes + hashes[:1]:
+            tree.advance(commit_hash)
+            assert len(tree._known) <= 2
+
+    # Voltar ao primeiro commit reanalisa m1.py, que saiu do LRU
+    assert sorted(tree.files) == ["m1.py"]
+    assert tree.files["m1.py"][1] == extract_metrics(MODULE.format(i=1), "m1.py")